@@ -0,0 +1,6 @@
+"""Benchmarks for the importer and query paths.
+
+Run a benchmark as a module from the repository root, for example::
+
+    python -m backend.benchmarks.bench_import --events 1000 100000
+"""
@@ -0,0 +1,190 @@
+"""Read throughput under concurrent clients: sync endpoints vs. the async ones.
+
+    python -m backend.benchmarks.bench_concurrency --clients 200 --seconds 10
+
+A database is seeded with ``--events`` generated events, then each variant is
+served by uvicorn in a subprocess and hammered by ``--clients`` concurrent
+HTTP clients, each requesting ``GET /events``, ``/locations`` and ``/games``
+in turn for ``--seconds``.  The runner prints requests per second, latency
+percentiles and failed requests.
+
+* ``sync``  — the previous ``def`` endpoints on ``get_read_db``; every request
+              holds one of the anyio threadpool's threads (40 by default)
+              while SQLite runs.  With more clients than the read pool has
+              connections, threads waiting for a connection can take every
+              thread the connection holders need to finish, and requests
+              fail with pool timeouts
+* ``async`` — the ``async def`` endpoints in backend.main on
+              ``get_async_read_db``
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+import httpx
+from fastapi import Depends, FastAPI, Query
+from sqlalchemy.orm import Session
+
+from backend import databridge as crud
+from backend import models  # noqa: F401 — registers ORM classes with Base
+from backend.benchmarks.generate import generate_events, write_events
+from backend.database import Base, create_write_engine, get_read_db
+from backend.importer import run_import
+from backend.schemas import EventOut, GameSystemOut, LocationOut
+
+VARIANTS = ("sync", "async")
+_APPS = {"sync": "backend.benchmarks.bench_concurrency:sync_app", "async": "backend.main:app"}
+_PATHS = ("/events?limit=50", "/locations", "/games")
+
+# The read endpoints as they were before the async path, served on their own.
+sync_app = FastAPI()
+
+
+@sync_app.get("/locations", response_model=list[LocationOut])
+def list_locations(db: Session = Depends(get_read_db)):
+    return crud.get_locations(db)
+
+
+@sync_app.get("/games", response_model=list[GameSystemOut])
+def list_game_systems(db: Session = Depends(get_read_db)):
+    return crud.get_game_systems(db)
+
+
+@sync_app.get("/events", response_model=list[EventOut])
+def list_events(
+    location_id: int | None = None,
+    game_system_ids: list[int] | None = Query(None),
+    date_from: date | None = None,
+    date_to: date | None = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    db: Session = Depends(get_read_db),
+):
+    return crud.get_events(db, location_id, game_system_ids, date_from, date_to, skip, limit)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _serve(variant: str, db_path: Path, port: int) -> subprocess.Popen:
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{db_path}"}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", _APPS[variant], "--port", str(port)]
+        + ["--log-level", "warning", "--no-access-log"],
+        env=env,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/games", timeout=1)
+            return server
+        except httpx.TransportError:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError(f"{variant} server did not start")
+
+
+async def _get(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, path: str) -> int:
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: bench\r\n\r\n".encode())
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while (line := await reader.readline()) != b"\r\n":
+        name, _, value = line.partition(b":")
+        if name.lower() == b"content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def _client(port: int, deadline: float, latencies: list[float], failures: list[int]):
+    # A bare keep-alive HTTP/1.1 client: httpx costs more CPU per request than
+    # the endpoints do, and would measure itself on a small machine.
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    i = 0
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        if await _get(reader, writer, _PATHS[i % len(_PATHS)]) == 200:
+            latencies.append(time.perf_counter() - started)
+        else:
+            failures.append(1)
+        i += 1
+    writer.close()
+
+
+async def _load(port: int, clients: int, seconds: float) -> dict:
+    latencies: list[float] = []
+    failures: list[int] = []
+    deadline = time.perf_counter() + seconds
+    await asyncio.gather(*(_client(port, deadline, latencies, failures) for _ in range(clients)))
+    elapsed = seconds + max(0.0, time.perf_counter() - deadline)
+
+    latencies.sort()
+    ms = [latency * 1000 for latency in latencies] or [0.0]
+    return {
+        "requests": len(latencies),
+        "failed": len(failures),
+        "rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(ms),
+        "p95_ms": ms[int(len(ms) * 0.95)],
+        "p99_ms": ms[int(len(ms) * 0.99)],
+    }
+
+
+def seed(db_path: Path, events: int) -> None:
+    data_dir = db_path.parent / "data"
+    data_dir.mkdir()
+    write_events(data_dir / "events.ndjson", generate_events(events, start=date.today()))
+    engine = create_write_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        run_import(db, data_dir, near_duplicates="off")
+    engine.dispose()
+
+
+def run(variant: str, db_path: Path, args: argparse.Namespace) -> dict:
+    port = _free_port()
+    server = _serve(variant, db_path, port)
+    try:
+        return asyncio.run(_load(port, args.clients, args.seconds))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=20_000)
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--variants", nargs="+", default=list(VARIANTS), choices=VARIANTS)
+    args = parser.parse_args()
+
+    print(
+        f"{'variant':<8} {'requests':>8} {'failed':>6} {'req/s':>7} "
+        f"{'p50 ms':>7} {'p95 ms':>7} {'p99 ms':>7}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "events.db"
+        seed(db_path, args.events)
+        for variant in args.variants:
+            r = run(variant, db_path, args)
+            print(
+                f"{variant:<8} {r['requests']:>8} {r['failed']:>6} {r['rps']:>7.0f} "
+                f"{r['p50_ms']:>7.1f} {r['p95_ms']:>7.1f} {r['p99_ms']:>7.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
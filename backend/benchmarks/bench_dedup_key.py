@@ -0,0 +1,162 @@
+"""Dedup key benchmark: 64-char SHA-256 hex keys vs. 16-byte BLOB keys.
+
+    python -m backend.benchmarks.bench_dedup_key --events 10000 100000
+
+Imports N generated events, then builds a copy of the database with the
+legacy events schema (hex ``dedup_hash`` with its own unique index, plus the
+redundant ``ix_events_id``).  For both layouts the runner prints the database
+size after VACUUM, the size of the dedup key index, and the time to look up
+existing keys one at a time and in batches of ``CHUNK_SIZE`` — the
+importer's upsert lookup pattern.
+"""
+
+import argparse
+import hashlib
+import random
+import shutil
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from backend import models  # noqa: F401 — registers ORM classes with Base
+from backend.benchmarks.generate import generate_events, write_events
+from backend.database import Base
+from backend.importer import CHUNK_SIZE, dedup_key_source, run_import
+
+_LEGACY_EVENTS = """
+CREATE TABLE events_legacy (
+    id INTEGER NOT NULL PRIMARY KEY,
+    location_id INTEGER NOT NULL REFERENCES locations (id),
+    game_system_id INTEGER NOT NULL REFERENCES game_systems (id),
+    title VARCHAR NOT NULL,
+    date DATE NOT NULL,
+    start_time VARCHAR,
+    description TEXT,
+    source_url VARCHAR,
+    source_type VARCHAR,
+    last_seen_at DATETIME,
+    is_expired BOOLEAN NOT NULL,
+    dedup_hash VARCHAR NOT NULL,
+    created_at DATETIME,
+    updated_at DATETIME
+)
+"""
+_COLUMNS = (
+    "id, location_id, game_system_id, title, date, start_time, description, source_url,"
+    " source_type, last_seen_at, is_expired, created_at, updated_at"
+)
+
+
+def _build_compact(db_path: Path, data_dir: Path) -> None:
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        run_import(db, data_dir)
+    engine.dispose()
+
+
+def _build_legacy(compact_path: Path, legacy_path: Path) -> None:
+    """Copy the compact database and rebuild its events table in the legacy layout."""
+    shutil.copy(compact_path, legacy_path)
+    conn = sqlite3.connect(legacy_path)
+    conn.create_function(
+        "legacy_hash",
+        4,
+        lambda *fields: hashlib.sha256(dedup_key_source(*fields).encode()).hexdigest(),
+        deterministic=True,
+    )
+    with conn:
+        conn.execute(_LEGACY_EVENTS)
+        conn.execute(
+            f"INSERT INTO events_legacy ({_COLUMNS}, dedup_hash)"
+            f" SELECT {', '.join('e.' + c for c in _COLUMNS.split(', '))},"
+            "  legacy_hash(l.name, g.name, e.title, e.date)"
+            " FROM events e JOIN locations l ON l.id = e.location_id"
+            " JOIN game_systems g ON g.id = e.game_system_id"
+        )
+        conn.execute("DROP TABLE events")
+        conn.execute("ALTER TABLE events_legacy RENAME TO events")
+        conn.execute("CREATE INDEX ix_events_id ON events (id)")
+        conn.execute("CREATE INDEX ix_events_date ON events (date)")
+        conn.execute("CREATE UNIQUE INDEX ix_events_dedup_hash ON events (dedup_hash)")
+    conn.close()
+
+
+def _measure(db_path: Path, lookups: int, seed: int) -> dict:
+    conn = sqlite3.connect(db_path)
+    conn.execute("VACUUM")
+    pages = dict(conn.execute("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name").fetchall())
+    key_index = next(
+        name for name in pages if name in ("ix_events_dedup_hash", "sqlite_autoindex_events_1")
+    )
+    keys = [key for (key,) in conn.execute("SELECT dedup_hash FROM events")]
+    sample = random.Random(seed).choices(keys, k=lookups)
+
+    started = time.perf_counter()
+    for key in sample:
+        conn.execute("SELECT id FROM events WHERE dedup_hash = ?", (key,)).fetchone()
+    point = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for i in range(0, len(sample), CHUNK_SIZE):
+        batch = sample[i : i + CHUNK_SIZE]
+        placeholders = ", ".join("?" * len(batch))
+        conn.execute(
+            f"SELECT id FROM events WHERE dedup_hash IN ({placeholders})", batch
+        ).fetchall()
+    batched = time.perf_counter() - started
+    conn.close()
+
+    return {
+        "db_kb": db_path.stat().st_size / 1024,
+        "key_index_kb": pages[key_index] / 1024,
+        "id_index_kb": pages.get("ix_events_id", 0) / 1024,
+        "point_us": point / lookups * 1e6,
+        "batched_us": batched / lookups * 1e6,
+    }
+
+
+def run(events: int, args: argparse.Namespace) -> dict[str, dict]:
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        data_dir = root / "data"
+        data_dir.mkdir()
+        records = generate_events(events, args.locations, args.game_systems, 0.0, args.seed)
+        write_events(data_dir / "events.ndjson", records)
+        compact = root / "compact.db"
+        legacy = root / "legacy.db"
+        _build_compact(compact, data_dir)
+        _build_legacy(compact, legacy)
+        return {
+            "legacy": _measure(legacy, args.lookups, args.seed),
+            "compact": _measure(compact, args.lookups, args.seed),
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--locations", type=int, default=50)
+    parser.add_argument("--game-systems", type=int, default=12)
+    parser.add_argument("--lookups", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(
+        f"{'events':>9} {'layout':<8} {'DB KB':>9} {'key idx KB':>10} {'id idx KB':>9} "
+        f"{'point us':>9} {'batched us':>10}"
+    )
+    for events in args.events:
+        for layout, r in run(events, args).items():
+            print(
+                f"{events:>9} {layout:<8} {r['db_kb']:>9.0f} {r['key_index_kb']:>10.0f} "
+                f"{r['id_index_kb']:>9.0f} {r['point_us']:>9.2f} {r['batched_us']:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""GET /events page cost: response size and requests per second per variant.
+
+    python -m backend.benchmarks.bench_event_page --events 20000 --limit 500
+
+Imports N generated upcoming events, then requests the same page of
+``--limit`` events through the app for ``--seconds`` per variant, clearing the
+response cache before every request so each one queries and serializes.
+Requests are made in-process with TestClient, one at a time, so req/s is the
+app's own cost per page rather than a server's throughput.
+
+* ``orm``     — the previous endpoint: Event objects with joinedload, validated
+                and serialized through ``response_model=list[EventOut]``
+* ``full``    — backend.main: plain rows encoded with orjson (same bytes)
+* ``compact`` — ``format=compact``: the page's locations and game systems
+                once, and events that refer to them by id
+"""
+
+import argparse
+import logging
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from backend import databridge as crud
+from backend import models  # noqa: F401 — registers ORM classes with Base
+from backend.benchmarks.generate import generate_events, write_events
+from backend.database import (
+    Base,
+    create_async_read_engine,
+    create_write_engine,
+    get_async_read_db,
+)
+from backend.importer import run_import
+from backend.main import app, events_cache
+from backend.schemas import EventOut
+
+VARIANTS = ("orm", "full", "compact")
+
+# GET /events as it was before rows were encoded directly, served on its own.
+orm_app = FastAPI()
+
+
+@orm_app.get("/events", response_model=list[EventOut])
+async def list_events(limit: int = 100, db: AsyncSession = Depends(get_async_read_db)):
+    return (await db.scalars(crud.events_query(limit=limit))).all()
+
+
+def seed(db_path: Path, events: int) -> None:
+    data_dir = db_path.parent / "data"
+    data_dir.mkdir()
+    write_events(data_dir / "events.ndjson", generate_events(events, start=date.today()))
+    engine = create_write_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        run_import(db, data_dir, near_duplicates="off")
+    engine.dispose()
+
+
+def run(args: argparse.Namespace) -> list[dict]:
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "events.db"
+        seed(db_path, args.events)
+        engine = create_async_read_engine(f"sqlite:///{db_path}")
+        factory = async_sessionmaker(engine, autoflush=False)
+
+        async def override_get_async_read_db():
+            async with factory() as session:
+                yield session
+
+        for target in (app, orm_app):
+            target.dependency_overrides[get_async_read_db] = override_get_async_read_db
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+        try:
+            for variant in args.variants:
+                client = TestClient(orm_app if variant == "orm" else app)
+                params = {"limit": args.limit}
+                if variant != "orm":
+                    params["format"] = variant
+                size = len(client.get("/events", params=params).content)
+                requests = 0
+                deadline = time.perf_counter() + args.seconds
+                started = time.perf_counter()
+                while time.perf_counter() < deadline:
+                    events_cache.clear()
+                    client.get("/events", params=params)
+                    requests += 1
+                elapsed = time.perf_counter() - started
+                results.append(
+                    {
+                        "variant": variant,
+                        "bytes": size,
+                        "rps": requests / elapsed,
+                        "ms": elapsed / requests * 1000,
+                    }
+                )
+        finally:
+            app.dependency_overrides.clear()
+            orm_app.dependency_overrides.clear()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=20_000)
+    parser.add_argument("--limit", type=int, default=500)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--variants", nargs="+", default=list(VARIANTS), choices=VARIANTS)
+    args = parser.parse_args()
+
+    print(f"{'variant':<8} {'bytes':>8} {'req/s':>7} {'ms/req':>7}")
+    for r in run(args):
+        print(f"{r['variant']:<8} {r['bytes']:>8} {r['rps']:>7.1f} {r['ms']:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
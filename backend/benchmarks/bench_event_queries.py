@@ -0,0 +1,147 @@
+"""Event query benchmark: full-table date index vs. partial indexes on live events.
+
+    python -m backend.benchmarks.bench_event_queries --events 100000
+
+Imports N generated events spread over the past and coming year, so most of
+them are expired, like a long-running database.  Each query pattern is then
+run against two index layouts:
+
+* ``before`` — the previous layout, a single index on ``events(date)``
+* ``after``  — the partial indexes on ``(date, id)``, ``(location_id, date, id)``
+               and ``(game_system_id, date, id)`` ``WHERE is_expired = 0``
+
+Listing queries are captured from databridge itself and run as raw SQL, so
+the timings measure SQLite rather than ORM object building.  Listings need
+every column, so they look up each matching row in the table; the ``count``
+rows use the same filters and are answered from the index alone
+(``COVERING INDEX``), without touching the table.
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from sqlalchemy import create_engine, event, func, select, text
+from sqlalchemy.orm import Session
+
+from backend import models  # noqa: F401 — registers ORM classes with Base
+from backend.benchmarks.generate import generate_events, write_events
+from backend.database import Base
+from backend.databridge import LIVE, get_events, get_events_for_subscriber
+from backend.importer import run_import
+from backend.models import Event, Subscriber
+
+LAYOUTS = ("before", "after")
+_PARTIAL = (
+    "ix_events_live_date_id",
+    "ix_events_live_location_date_id",
+    "ix_events_live_game_system_date_id",
+)
+
+
+def _queries(today: date) -> dict:
+    """Map a pattern name to a callable issuing it through the ORM or Core."""
+    week = today + timedelta(days=7)
+    month = today + timedelta(days=30)
+    subscriber = Subscriber(location_ids=[1, 2, 3], game_system_ids=[])
+
+    def count(*filters):
+        return lambda db: db.execute(select(func.count()).where(LIVE, *filters)).scalar()
+
+    return {
+        "upcoming week": lambda db: get_events(db, date_from=today, date_to=week, limit=500),
+        "location month": lambda db: get_events(db, location_id=1, date_from=today, date_to=month),
+        "game system": lambda db: get_events(db, game_system_ids=[1, 2], date_from=today),
+        "subscriber": lambda db: get_events_for_subscriber(db, subscriber),
+        "count week": count(Event.date.between(today, week)),
+        "count location": count(Event.location_id == 1, Event.date >= today),
+        "count system": count(Event.game_system_id == 1, Event.date >= today),
+    }
+
+
+def _capture(engine, fn) -> tuple[str, tuple]:
+    captured = []
+
+    def listener(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", listener)
+    with Session(engine) as db:
+        fn(db)
+    event.remove(engine, "before_cursor_execute", listener)
+    return captured[-1]
+
+
+def _set_layout(engine, layout: str) -> None:
+    with engine.begin() as conn:
+        if layout == "before":
+            for name in _PARTIAL:
+                conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_events_date ON events (date)"))
+        else:
+            conn.execute(text("DROP INDEX IF EXISTS ix_events_date"))
+            for index in Event.__table__.indexes:
+                index.create(conn, checkfirst=True)
+        conn.execute(text("ANALYZE"))
+
+
+def run(args: argparse.Namespace) -> list[dict]:
+    today = date.today()
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        records = generate_events(
+            args.events, seed=args.seed, start=today - timedelta(days=365), days=730
+        )
+        write_events(root / "events.ndjson", records)
+        engine = create_engine(f"sqlite:///{root / 'events.db'}")
+        Base.metadata.create_all(engine)
+        with Session(engine) as db:
+            run_import(db, root, near_duplicates="off")
+
+        for layout in LAYOUTS:
+            _set_layout(engine, layout)
+            for name, fn in _queries(today).items():
+                statement, parameters = _capture(engine, fn)
+                with engine.connect() as conn:
+                    plan = " / ".join(
+                        row[3]
+                        for row in conn.exec_driver_sql(
+                            f"EXPLAIN QUERY PLAN {statement}", parameters
+                        )
+                    )
+                    timings = []
+                    for _ in range(args.repeat):
+                        started = time.perf_counter()
+                        rows = conn.exec_driver_sql(statement, parameters).fetchall()
+                        timings.append(time.perf_counter() - started)
+                results.append(
+                    {
+                        "layout": layout,
+                        "query": name,
+                        "rows": len(rows) if len(rows) != 1 else rows[0][0],
+                        "ms": statistics.median(timings) * 1000,
+                        "plan": plan,
+                    }
+                )
+        engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'layout':<7} {'query':<15} {'rows':>7} {'ms':>8}  plan")
+    for r in run(args):
+        print(f"{r['layout']:<7} {r['query']:<15} {r['rows']:>7} {r['ms']:>8.2f}  {r['plan']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Importer benchmark: fresh, repeat and mixed imports against a temporary SQLite DB.
+
+    python -m backend.benchmarks.bench_import --events 1000 10000 100000
+
+Scenarios, each measured in its own process so peak RSS is per scenario:
+
+* ``fresh``    — import N generated events into an empty database
+* ``reimport`` — import the same file again (every event re-seen, unchanged)
+* ``mixed``    — after the fresh import, a file where half the events are re-seen
+                 with a newer ``last_seen_at`` and half are new
+
+For each scenario the runner prints records/sec, peak RSS of the importing
+process and the number of SQL statements executed (an executemany counts once).
+"""
+
+import argparse
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from multiprocessing import get_context
+from pathlib import Path
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from backend import models  # noqa: F401 — registers ORM classes with Base
+from backend.benchmarks.generate import generate_events, write_events
+from backend.database import Base
+from backend.importer import run_import
+
+SCENARIOS = ("fresh", "reimport", "mixed")
+
+
+def _import(db_path: Path, data_dir: Path, workers: int) -> dict:
+    """Import *data_dir* into *db_path* and return timing, RSS and statement counts."""
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(engine)
+    statements = 0
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count(conn, cursor, statement, parameters, context, executemany):
+        nonlocal statements
+        statements += 1
+
+    with Session(engine) as db:
+        started = time.perf_counter()
+        result = run_import(db, data_dir, workers=workers, force=True)
+        seconds = time.perf_counter() - started
+    engine.dispose()
+
+    return {
+        "records": result["processed"],
+        "seconds": seconds,
+        "records_per_sec": result["processed"] / seconds if seconds else 0.0,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "statements": statements,
+        "result": result,
+    }
+
+
+def _in_subprocess(fn, *args):
+    with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as pool:
+        return pool.submit(fn, *args).result()
+
+
+def _write_datasets(root: Path, events: int, args: argparse.Namespace) -> tuple[Path, Path]:
+    fresh_dir = root / "fresh"
+    mixed_dir = root / "mixed"
+    fresh_dir.mkdir()
+    mixed_dir.mkdir()
+
+    def base():
+        return generate_events(
+            events, args.locations, args.game_systems, args.duplicates, args.seed
+        )
+
+    def reseen():
+        for n, record in enumerate(base()):
+            if n >= events // 2:
+                return
+            yield {**record, "last_seen_at": "2026-06-01T12:00:00"}
+
+    new = generate_events(
+        events - events // 2,
+        args.locations,
+        args.game_systems,
+        args.duplicates,
+        args.seed + 1,
+        first_id=events,
+    )
+    write_events(fresh_dir / f"events.{args.format}", base())
+    write_events(mixed_dir / f"events.{args.format}", chain(reseen(), new))
+    return fresh_dir, mixed_dir
+
+
+def run(events: int, args: argparse.Namespace) -> dict[str, dict]:
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        fresh_dir, mixed_dir = _write_datasets(root, events, args)
+        for scenario in args.scenarios:
+            db_path = root / f"{scenario}.db"
+            if scenario != "fresh":
+                _in_subprocess(_import, db_path, fresh_dir, args.workers)
+            data_dir = mixed_dir if scenario == "mixed" else fresh_dir
+            results[scenario] = _in_subprocess(_import, db_path, data_dir, args.workers)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--locations", type=int, default=50)
+    parser.add_argument("--game-systems", type=int, default=12)
+    parser.add_argument("--duplicates", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--format", default="json", choices=["json", "ndjson", "json.gz"])
+    parser.add_argument("--scenarios", nargs="+", default=list(SCENARIOS), choices=SCENARIOS)
+    args = parser.parse_args()
+
+    print(
+        f"{'events':>9} {'scenario':<9} {'records':>9} {'seconds':>8} "
+        f"{'records/s':>10} {'peak RSS MB':>11} {'statements':>10}"
+    )
+    for events in args.events:
+        for scenario, r in run(events, args).items():
+            print(
+                f"{events:>9} {scenario:<9} {r['records']:>9} {r['seconds']:>8.2f} "
+                f"{r['records_per_sec']:>10.0f} {r['peak_rss_mb']:>11.1f} {r['statements']:>10}"
+            )
+
+
+if __name__ == "__main__":
+    main()
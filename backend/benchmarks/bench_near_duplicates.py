@@ -0,0 +1,145 @@
+"""Near-duplicate detection benchmark: MinHash/LSH vs. exhaustive comparison.
+
+    python -m backend.benchmarks.bench_near_duplicates --events 10000 100000
+
+Imports N generated events, about ``--near-duplicates`` of which repeat an
+earlier event under a reworded title, with detection off.  It then times
+resolve_near_duplicates over every (location, game system, date) group.
+For comparison it also times an exhaustive Jaccard check of every pair in
+each group, and one across each whole location (what blocking on the date
+and game system saves).  Reported precision and recall are measured against
+the generator's ground truth: a reworded title keeps its original's number.
+
+Groups below ``LSH_MIN_GROUP`` events are compared pairwise; use fewer
+``--locations``/``--game-systems``/``--days`` to exercise the LSH path with
+large groups, e.g. ``--locations 5 --game-systems 2 --days 7``.
+"""
+
+import argparse
+import re
+import tempfile
+import time
+from collections import defaultdict
+from datetime import date
+from itertools import combinations
+from pathlib import Path
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from backend import models  # noqa: F401 — registers ORM classes with Base
+from backend.benchmarks.generate import generate_events, write_events
+from backend.database import Base
+from backend.importer import run_import
+from backend.models import Event
+from backend.near_duplicates import (
+    NEAR_DUPLICATE_THRESHOLD,
+    jaccard,
+    resolve_near_duplicates,
+    shingles,
+)
+
+# Generated titles end in a unique number, which a reworded copy keeps.
+_NUMBER = re.compile(r"\b\d+\b")
+
+
+def _exhaustive(groups: dict, threshold: float) -> tuple[int, float]:
+    started = time.perf_counter()
+    pairs = 0
+    for titles in groups.values():
+        hashes = [shingles(title) for title in titles]
+        for a, b in combinations(hashes, 2):
+            pairs += 1
+            jaccard(a, b) >= threshold  # noqa: B015 — timing only
+    return pairs, time.perf_counter() - started
+
+
+def run(events: int, args: argparse.Namespace) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        records = generate_events(
+            events,
+            args.locations,
+            args.game_systems,
+            0.0,
+            args.seed,
+            start=date.today(),  # detection skips expired events
+            days=args.days,
+            near_duplicates=args.near_duplicates,
+        )
+        write_events(root / "events.ndjson", records)
+        engine = create_engine(f"sqlite:///{root / 'events.db'}")
+        Base.metadata.create_all(engine)
+        with Session(engine) as db:
+            run_import(db, root, near_duplicates="off")
+            rows = db.execute(
+                select(Event.id, Event.location_id, Event.game_system_id, Event.date, Event.title)
+            ).all()
+
+            started = time.perf_counter()
+            groups = {(loc, system, day) for _, loc, system, day, _ in rows}
+            matched = resolve_near_duplicates(db, groups, args.threshold, action="flag")
+            seconds = time.perf_counter() - started
+            db.commit()
+            flagged = db.execute(
+                select(Event.id, Event.duplicate_of_id).where(Event.duplicate_of_id.isnot(None))
+            ).all()
+        engine.dispose()
+
+    number = {event_id: _NUMBER.findall(title)[-1] for event_id, *_, title in rows}
+    by_group = defaultdict(list)
+    by_location = defaultdict(list)
+    truth = 0
+    for _, loc, system, day, title in rows:
+        by_group[loc, system, day].append(title)
+        by_location[loc].append(title)
+    for titles in by_group.values():
+        truth += len(titles) - len({_NUMBER.findall(title)[-1] for title in titles})
+    correct = sum(number[duplicate] == number[canonical] for duplicate, canonical in flagged)
+    group_pairs, group_seconds = _exhaustive(by_group, args.threshold)
+    location_pairs, location_seconds = (
+        _exhaustive(by_location, args.threshold) if args.per_location else (0, 0.0)
+    )
+    return {
+        "events": len(rows),
+        "groups": len(by_group),
+        "matched": matched,
+        "precision": correct / matched if matched else 1.0,
+        "recall": correct / truth if truth else 1.0,
+        "detect_seconds": seconds,
+        "group_pairs": group_pairs,
+        "group_seconds": group_seconds,
+        "location_pairs": location_pairs,
+        "location_seconds": location_seconds,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--locations", type=int, default=50)
+    parser.add_argument("--game-systems", type=int, default=12)
+    parser.add_argument("--days", type=int, default=365, help="fewer days make larger groups")
+    parser.add_argument("--near-duplicates", type=float, default=0.05)
+    parser.add_argument("--threshold", type=float, default=NEAR_DUPLICATE_THRESHOLD)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--per-location", action="store_true", help="also time all pairs within each location"
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'events':>9} {'groups':>8} {'matched':>8} {'precision':>9} {'recall':>7} "
+        f"{'detect s':>8} {'group pairs':>11} {'pairs s':>8} {'loc pairs':>11} {'loc s':>7}"
+    )
+    for events in args.events:
+        r = run(events, args)
+        print(
+            f"{r['events']:>9} {r['groups']:>8} {r['matched']:>8} {r['precision']:>9.3f} "
+            f"{r['recall']:>7.3f} {r['detect_seconds']:>8.2f} {r['group_pairs']:>11} "
+            f"{r['group_seconds']:>8.2f} {r['location_pairs']:>11} {r['location_seconds']:>7.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
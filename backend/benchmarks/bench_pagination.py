@@ -0,0 +1,94 @@
+"""Deep-page benchmark for GET /events: ``skip`` offsets vs. ``(date, id)`` cursors.
+
+    python -m backend.benchmarks.bench_pagination --events 200000
+
+Imports N generated upcoming events, then times one page of ``--limit``
+events through databridge.get_events at increasing depths, once with
+``skip=depth`` and once with the cursor of the event just before that depth.
+An offset makes SQLite step over every earlier row; a cursor seeks straight
+to it in the ``(date, id)`` index, so its time should not grow with depth.
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from backend import models  # noqa: F401 — registers ORM classes with Base
+from backend.benchmarks.generate import generate_events, write_events
+from backend.database import Base, configure_sqlite
+from backend.databridge import LIVE, get_events
+from backend.importer import run_import
+from backend.models import Event
+
+DEPTHS = (0, 1_000, 10_000, 50_000, 100_000)
+
+
+def _time(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def run(args: argparse.Namespace) -> list[dict]:
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        write_events(
+            root / "events.ndjson", generate_events(args.events, seed=args.seed, start=date.today())
+        )
+        engine = configure_sqlite(create_engine(f"sqlite:///{root / 'events.db'}"))
+        Base.metadata.create_all(engine)
+        with Session(engine) as db:
+            run_import(db, root, near_duplicates="off")
+
+        with Session(engine) as db:
+            keys = db.execute(
+                select(Event.date, Event.id).where(LIVE).order_by(Event.date, Event.id)
+            ).all()
+            for depth in (d for d in DEPTHS if d < len(keys)):
+                after = tuple(keys[depth - 1]) if depth else None
+
+                def by_skip(depth=depth):
+                    db.expunge_all()
+                    return get_events(db, skip=depth, limit=args.limit)
+
+                def by_cursor(after=after):
+                    db.expunge_all()
+                    return get_events(db, after=after, limit=args.limit)
+
+                assert [e.id for e in by_skip()] == [e.id for e in by_cursor()]
+                results.append(
+                    {
+                        "depth": depth,
+                        "skip_ms": _time(by_skip, args.repeat),
+                        "cursor_ms": _time(by_cursor, args.repeat),
+                    }
+                )
+        engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=200_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'depth':>7} {'skip ms':>8} {'cursor ms':>10}")
+    for r in run(args):
+        print(f"{r['depth']:>7} {r['skip_ms']:>8.2f} {r['cursor_ms']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Read latency during an import: default SQLite settings vs. the tuned profile.
+
+    python -m backend.benchmarks.bench_read_latency --events 50000 --readers 4
+
+For each profile, a database is seeded with ``--seed-events`` events, then a
+spawned process imports ``--events`` more while reader threads in this process
+repeatedly run the ``GET /events`` query (databridge.get_events).  The runner
+prints read latency percentiles, reads that failed with "database is locked"
+and how long the import took.
+
+``default`` is a plain engine (rollback journal, synchronous=FULL, 2 MB
+cache); ``tuned`` is the profile database.configure_sqlite applies.
+"""
+
+import argparse
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from backend import models  # noqa: F401 — registers ORM classes with Base
+from backend.benchmarks.generate import generate_events, write_events
+from backend.database import Base, configure_sqlite
+from backend.databridge import get_events
+from backend.importer import run_import
+
+PROFILES = ("default", "tuned")
+
+
+def _engine(db_path: Path, profile: str):
+    # The default busy timeout is 5 s for both profiles, so failures are real lock-outs.
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    return configure_sqlite(engine) if profile == "tuned" else engine
+
+
+def _import(db_path: Path, data_dir: Path, profile: str) -> float:
+    engine = _engine(db_path, profile)
+    with Session(engine) as db:
+        started = time.perf_counter()
+        run_import(db, data_dir, near_duplicates="off")
+        seconds = time.perf_counter() - started
+    engine.dispose()
+    return seconds
+
+
+def _read_until(engine, stop: threading.Event, latencies: list[float], failures: list[int]):
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            with Session(engine) as db:
+                get_events(db, limit=100)
+        except OperationalError:
+            failures.append(1)
+            continue
+        latencies.append(time.perf_counter() - started)
+
+
+def run(profile: str, args: argparse.Namespace, root: Path) -> dict:
+    db_path = root / f"{profile}.db"
+    seed_dir = root / f"{profile}-seed"
+    data_dir = root / f"{profile}-data"
+    seed_dir.mkdir()
+    data_dir.mkdir()
+    write_events(seed_dir / "seed.ndjson", generate_events(args.seed_events, seed=1))
+    write_events(
+        data_dir / "events.ndjson",
+        generate_events(args.events, seed=2, first_id=args.seed_events),
+    )
+
+    engine = _engine(db_path, profile)
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        run_import(db, seed_dir, near_duplicates="off")
+
+    latencies: list[float] = []
+    failures: list[int] = []
+    stop = threading.Event()
+    readers = [
+        threading.Thread(target=_read_until, args=(engine, stop, latencies, failures))
+        for _ in range(args.readers)
+    ]
+    with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as pool:
+        future = pool.submit(_import, db_path, data_dir, profile)
+        for reader in readers:
+            reader.start()
+        import_seconds = future.result()
+        stop.set()
+    for reader in readers:
+        reader.join()
+    engine.dispose()
+
+    latencies.sort()
+    ms = [latency * 1000 for latency in latencies] or [0.0]
+    return {
+        "reads": len(latencies),
+        "failed": len(failures),
+        "p50_ms": statistics.median(ms),
+        "p95_ms": ms[int(len(ms) * 0.95)],
+        "p99_ms": ms[int(len(ms) * 0.99)],
+        "max_ms": ms[-1],
+        "import_s": import_seconds,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed-events", type=int, default=20_000)
+    parser.add_argument("--events", type=int, default=50_000)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--profiles", nargs="+", default=list(PROFILES), choices=PROFILES)
+    args = parser.parse_args()
+
+    print(
+        f"{'profile':<8} {'reads':>7} {'failed':>6} {'p50 ms':>7} {'p95 ms':>7} "
+        f"{'p99 ms':>7} {'max ms':>8} {'import s':>8}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for profile in args.profiles:
+            r = run(profile, args, Path(tmp))
+            print(
+                f"{profile:<8} {r['reads']:>7} {r['failed']:>6} {r['p50_ms']:>7.1f} "
+                f"{r['p95_ms']:>7.1f} {r['p99_ms']:>7.1f} {r['max_ms']:>8.1f} "
+                f"{r['import_s']:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
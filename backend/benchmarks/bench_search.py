@@ -0,0 +1,116 @@
+"""Event search benchmark: FTS5 (GET /events?q=) vs. a LIKE scan.
+
+    python -m backend.benchmarks.bench_search --events 1000000
+
+Imports N generated upcoming events, then times each search through
+databridge.get_events (first page of 100) and the same words as
+``LIKE '%word%'`` over title, description, location and game system name.
+``matches`` is the number of events that contain the search; searches with
+more than SEARCH_RANK_LIMIT matches are listed by date rather than ranked.
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+from sqlalchemy import and_, create_engine, func, or_, select
+from sqlalchemy.orm import Session
+
+from backend import models  # noqa: F401 — registers ORM classes with Base
+from backend.benchmarks.generate import generate_events, write_events
+from backend.database import Base, configure_sqlite
+from backend.databridge import LIVE, SEARCH_RANK_LIMIT, get_events, search_terms
+from backend.importer import run_import
+from backend.models import Event, GameSystem, Location, events_fts
+
+SEARCHES = [
+    "malifaux",  # one game system
+    "warhammer",  # a common game system
+    "kill team",
+    "dragon narrative",  # location and event kind
+    "escal",  # prefix
+    "crusade 4242",  # one event
+]
+
+
+def _like_query(words: list[str]):
+    fields = (Event.title, Event.description, Location.name, GameSystem.name)
+    return (
+        select(Event)
+        .join(Location, Location.id == Event.location_id)
+        .join(GameSystem, GameSystem.id == Event.game_system_id)
+        .where(LIVE, and_(*(or_(*(f.like(f"%{w}%") for f in fields)) for w in words)))
+        .order_by(Event.date)
+        .limit(100)
+    )
+
+
+def _time(fn, repeat: int) -> tuple[float, int]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000, len(rows)
+
+
+def run(args: argparse.Namespace) -> list[dict]:
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        write_events(
+            root / "events.ndjson", generate_events(args.events, seed=args.seed, start=date.today())
+        )
+        engine = configure_sqlite(create_engine(f"sqlite:///{root / 'events.db'}"))
+        Base.metadata.create_all(engine)
+        started = time.perf_counter()
+        with Session(engine) as db:
+            run_import(db, root, near_duplicates="off")
+        print(f"imported {args.events} events in {time.perf_counter() - started:.0f} s")
+
+        with Session(engine) as db:
+            for search in SEARCHES:
+                matches = db.scalar(
+                    select(func.count())
+                    .select_from(events_fts)
+                    .where(events_fts.c.events_fts.match(search_terms(search)))
+                )
+                fts_ms, rows = _time(lambda s=search: get_events(db, q=s), args.repeat)
+                like = _like_query(search.split())
+                like_ms, _ = _time(lambda q=like: db.scalars(q).all(), max(1, args.repeat // 10))
+                db.expunge_all()
+                results.append(
+                    {
+                        "search": search,
+                        "matches": matches,
+                        "rows": rows,
+                        "order": "date" if matches > SEARCH_RANK_LIMIT else "rank",
+                        "fts_ms": fts_ms,
+                        "like_ms": like_ms,
+                    }
+                )
+        engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    results = run(args)
+    print(f"{'search':<18} {'matches':>8} {'rows':>5} {'order':<5} {'fts ms':>8} {'like ms':>9}")
+    for r in results:
+        print(
+            f"{r['search']:<18} {r['matches']:>8} {r['rows']:>5} {r['order']:<5} "
+            f"{r['fts_ms']:>8.2f} {r['like_ms']:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
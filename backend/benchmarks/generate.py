@@ -0,0 +1,188 @@
+"""Deterministic generator of synthetic event files in the sample_events.json schema.
+
+    python -m backend.benchmarks.generate --events 100000 --out /tmp/events.ndjson.gz
+
+The same arguments always produce the same records.  A share of records
+(``--duplicates``) repeat an earlier event's dedup key with a fresher
+``source_url``/``last_seen_at``, the way overlapping scrapes do.  Another
+share (``--near-duplicates``) repeat an earlier event under a reworded title,
+the way the same event scraped from a second source does; the reworded title
+keeps the original's trailing number.
+"""
+
+import argparse
+import gzip
+import json
+import random
+from collections import deque
+from collections.abc import Iterator
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+_STORE_PREFIXES = [
+    "Dragon's Den", "Game Vault", "Critical Hit", "The Dice Tower", "Warlord's Keep",
+    "Emerald City", "Hobby Bunker", "Iron Gate", "Red Castle", "Kobold Corner",
+    "Tabletop Haven", "Ogre's Lair", "Adventurer's Guild", "Blue Moon", "Citadel Point",
+]  # fmt: skip
+_STORE_SUFFIXES = ["Games", "Gaming", "Hobbies", "Comics & Games", "Game Lounge"]
+_CITIES = [
+    ("Milwaukee", "WI"), ("Madison", "WI"), ("Waukesha", "WI"), ("Racine", "WI"),
+    ("Kenosha", "WI"), ("Chicago", "IL"), ("Evanston", "IL"), ("Green Bay", "WI"),
+]  # fmt: skip
+_GAME_SYSTEMS = [
+    "Warhammer 40,000", "Age of Sigmar", "Kill Team", "Warcry", "Bolt Action",
+    "Star Wars: Legion", "Marvel Crisis Protocol", "Infinity", "Malifaux", "Warmachine",
+    "Kings of War", "Middle-earth SBG", "Necromunda", "Blood Bowl", "Frostgrave",
+    "One Page Rules", "Battletech", "Conquest", "Flames of War", "Star Wars: Shatterpoint",
+]  # fmt: skip
+_EVENT_KINDS = [
+    "Night", "League", "Open Play", "Tournament", "Escalation League",
+    "Narrative Campaign", "Learn to Play", "Doubles Tournament", "RTT", "Crusade Night",
+]  # fmt: skip
+_DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+_TIMES = [None, "10:00", "11:00", "12:00", "13:00", "17:00", "18:00", "18:30", "19:00"]
+_SOURCES = ["facebook", "discord", "website", "instagram"]
+_TITLE_SUFFIXES = ["League", "Weekly", "(Discord)", "- All Welcome"]
+_DESCRIPTIONS = [
+    "Open play and league games. All experience levels welcome.",
+    "Bring a 2000 point list. Prize support from the store.",
+    "Learn the game with demo armies provided. No purchase necessary.",
+    "Casual games, painting, and hanging out. Tables provided.",
+    "Three rounds, best painted and best sportsman awards.",
+    None,
+]
+
+
+def _numbered(base: list[str], count: int) -> list[str]:
+    """Cycle through *base*, numbering the repeats so every name is unique."""
+    names = []
+    for i in range(count):
+        name = base[i % len(base)]
+        if i >= len(base):
+            name += f" #{i // len(base) + 1}"
+        names.append(name)
+    return names
+
+
+def _reword(title: str, rng: random.Random) -> str:
+    """Reword *title* the way a second source might: abbreviate, recase, add a suffix."""
+    day, rest = title.split(" ", 1)
+    if rng.random() < 0.5:
+        day = day[:3]
+    title = f"{day} {rest}"
+    if rng.random() < 0.5:
+        title = title.lower()
+    if rng.random() < 0.5:
+        title = f"{title} {rng.choice(_TITLE_SUFFIXES)}"
+    return title
+
+
+def location_names(count: int) -> list[str]:
+    return _numbered([f"{p} {s}" for s in _STORE_SUFFIXES for p in _STORE_PREFIXES], count)
+
+
+def game_system_names(count: int) -> list[str]:
+    return _numbered(_GAME_SYSTEMS, count)
+
+
+def generate_events(
+    events: int,
+    locations: int = 50,
+    game_systems: int = 12,
+    duplicates: float = 0.1,
+    seed: int = 0,
+    start: date = date(2026, 1, 1),
+    days: int = 365,
+    first_id: int = 0,
+    near_duplicates: float = 0.0,
+) -> Iterator[dict]:
+    """Yield *events* raw records; about ``duplicates`` of them repeat an earlier dedup key
+    and about ``near_duplicates`` repeat an earlier event under a reworded title.
+
+    Titles and source URLs are numbered from *first_id*, so batches generated
+    with different seeds and non-overlapping ids never collide.
+    """
+    rng = random.Random(seed)
+    stores = location_names(locations)
+    systems = game_system_names(game_systems)
+    recent: deque[dict] = deque(maxlen=10_000)
+    seen_at = datetime(2026, 1, 1, 12)
+
+    for n in range(first_id, first_id + events):
+        if recent and rng.random() < duplicates:
+            record = dict(rng.choice(recent))
+            record["source_url"] = f"https://example.com/events/{n}"
+            record["last_seen_at"] = (seen_at + timedelta(hours=n % 48)).isoformat()
+            yield record
+            continue
+        if recent and rng.random() < near_duplicates:
+            record = dict(rng.choice(recent))
+            record["title"] = _reword(record["title"], rng)
+            record["source_url"] = f"https://example.com/events/{n}"
+            record["source_type"] = rng.choice(_SOURCES)
+            yield record
+            continue
+
+        system = rng.choice(systems)
+        day = start + timedelta(days=rng.randrange(days))
+        record = {
+            "location_name": rng.choice(stores),
+            "game_system": system,
+            "title": f"{_DAYS[day.weekday()]} {system} {rng.choice(_EVENT_KINDS)} {n}",
+            "date": day.isoformat(),
+            "time": rng.choice(_TIMES),
+            "description": rng.choice(_DESCRIPTIONS),
+            "source_url": f"https://example.com/events/{n}",
+            "source_type": rng.choice(_SOURCES),
+            "last_seen_at": seen_at.isoformat(),
+        }
+        recent.append(record)
+        yield record
+
+
+def write_events(path: Path, records: Iterator[dict]) -> int:
+    """Stream *records* to *path* as JSON or NDJSON (by suffix), gzipped for ``.gz``."""
+    opener = gzip.open if path.name.endswith(".gz") else open
+    ndjson = path.name.removesuffix(".gz").endswith(".ndjson")
+    count = 0
+    with opener(path, "wt", encoding="utf-8") as f:
+        if not ndjson:
+            f.write("[\n")
+        for record in records:
+            if ndjson:
+                f.write(json.dumps(record) + "\n")
+            else:
+                f.write((",\n" if count else "") + json.dumps(record))
+            count += 1
+        if not ndjson:
+            f.write("\n]\n")
+    return count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=10_000)
+    parser.add_argument("--locations", type=int, default=50)
+    parser.add_argument("--game-systems", type=int, default=12)
+    parser.add_argument("--duplicates", type=float, default=0.1)
+    parser.add_argument("--near-duplicates", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", type=Path, required=True, help=".json, .ndjson, optionally .gz")
+    args = parser.parse_args()
+
+    count = write_events(
+        args.out,
+        generate_events(
+            args.events,
+            args.locations,
+            args.game_systems,
+            args.duplicates,
+            args.seed,
+            near_duplicates=args.near_duplicates,
+        ),
+    )
+    print(f"Wrote {count} events to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
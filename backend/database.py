@@ -1,14 +1,269 @@
-from sqlalchemy import create_engine
+import os
+import threading
+
+from dotenv import load_dotenv
+from sqlalchemy import URL, Engine, create_engine, event, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from sqlalchemy.pool import Pool
+
+# database.py is imported before main.py gets to call load_dotenv().
+load_dotenv()
+
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./events.db")
+
+# SQLite connection profile, applied to every new connection (see configure_sqlite).
+# Page cache per connection, in KiB.
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+# Bytes of the database file read through mmap instead of read().
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+# How long a connection waits for a lock before "database is locked".
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+# Read-only connections kept open for GET requests.
+READ_POOL_SIZE = int(os.getenv("READ_POOL_SIZE", "8"))
+# Seconds a write waits in the queue for the single writer connection.
+WRITE_QUEUE_TIMEOUT = float(os.getenv("WRITE_QUEUE_TIMEOUT", "60"))
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    # WAL lets readers keep reading while an import writes.  It is a property of
+    # the file, so this only does work on the first connection.
+    cursor.execute("PRAGMA journal_mode=WAL")
+    # Durable across application crashes; only an OS crash can lose the last commits.
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+    cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.close()
+
+
+def _set_query_only(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA query_only=1")
+    cursor.close()
+
+
+def configure_sqlite(engine: Engine, read_only: bool = False) -> Engine:
+    """Apply the SQLite connection profile to every connection *engine* opens.
+
+    With *read_only*, connections also refuse writes (``PRAGMA query_only``).
+    """
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+        if read_only:
+            event.listen(engine, "connect", _set_query_only)
+    return engine
+
+
+def create_write_engine(url: str = DATABASE_URL) -> Engine:
+    """Engine with a single connection that every write goes through.
+
+    SQLite allows one writer at a time, so a write that finds the connection
+    busy waits in the pool's queue (up to WRITE_QUEUE_TIMEOUT) instead of
+    failing with "database is locked".  Sessions hold the connection from
+    their first statement until commit, rollback or close.
+    """
+    return configure_sqlite(
+        create_engine(
+            url,
+            connect_args={"check_same_thread": False},
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=WRITE_QUEUE_TIMEOUT,
+        )
+    )
+
+
+def create_read_engine(url: str = DATABASE_URL) -> Engine:
+    """Engine with a pool of read-only connections; with WAL they never wait on the writer."""
+    return configure_sqlite(
+        create_engine(
+            url,
+            connect_args={"check_same_thread": False},
+            pool_size=READ_POOL_SIZE,
+            max_overflow=READ_POOL_SIZE,
+        ),
+        read_only=True,
+    )
+
+
+def create_async_read_engine(url: str = DATABASE_URL) -> AsyncEngine:
+    """Async counterpart of create_read_engine, for the async GET endpoints.
+
+    A ``sqlite://`` URL is switched to the aiosqlite driver.  Each connection
+    runs its queries on an aiosqlite thread, so waiting on SQLite doesn't tie
+    up a threadpool worker per request.
+    """
+    async_url = make_url(url)
+    if async_url.drivername == "sqlite":
+        async_url = async_url.set(drivername="sqlite+aiosqlite")
+    engine = create_async_engine(async_url, pool_size=READ_POOL_SIZE, max_overflow=READ_POOL_SIZE)
+    configure_sqlite(engine.sync_engine, read_only=True)
+    return engine
+
+
+# Changes after every commit in this process that wrote rows (see data_generation),
+# and the generation at which each table was last written (see table_version).
+_data_generation = 0
+_table_versions: dict[str, int] = {}
+_data_generation_lock = threading.Lock()
+
+
+def _bump_data_generation(written: set) -> None:
+    global _data_generation
+    with _data_generation_lock:
+        _data_generation += 1
+        for name in written:
+            _table_versions[name] = _data_generation
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _note_write(conn, cursor, statement, parameters, context, executemany) -> None:
+    if context.isinsert or context.isupdate or context.isdelete:
+        table = getattr(context.compiled.statement, "table", None)
+        conn.info.setdefault("written", set()).add(getattr(table, "name", None))
+
+
+# The "commit" event fires before the DBAPI commit, while readers can still only
+# see the old rows, so the generation changes twice: when the commit starts and
+# again once it has finished.  A result built in between is filed under a
+# generation that no longer holds by the time the commit is visible.
+@event.listens_for(Engine, "commit")
+def _start_commit(conn) -> None:
+    written = conn.info.pop("written", None)
+    if written:
+        _bump_data_generation(written)
+        conn.info["committing"] = (written, _own_commit_marker(conn))
+
+
+# The DBAPI commit is over by the time the connection begins its next
+# transaction or goes back to the pool.
+@event.listens_for(Engine, "begin")
+def _finish_commit(conn) -> None:
+    committing = conn.info.pop("committing", None)
+    if committing:
+        _finish_own_commit(conn.connection.dbapi_connection, *committing)
+
+
+@event.listens_for(Pool, "checkin")
+def _finish_commit_on_checkin(dbapi_connection, connection_record) -> None:
+    committing = connection_record.info.pop("committing", None) if connection_record else None
+    if committing:
+        _finish_own_commit(dbapi_connection, *committing)
+
+
+@event.listens_for(Engine, "rollback")
+def _discard_write(conn) -> None:
+    conn.info.pop("written", None)
+
 
-DATABASE_URL = "sqlite:///./events.db"
+# os.stat signature of each database file and its WAL when last checked, and the
+# generation at which one of them last changed (see note_external_writes).
+_file_signatures: dict[str, tuple] = {}
+_external_generation = 0
 
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False},
-)
+
+def _file_signature(path: str) -> tuple:
+    signature = []
+    for name in (path, f"{path}-wal"):
+        try:
+            st = os.stat(name)
+        except FileNotFoundError:
+            signature.append(None)
+        else:
+            signature.append((st.st_ino, st.st_size, st.st_mtime_ns))
+    return tuple(signature)
+
+
+def _sqlite_data_version(dbapi_connection) -> int:
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA data_version")
+    version = cursor.fetchone()[0]
+    cursor.close()
+    return version
+
+
+def _own_commit_marker(conn) -> tuple[str, int] | None:
+    """What _finish_own_commit needs to tell this commit's file changes from others'.
+
+    None unless the files are as note_external_writes last saw them.  This
+    connection holds the write lock, so nobody else can commit before it does.
+    """
+    path = conn.engine.url.database
+    if conn.dialect.name != "sqlite" or path not in _file_signatures:
+        return None
+    if _file_signatures[path] != _file_signature(path):
+        return None
+    return path, _sqlite_data_version(conn.connection.dbapi_connection)
+
+
+def _finish_own_commit(dbapi_connection, written: set, marker: tuple[str, int] | None) -> None:
+    _bump_data_generation(written)
+    if marker is None or dbapi_connection is None:
+        return
+    path, data_version = marker
+    signature = _file_signature(path)
+    # data_version only changes when another connection commits, so if it
+    # held, the files changed through this commit alone and the tables it
+    # wrote have already been bumped.
+    if _sqlite_data_version(dbapi_connection) == data_version:
+        with _data_generation_lock:
+            _file_signatures[path] = signature
+
+
+def note_external_writes(url: str | URL) -> None:
+    """Change data_generation and every table_version if the database at *url* changed.
+
+    Commits from other processes, such as ``python -m backend.watcher`` or the
+    ``backend.importer`` CLI, fire no events in this one, but they do write the
+    database file or its WAL.  Call this before reading the counters to see
+    them too.  A commit from this process records the files it leaves behind,
+    so it is only counted again if another connection committed around it.
+    """
+    global _data_generation, _external_generation
+    path = make_url(url).database
+    if not path or path == ":memory:":
+        return
+    signature = _file_signature(path)
+    if _file_signatures.get(path) == signature:
+        return
+    with _data_generation_lock:
+        _file_signatures[path] = signature
+        _data_generation += 1
+        _external_generation = _data_generation
+
+
+def data_generation() -> int:
+    """Counter that changes whenever a transaction that wrote rows commits.
+
+    It changes both as the commit starts and once it has finished, so a value
+    read before a query never outlives a commit the query might not have seen.
+
+    Every engine in the process is tracked, so a result computed while the
+    counter had a given value is still current as long as the value holds.
+    Writes made by other processes are only seen through note_external_writes.
+    """
+    return _data_generation
+
+
+def table_version(name: str) -> int:
+    """The data_generation at which a commit last wrote table *name* (0 if none has).
+
+    Like data_generation, but only writes to that table change it, along with
+    any write from another process.
+    """
+    return max(_table_versions.get(name, 0), _external_generation)
+
+
+engine = create_write_engine()
+read_engine = create_read_engine()
+async_read_engine = create_async_read_engine()
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+AsyncReadSessionLocal = async_sessionmaker(async_read_engine, autoflush=False)
 
 
 class Base(DeclarativeBase):
@@ -23,7 +278,34 @@ def get_db():
         db.close()
 
 
+def get_read_db():
+    """Session for GET endpoints, on the read-only pool."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db():
+    """AsyncSession for the async GET endpoints, on the read-only pool."""
+    async with AsyncReadSessionLocal() as db:
+        yield db
+
+
+def get_session_factory() -> sessionmaker:
+    """Session factory for work that outlives the request, such as background jobs."""
+    return SessionLocal
+
+
+def get_read_session_factory() -> sessionmaker:
+    """Read-only counterpart of get_session_factory, for long read-only jobs."""
+    return ReadSessionLocal
+
+
 def create_tables():
     from . import models  # noqa: F401 - registers models with Base
+    from .migrations import run_migrations
 
     Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
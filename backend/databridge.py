@@ -1,24 +1,82 @@
-import json
+import base64
+import os
 import re
+from collections.abc import Iterable
 from datetime import UTC, date, datetime, timedelta
 
-from sqlalchemy import or_, update
-from sqlalchemy.orm import Session
-
-from .models import Event, GameSystem, Location, Subscriber
+from sqlalchemy import (
+    Select,
+    bindparam,
+    delete,
+    false,
+    func,
+    or_,
+    select,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, joinedload
+
+from .models import (
+    Event,
+    EventArchive,
+    GameSystem,
+    ImportCheckpoint,
+    ImportManifest,
+    Location,
+    Subscriber,
+    SubscriberGameSystem,
+    SubscriberLocation,
+    events_fts,
+)
+
+# Live (non-expired) events.  Spelled ``is_expired = 0`` rather than ``IS 0`` so
+# it matches the WHERE clause of the partial indexes on events.
+LIVE = Event.is_expired == false()
+_SEARCH_WORD = re.compile(r"\w+")
+# Search ranking: BM25 with a title hit worth more than a location or game system
+# hit, worth more than a description hit (weights follow events_fts's columns).
+# Lower is better.  Calling bm25() directly is cheaper per match than the
+# configurable ``rank`` column.
+SEARCH_RANK = func.bm25(events_fts.c.events_fts, 10.0, 1.0, 4.0, 4.0)
+# Searches matching more events than this are listed by date instead of ranked:
+# BM25 scores every match before the first page can be cut, which takes
+# hundreds of ms for a search like "warhammer" at 1M events.
+SEARCH_RANK_LIMIT = int(os.getenv("SEARCH_RANK_LIMIT", "2000"))
 
 
 def _utcnow() -> datetime:
     return datetime.now(UTC)
 
 
+def naive_utc(value: datetime) -> datetime:
+    """Return *value* as naive UTC, the form ``last_seen_at`` is stored and compared in.
+
+    SQLite's DateTime drops tzinfo and keeps the wall-clock time, so aware
+    values are converted before they are stored.  Naive values are taken as UTC.
+    """
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(UTC).replace(tzinfo=None)
+
+
 # ---------------------------------------------------------------------------
 # Locations
 # ---------------------------------------------------------------------------
 
 
+# The *_query functions build the statements behind the read endpoints, so the
+# sync helpers below and the async endpoints in main.py run the same SQL.
+
+
+def locations_query() -> Select:
+    return select(Location).order_by(Location.name)
+
+
 def get_locations(db: Session) -> list[Location]:
-    return db.query(Location).order_by(Location.name).all()
+    return list(db.scalars(locations_query()))
 
 
 def get_or_create_location(db: Session, name: str) -> Location:
@@ -30,13 +88,36 @@ def get_or_create_location(db: Session, name: str) -> Location:
     return location
 
 
+def get_location_ids(db: Session) -> dict[str, int]:
+    return dict(db.execute(select(Location.name, Location.id)).all())
+
+
+def create_locations(db: Session, names: Iterable[str]) -> dict[str, int]:
+    """Insert a location for each of *names* in one statement; return their name → id map.
+
+    Names another writer has added since the caller looked keep their existing row.
+    """
+    names = sorted(set(names))
+    if not names:
+        return {}
+    stmt = sqlite_insert(Location).on_conflict_do_nothing(index_elements=["name"])
+    db.execute(stmt, [{"name": name} for name in names])
+    return dict(
+        db.execute(select(Location.name, Location.id).where(Location.name.in_(names))).all()
+    )
+
+
 # ---------------------------------------------------------------------------
 # Game Systems
 # ---------------------------------------------------------------------------
 
 
+def game_systems_query() -> Select:
+    return select(GameSystem).order_by(GameSystem.name)
+
+
 def get_game_systems(db: Session) -> list[GameSystem]:
-    return db.query(GameSystem).order_by(GameSystem.name).all()
+    return list(db.scalars(game_systems_query()))
 
 
 def _make_slug(name: str) -> str:
@@ -59,41 +140,225 @@ def get_or_create_game_system(db: Session, name: str) -> GameSystem:
     return gs
 
 
+def get_game_system_ids(db: Session) -> dict[str, int]:
+    return dict(db.execute(select(GameSystem.name, GameSystem.id)).all())
+
+
+def create_game_systems(db: Session, names: Iterable[str]) -> dict[str, int]:
+    """Insert a game system for each of *names* in one statement; return their name → id map.
+
+    Like create_locations, names another writer has added keep their existing row.
+    """
+    names = sorted(set(names))
+    if not names:
+        return {}
+    existing = set(db.scalars(select(GameSystem.name).where(GameSystem.name.in_(names))))
+    taken = set(db.scalars(select(GameSystem.slug)))
+    rows = []
+    for name in names:
+        if name in existing:
+            continue
+        slug = base_slug = _make_slug(name)
+        counter = 1
+        while slug in taken:
+            slug = f"{base_slug}-{counter}"
+            counter += 1
+        taken.add(slug)
+        rows.append({"name": name, "slug": slug})
+    if rows:
+        stmt = sqlite_insert(GameSystem).on_conflict_do_nothing(index_elements=["name"])
+        db.execute(stmt, rows)
+    return dict(
+        db.execute(select(GameSystem.name, GameSystem.id).where(GameSystem.name.in_(names))).all()
+    )
+
+
 # ---------------------------------------------------------------------------
 # Events
 # ---------------------------------------------------------------------------
 
 
-def get_events(
-    db: Session,
+def search_terms(q: str) -> str | None:
+    """Turn free text into an FTS5 query that requires every word, as a prefix.
+
+    ``kill tea`` becomes ``"kill"* "tea"*``.  Quoting each word keeps FTS5
+    syntax characters in user input from being parsed.  Returns None if *q*
+    has no words.
+    """
+    words = _SEARCH_WORD.findall(q)
+    return " ".join(f'"{word}"*' for word in words) or None
+
+
+def search_match_count_query(terms: str) -> Select:
+    """Count events_fts matches for *terms* (from search_terms), up to SEARCH_RANK_LIMIT + 1.
+
+    Stopping there keeps the count cheap for broad searches; callers only need
+    to know whether to pass ``ranked`` to events_query.
+    """
+    matches = (
+        select(events_fts.c.rowid)
+        .where(events_fts.c.events_fts.match(terms))
+        .limit(SEARCH_RANK_LIMIT + 1)
+    )
+    return select(func.count()).select_from(matches.subquery())
+
+
+def encode_event_cursor(event_date: date, event_id: int) -> str:
+    """Opaque cursor for the page of events that follows the event (*event_date*, *event_id*)."""
+    raw = f"{event_date.isoformat()}:{event_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_event_cursor(cursor: str) -> tuple[date, int]:
+    """Inverse of encode_event_cursor; raises ValueError for a malformed cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        event_date, event_id = raw.split(":")
+        return date.fromisoformat(event_date), int(event_id)
+    except ValueError as exc:
+        raise ValueError(f"Invalid cursor {cursor!r}") from exc
+
+
+# Location and game system are joined into every event listing: EventOut and
+# the newsletter templates read both for each event, lazy loads would cost a
+# SELECT per distinct row, and an AsyncSession can't lazy-load at all.
+EVENT_RELATIONS = (joinedload(Event.location), joinedload(Event.game_system))
+
+# The columns of an event row from events_query(rows=True): the event's
+# EventOut fields, then its location's LocationOut fields, then its game
+# system's GameSystemOut fields, each in schema order.
+EVENT_ROW_FIELDS = (
+    "id",
+    "title",
+    "date",
+    "start_time",
+    "description",
+    "source_url",
+    "source_type",
+    "last_seen_at",
+    "duplicate_of_id",
+)
+LOCATION_ROW_FIELDS = ("id", "name", "city", "state", "website", "discord_url", "facebook_url")
+GAME_SYSTEM_ROW_FIELDS = ("id", "name", "slug", "publisher")
+_EVENT_ROW_COLUMNS = (
+    *(Event.__table__.c[name] for name in EVENT_ROW_FIELDS),
+    *(Location.__table__.c[name] for name in LOCATION_ROW_FIELDS),
+    *(GameSystem.__table__.c[name] for name in GAME_SYSTEM_ROW_FIELDS),
+)
+
+
+def events_query(
     location_id: int | None = None,
     game_system_ids: list[int] | None = None,
     date_from: date | None = None,
     date_to: date | None = None,
     skip: int = 0,
     limit: int = 100,
-) -> list[Event]:
-    query = db.query(Event).filter(Event.is_expired.is_(False))
+    q: str | None = None,
+    ranked: bool = True,
+    after: tuple[date, int] | None = None,
+    rows: bool = False,
+) -> Select:
+    """Live events matching the filters, by date and then id.
+
+    With *rows*, each result is a plain row of the EVENT_ROW_FIELDS,
+    LOCATION_ROW_FIELDS and GAME_SYSTEM_ROW_FIELDS columns instead of an Event,
+    which skips building ORM objects for pages that are only serialized.
+
+    *after* (from decode_event_cursor) starts the page after that event.  Unlike
+    *skip*, it seeks straight to the page in the date index, and a page doesn't
+    shift when events are added before it.
+
+    With search text *q*, only events whose title, description, location or
+    game system name match it are returned, best match first (see events_fts);
+    text without any words matches no events, and blank text is no search.
+    With *ranked* false they stay in date order, which lets SQLite walk the
+    date index and stop after one page; see search_match_count_query.
+    """
+    if rows:
+        # Outer joins, like joinedload's, keep events as SQLite's outer loop.
+        stmt = select(*_EVENT_ROW_COLUMNS).select_from(
+            Event.__table__.outerjoin(Location.__table__).outerjoin(GameSystem.__table__)
+        )
+    else:
+        stmt = select(Event).options(*EVENT_RELATIONS)
+    stmt = stmt.where(LIVE, Event.is_merged.is_(False))
 
     if location_id is not None:
-        query = query.filter(Event.location_id == location_id)
+        stmt = stmt.where(Event.location_id == location_id)
     if game_system_ids:
-        query = query.filter(Event.game_system_id.in_(game_system_ids))
+        stmt = stmt.where(Event.game_system_id.in_(game_system_ids))
     if date_from is not None:
-        query = query.filter(Event.date >= date_from)
+        stmt = stmt.where(Event.date >= date_from)
     if date_to is not None:
-        query = query.filter(Event.date <= date_to)
+        stmt = stmt.where(Event.date <= date_to)
+    if after is not None:
+        stmt = stmt.where(tuple_(Event.date, Event.id) > tuple_(*after))
+
+    terms = search_terms(q) if q else None
+    if terms is None and q and not q.isspace():
+        # Text with no words, such as "!!!", is a search that matches nothing.
+        stmt = stmt.where(false())
+    elif terms and ranked:
+        stmt = stmt.join(events_fts, events_fts.c.rowid == Event.id)
+        stmt = stmt.where(events_fts.c.events_fts.match(terms)).order_by(SEARCH_RANK)
+    elif terms:
+        matches = select(events_fts.c.rowid).where(events_fts.c.events_fts.match(terms))
+        # "+ 0" stops SQLite from looking events up by the matched ids, which
+        # would mean sorting every match by date.
+        stmt = stmt.where((Event.id + 0).in_(matches))
+
+    return stmt.order_by(Event.date.asc(), Event.id.asc()).offset(skip).limit(limit)
+
+
+def get_events(
+    db: Session,
+    location_id: int | None = None,
+    game_system_ids: list[int] | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    skip: int = 0,
+    limit: int = 100,
+    q: str | None = None,
+    after: tuple[date, int] | None = None,
+) -> list[Event]:
+    terms = search_terms(q) if q else None
+    ranked = not terms or db.scalar(search_match_count_query(terms)) <= SEARCH_RANK_LIMIT
+    stmt = events_query(
+        location_id, game_system_ids, date_from, date_to, skip, limit, q, ranked, after
+    )
+    return list(db.scalars(stmt))
+
 
-    return query.order_by(Event.date.asc()).offset(skip).limit(limit).all()
+def _has_changed(event: Event, record: dict) -> bool:
+    """Return True if applying *record* to an existing *event* would change its content."""
+    source_url = record.get("source_url", event.source_url)
+    return event.is_expired or source_url != event.source_url
 
 
 def upsert_event(
-    db: Session, record: dict, location: Location, game_system: GameSystem
+    db: Session,
+    record: dict,
+    location: Location,
+    game_system: GameSystem,
+    skip_unchanged: bool = False,
 ) -> tuple[Event, bool]:
+    """Create the event for *record*, or refresh the existing one with the same dedup hash.
+
+    With *skip_unchanged*, a re-seen event whose content is unchanged only has
+    ``last_seen_at`` bumped by a direct UPDATE, so the row isn't dirtied and
+    ``updated_at`` keeps the time of the last real change.
+    """
     existing = db.query(Event).filter(Event.dedup_hash == record["dedup_hash"]).first()
 
+    last_seen_at = naive_utc(record.get("last_seen_at") or _utcnow())
     if existing:
-        existing.last_seen_at = record.get("last_seen_at") or _utcnow()
+        if skip_unchanged and not _has_changed(existing, record):
+            if existing.last_seen_at != last_seen_at:
+                touch_events(db, [existing.dedup_hash], last_seen_at)
+                db.expire(existing, ["last_seen_at"])
+            return existing, False
+        existing.last_seen_at = last_seen_at
         existing.source_url = record.get("source_url", existing.source_url)
         existing.is_expired = False  # re-seen events are no longer expired
         return existing, False
@@ -107,23 +372,240 @@ def upsert_event(
         description=record.get("description"),
         source_url=record.get("source_url"),
         source_type=record.get("source_type"),
-        last_seen_at=record.get("last_seen_at") or _utcnow(),
+        last_seen_at=last_seen_at,
         dedup_hash=record["dedup_hash"],
     )
     db.add(event)
     return event, True
 
 
-def expire_old_events(db: Session, days: int = 30) -> int:
-    cutoff = date.today() - timedelta(days=days)
-    result = db.execute(
+def get_event_states(db: Session) -> dict[bytes, tuple[str | None, bool, datetime | None]]:
+    """Map every event's dedup hash to its ``(source_url, is_expired, last_seen_at)``."""
+    rows = db.execute(
+        select(Event.dedup_hash, Event.source_url, Event.is_expired, Event.last_seen_at)
+    )
+    return {dedup_hash: (url, expired, seen) for dedup_hash, url, expired, seen in rows}
+
+
+def get_archived_hashes(db: Session, dedup_hashes: Iterable[bytes]) -> set[bytes]:
+    """The subset of *dedup_hashes* that belong to archived events."""
+    dedup_hashes = list(dedup_hashes)
+    if not dedup_hashes:
+        return set()
+    return set(
+        db.scalars(select(EventArchive.dedup_hash).where(EventArchive.dedup_hash.in_(dedup_hashes)))
+    )
+
+
+def touch_events(db: Session, dedup_hashes: list[bytes], last_seen_at: datetime) -> None:
+    """Set ``last_seen_at`` on the given events in one UPDATE, leaving ``updated_at`` alone."""
+    db.execute(
         update(Event)
-        .where(Event.date < cutoff, Event.is_expired.is_(False))
-        .values(is_expired=True)
+        .where(Event.dedup_hash.in_(dedup_hashes))
+        .values(last_seen_at=last_seen_at, updated_at=Event.updated_at),
+        execution_options={"synchronize_session": False},
     )
+
+
+def bulk_upsert_events(
+    db: Session,
+    records: list[dict],
+    location_ids: dict[str, int],
+    game_system_ids: dict[str, int],
+) -> None:
+    """Insert or refresh *records* with one batched ``INSERT ... ON CONFLICT`` statement.
+
+    Applies the same changes as :func:`upsert_event` — re-seen events get a new
+    ``last_seen_at`` and ``source_url`` and are un-expired — without a lookup per record.
+    Every location and game system named in *records* must already be in the id maps.
+    """
+    if not records:
+        return
+    rows = [
+        {
+            "location_id": location_ids[record["location_name"]],
+            "game_system_id": game_system_ids[record["game_system"]],
+            "title": record["title"],
+            "date": record["date"],
+            "start_time": record.get("time"),
+            "description": record.get("description"),
+            "source_url": record.get("source_url"),
+            "source_type": record.get("source_type"),
+            "last_seen_at": record.get("last_seen_at") or _utcnow(),
+            "is_expired": False,
+            "dedup_hash": record["dedup_hash"],
+        }
+        for record in records
+    ]
+    # A Core (table) insert keeps the whole chunk in one executemany; the ORM bulk
+    # path would split it by which columns happen to be NULL.
+    stmt = sqlite_insert(Event.__table__)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Event.dedup_hash],
+        set_={
+            "last_seen_at": stmt.excluded.last_seen_at,
+            "source_url": func.coalesce(stmt.excluded.source_url, Event.__table__.c.source_url),
+            "is_expired": False,
+            # onupdate defaults don't fire for ON CONFLICT updates
+            "updated_at": func.now(),
+        },
+    )
+    db.execute(stmt, rows)
+
+
+def expire_old_events(db: Session, days: int = 30) -> int:
+    cutoff = date.today() - timedelta(days=days)
+    result = db.execute(update(Event).where(Event.date < cutoff, LIVE).values(is_expired=True))
     return result.rowcount
 
 
+# Columns copied from events into events_archive; archived_at takes its default.
+_ARCHIVED_COLUMNS = [c.name for c in EventArchive.__table__.columns if c.name != "archived_at"]
+
+
+def archive_expired_events(db: Session, before: date, limit: int, after_id: int = 0) -> list[int]:
+    """Move up to *limit* expired events dated before *before* into ``events_archive``.
+
+    Events are taken in id order starting after *after_id*, so a caller moving
+    them in batches walks the table once.  An event whose id is already in the
+    archive keeps its archived row and is only removed from ``events``.
+    Returns the ids moved.
+    """
+    ids = list(
+        db.scalars(
+            select(Event.id)
+            .where(Event.id > after_id, Event.is_expired.is_(True), Event.date < before)
+            .order_by(Event.id)
+            .limit(limit)
+        )
+    )
+    if ids:
+        source = select(*(Event.__table__.c[name] for name in _ARCHIVED_COLUMNS))
+        db.execute(
+            sqlite_insert(EventArchive)
+            .from_select(_ARCHIVED_COLUMNS, source.where(Event.id.in_(ids)))
+            .on_conflict_do_nothing(index_elements=["id"])
+        )
+        db.execute(delete(Event).where(Event.id.in_(ids)))
+    return ids
+
+
+def incremental_vacuum(db: Session) -> int:
+    """Return the database's free pages to the filesystem; returns how many.
+
+    Only has an effect with ``auto_vacuum=INCREMENTAL`` (see migrations).  Call
+    it with nothing pending: executescript commits any open transaction.
+    """
+    before = db.execute(text("PRAGMA page_count")).scalar()
+    # sqlite3's execute() steps this pragma once, which frees a single page;
+    # executescript runs it to completion.
+    db.connection().connection.driver_connection.executescript("PRAGMA incremental_vacuum")
+    return before - db.execute(text("PRAGMA page_count")).scalar()
+
+
+def get_duplicate_candidates(
+    db: Session, dates: Iterable[date]
+) -> Iterable[tuple[int, tuple[int, int, date], str]]:
+    """Yield ``(id, (location_id, game_system_id, date), title)`` for events on *dates*
+    that are live and not already matched as a near duplicate."""
+    rows = db.execute(
+        select(Event.id, Event.location_id, Event.game_system_id, Event.date, Event.title).where(
+            Event.date.in_(list(dates)),
+            LIVE,
+            Event.duplicate_of_id.is_(None),
+        )
+    )
+    for event_id, location_id, game_system_id, event_date, title in rows:
+        yield event_id, (location_id, game_system_id, event_date), title
+
+
+_MERGED_FIELDS = ("start_time", "description", "source_url", "source_type")
+
+
+def mark_duplicates(db: Session, matches: dict[int, int], merge: bool = False) -> None:
+    """Point each duplicate id in *matches* at its canonical event id.
+
+    With *merge*, duplicates are also hidden from listings, and any of the
+    canonical event's empty fields are filled from its duplicates.
+    """
+    table = Event.__table__
+    db.execute(
+        update(table)
+        .where(table.c.id == bindparam("duplicate_id"))
+        .values(duplicate_of_id=bindparam("canonical_id"), is_merged=merge),
+        [
+            {"duplicate_id": duplicate_id, "canonical_id": canonical_id}
+            for duplicate_id, canonical_id in matches.items()
+        ],
+    )
+    if not merge:
+        return
+    events = {
+        event.id: event
+        for event in db.query(Event).filter(Event.id.in_(set(matches) | set(matches.values())))
+    }
+    for duplicate_id in sorted(matches):
+        canonical, duplicate = events[matches[duplicate_id]], events[duplicate_id]
+        for field in _MERGED_FIELDS:
+            if getattr(canonical, field) is None:
+                setattr(canonical, field, getattr(duplicate, field))
+
+
+# ---------------------------------------------------------------------------
+# Import manifest
+# ---------------------------------------------------------------------------
+
+
+def get_import_manifest(db: Session) -> dict[str, ImportManifest]:
+    return {entry.path: entry for entry in db.query(ImportManifest)}
+
+
+def record_import_manifest(
+    db: Session, path: str, size: int, mtime_ns: int, digest: str, record_count: int
+) -> None:
+    stmt = sqlite_insert(ImportManifest).values(
+        path=path, size=size, mtime_ns=mtime_ns, digest=digest, record_count=record_count
+    )
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[ImportManifest.path],
+            set_={
+                "size": stmt.excluded.size,
+                "mtime_ns": stmt.excluded.mtime_ns,
+                "digest": stmt.excluded.digest,
+                "record_count": stmt.excluded.record_count,
+                "imported_at": func.now(),
+            },
+        )
+    )
+
+
+def get_import_checkpoints(db: Session) -> dict[str, ImportCheckpoint]:
+    return {checkpoint.path: checkpoint for checkpoint in db.query(ImportCheckpoint)}
+
+
+def save_import_checkpoint(db: Session, path: str, digest: str, record_offset: int) -> None:
+    stmt = sqlite_insert(ImportCheckpoint).values(
+        path=path, digest=digest, record_offset=record_offset
+    )
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[ImportCheckpoint.path],
+            set_={
+                "digest": stmt.excluded.digest,
+                "record_offset": stmt.excluded.record_offset,
+                "updated_at": func.now(),
+            },
+        )
+    )
+
+
+def clear_import_checkpoints(db: Session, paths: list[str]) -> None:
+    db.query(ImportCheckpoint).filter(ImportCheckpoint.path.in_(paths)).delete(
+        synchronize_session=False
+    )
+
+
 # ---------------------------------------------------------------------------
 # Subscribers
 # ---------------------------------------------------------------------------
@@ -133,9 +615,32 @@ def get_active_subscribers(db: Session) -> list[Subscriber]:
     return db.query(Subscriber).filter(Subscriber.is_active.is_(True)).all()
 
 
+def get_subscribers_for_location(db: Session, location_id: int) -> list[Subscriber]:
+    return list(
+        db.scalars(
+            select(Subscriber)
+            .join(SubscriberLocation)
+            .where(SubscriberLocation.location_id == location_id, Subscriber.is_active.is_(True))
+        )
+    )
+
+
+def get_subscribers_for_game_system(db: Session, game_system_id: int) -> list[Subscriber]:
+    return list(
+        db.scalars(
+            select(Subscriber)
+            .join(SubscriberGameSystem)
+            .where(
+                SubscriberGameSystem.game_system_id == game_system_id,
+                Subscriber.is_active.is_(True),
+            )
+        )
+    )
+
+
 def get_events_for_subscriber(db: Session, subscriber: Subscriber) -> list[Event]:
-    location_ids = json.loads(subscriber.location_ids or "[]")
-    game_system_ids = json.loads(subscriber.game_system_ids or "[]")
+    location_ids = list(subscriber.location_ids)
+    game_system_ids = list(subscriber.game_system_ids)
 
     if not location_ids and not game_system_ids:
         return []
@@ -148,9 +653,11 @@ def get_events_for_subscriber(db: Session, subscriber: Subscriber) -> list[Event
 
     return (
         db.query(Event)
+        .options(*EVENT_RELATIONS)
         .filter(
             or_(*conditions),
-            Event.is_expired.is_(False),
+            LIVE,
+            Event.is_merged.is_(False),
             Event.date >= date.today(),
         )
         .order_by(Event.date.asc())
@@ -161,17 +668,16 @@ def get_events_for_subscriber(db: Session, subscriber: Subscriber) -> list[Event
 def create_or_update_subscriber(
     db: Session, email: str, location_ids: list[int], game_system_ids: list[int]
 ) -> Subscriber:
+    # Each id is one association row, so repeats are dropped.
+    location_ids = list(dict.fromkeys(location_ids))
+    game_system_ids = list(dict.fromkeys(game_system_ids))
     sub = db.query(Subscriber).filter(Subscriber.email == email).first()
     if sub:
-        sub.location_ids = json.dumps(location_ids)
-        sub.game_system_ids = json.dumps(game_system_ids)
+        sub.location_ids = location_ids
+        sub.game_system_ids = game_system_ids
         sub.is_active = True
     else:
-        sub = Subscriber(
-            email=email,
-            location_ids=json.dumps(location_ids),
-            game_system_ids=json.dumps(game_system_ids),
-        )
+        sub = Subscriber(email=email, location_ids=location_ids, game_system_ids=game_system_ids)
         db.add(sub)
     db.flush()
     return sub
@@ -1,24 +1,75 @@
+import contextlib
+import gzip
 import hashlib
 import json
 import logging
-from datetime import UTC, date, datetime
+import multiprocessing
+import os
+import queue
+import re
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from datetime import UTC, date, datetime, timedelta
+from itertools import islice
 from pathlib import Path
+from typing import Any, TextIO
 
 from sqlalchemy.orm import Session
 
 from . import databridge as crud
+from .near_duplicates import resolve_near_duplicates
 
 logger = logging.getLogger(__name__)
 
 DATA_DIR = Path(__file__).parent / "data"
+# File patterns run_import picks up; see iter_file_records for how each is read.
+INPUT_PATTERNS = ("*.json", "*.ndjson", "*.json.gz", "*.ndjson.gz")
 EXPIRY_DAYS = 30
+# Expired events older than this many days are moved to events_archive.
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "180"))
+# Events moved (and committed) per archive batch.
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "1000"))
+# Bytes in an event's dedup key (see compute_dedup_hash).
+DEDUP_KEY_SIZE = 16
+# Records written per batched upsert statement.
+CHUNK_SIZE = 500
+# Raw records imported between commits; each commit also saves a resume checkpoint.
+COMMIT_EVERY = int(os.getenv("IMPORT_COMMIT_EVERY", "5000"))
+# Parse/normalize processes used by run_import; 1 keeps everything in-process.
+IMPORT_WORKERS = int(os.getenv("IMPORT_WORKERS", "1"))
+# Characters read from an import file at a time by the streaming JSON reader.
+READ_SIZE = 64 * 1024
 
+_WHITESPACE = re.compile(r"\s*")
+_DECODER = json.JSONDecoder()
+_NUMBER_TERMINATORS = frozenset(" \t\r\n,]")
+# Longest JSON token the decoder can stop partway through ("-Infinity"); a
+# decode error this close to the end of the buffer may just need more input.
+_LONGEST_TOKEN = 9
+# Yielded by _read_file when it had to stop before the end of a file.
+_READ_FAILED = object()
 
-def compute_dedup_hash(
+
+def _now() -> datetime:
+    # Whole seconds, so records normalized together share a last_seen_at and
+    # the importer can bump them with a single UPDATE.
+    return datetime.now(UTC).replace(microsecond=0)
+
+
+def dedup_key_source(
     location_name: str, game_system: str, title: str, event_date: str, time: str | None = None
 ) -> str:
-    raw = f"{location_name}|{game_system}|{title}|{event_date}|{time or ''}".lower().strip()
-    return hashlib.sha256(raw.encode()).hexdigest()
+    return f"{location_name}|{game_system}|{title}|{event_date}|{time or ''}".lower().strip()
+
+
+def compute_dedup_hash(
+    location_name: str, game_system: str, title: str, event_date: str, time: str | None = None
+) -> bytes:
+    # A 16-byte BLOB keeps the unique index on events.dedup_hash small; at 128
+    # bits a collision is not a practical concern for an events table.
+    raw = dedup_key_source(location_name, game_system, title, event_date, time)
+    return hashlib.blake2b(raw.encode(), digest_size=DEDUP_KEY_SIZE).digest()
 
 
 def normalize_record(raw: dict) -> dict | None:
@@ -46,63 +97,524 @@ def normalize_record(raw: dict) -> dict | None:
         logger.warning("Skipping record with invalid date '%s'", record.get("date"))
         return None
 
+    last_seen_at = _now()
     if record.get("last_seen_at"):
-        try:
-            record["last_seen_at"] = datetime.fromisoformat(record["last_seen_at"])
-        except ValueError:
-            record["last_seen_at"] = datetime.now(UTC)
-    else:
-        record["last_seen_at"] = datetime.now(UTC)
+        with contextlib.suppress(ValueError):
+            last_seen_at = datetime.fromisoformat(record["last_seen_at"])
+    # Stored as naive UTC, so it compares equal to the value read back.
+    record["last_seen_at"] = crud.naive_utc(last_seen_at)
 
     return record
 
 
-def load_json_file(path: Path) -> list[dict]:
-    with open(path, encoding="utf-8") as f:
-        data = json.load(f)
-    return data if isinstance(data, list) else [data]
+def iter_json_array(f: TextIO, read_size: int = READ_SIZE) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array in *f* one at a time.
 
+    Only the current element and one read buffer are held in memory, so large
+    scraper dumps stream through in constant space.  A document that is not an
+    array is yielded as a single value.
+    """
+    buf = ""
+    pos = 0
+    eof = False
 
-def run_import(db: Session, data_dir: Path = DATA_DIR) -> dict:
-    files = sorted(data_dir.glob("*.json"))
-    if not files:
-        logger.warning("No JSON files found in %s", data_dir)
-        return {"processed": 0, "created": 0, "updated": 0, "expired": 0, "errors": 0}
+    def fill() -> bool:
+        nonlocal buf, pos, eof
+        data = f.read(read_size)
+        if not data:
+            eof = True
+            return False
+        buf = buf[pos:] + data
+        pos = 0
+        return True
 
-    processed = created = updated = errors = 0
+    def peek() -> str:
+        """Skip whitespace and return the next character ('' at end of input)."""
+        nonlocal pos
+        while True:
+            pos = _WHITESPACE.match(buf, pos).end()
+            if pos < len(buf) or not fill():
+                return buf[pos : pos + 1]
 
-    for file in files:
-        logger.info("Importing %s", file.name)
+    if peek() != "[":
+        while fill():
+            pass
+        yield json.loads(buf[pos:])
+        return
+
+    pos += 1
+    if peek() == "]":
+        return
+    while True:
         try:
-            records = load_json_file(file)
-        except Exception as exc:
-            logger.error("Failed to load %s: %s", file, exc)
+            value, end = _DECODER.raw_decode(buf, pos)
+        except json.JSONDecodeError as exc:
+            # An element cut off by the end of the buffer fails there, or as an
+            # unterminated string; any other error is malformed input, and
+            # reading on would only pull the rest of the file into memory.
+            truncated = exc.msg.startswith("Unterminated string") or (
+                exc.pos >= len(buf) - _LONGEST_TOKEN
+            )
+            if truncated and fill():
+                continue  # element straddles the buffer boundary
+            raise
+        if (
+            isinstance(value, int | float)
+            and not eof
+            and (end == len(buf) or buf[end] not in _NUMBER_TERMINATORS)
+            and fill()
+        ):
+            continue  # a number may continue past the buffer ("3" of "3.25"); decode again
+        pos = end
+        yield value
+
+        sep = peek()
+        if sep == "]":
+            return
+        if sep != ",":
+            raise json.JSONDecodeError("Expected ',' or ']'", buf, pos)
+        pos += 1
+        peek()
+
+
+def iter_ndjson(f: TextIO) -> Iterator[Any]:
+    """Yield one value per non-blank line of newline-delimited JSON."""
+    for line in f:
+        if line.strip():
+            yield json.loads(line)
+
+
+def iter_file_records(path: Path) -> Iterator[Any]:
+    """Yield the records in a ``.json`` or ``.ndjson`` file, optionally gzip-compressed.
+
+    Compressed files are decompressed as they are read, never all at once.
+    """
+    opener = gzip.open if path.name.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        if path.name.removesuffix(".gz").endswith(".ndjson"):
+            yield from iter_ndjson(f)
+        else:
+            yield from iter_json_array(f)
+
+
+def find_input_files(data_dir: Path) -> list[Path]:
+    return sorted({path for pattern in INPUT_PATTERNS for path in data_dir.glob(pattern)})
+
+
+def _read_file(path: Path, start: int = 0) -> Iterator[Any]:
+    """Yield raw records from *path* after the first *start*, up to any read or parse error.
+
+    Records before the error are still imported; the rest of the file is
+    skipped, and _READ_FAILED is yielded last so the caller can report it.
+    """
+    count = 0
+    try:
+        for raw in iter_file_records(path):
+            count += 1
+            if count > start:
+                yield raw
+    except (OSError, EOFError, ValueError) as exc:
+        logger.error("Failed to load %s after %d records: %s", path, count, exc)
+        yield _READ_FAILED
+
+
+def _chunked(items: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    it = iter(items)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+def _import_chunk(
+    db: Session,
+    records: list[dict],
+    location_ids: dict[str, int],
+    game_system_ids: dict[str, int],
+    known_events: dict[bytes, tuple[str | None, bool, datetime | None]],
+    skip_unchanged: bool,
+    new_groups: set[tuple[int, int, date]],
+) -> tuple[int, int, int]:
+    """Upsert one chunk of normalized records; return ``(created, updated, unchanged)``.
+
+    The id maps and *known_events* are preloaded once per import and kept current
+    here, so a chunk costs a fixed handful of statements regardless of its size.
+    With *skip_unchanged*, re-seen events whose content matches *known_events* are
+    left out of the upsert and only get ``last_seen_at`` bumped.  Records of
+    archived events count as unchanged and are left alone.  The
+    ``(location_id, game_system_id, date)`` of each created event is added to
+    *new_groups* for near-duplicate detection.
+    """
+    missing_locations = {r["location_name"] for r in records} - location_ids.keys()
+    location_ids.update(crud.create_locations(db, missing_locations))
+    missing_game_systems = {r["game_system"] for r in records} - game_system_ids.keys()
+    game_system_ids.update(crud.create_game_systems(db, missing_game_systems))
+
+    archived = crud.get_archived_hashes(
+        db, {r["dedup_hash"] for r in records} - known_events.keys()
+    )
+
+    created = updated = unchanged = 0
+    to_write = []
+    to_touch: dict[datetime, list[bytes]] = {}
+    for record in records:
+        dedup_hash = record["dedup_hash"]
+        last_seen_at = record["last_seen_at"]
+        state = known_events.get(dedup_hash)
+        if dedup_hash in archived:
+            # Archived events are past and done with; seeing one again changes nothing.
+            unchanged += 1
             continue
+        if state is None:
+            created += 1
+            to_write.append(record)
+            source_url = record.get("source_url")
+            new_groups.add(
+                (
+                    location_ids[record["location_name"]],
+                    game_system_ids[record["game_system"]],
+                    record["date"],
+                )
+            )
+        else:
+            source_url = record.get("source_url") or state[0]
+            if not skip_unchanged or state[1] or source_url != state[0]:
+                updated += 1
+                to_write.append(record)
+            else:
+                unchanged += 1
+                if last_seen_at != state[2]:
+                    to_touch.setdefault(last_seen_at, []).append(dedup_hash)
+        known_events[dedup_hash] = (source_url, False, last_seen_at)
+
+    crud.bulk_upsert_events(db, to_write, location_ids, game_system_ids)
+    for last_seen_at, dedup_hashes in to_touch.items():
+        crud.touch_events(db, dedup_hashes, last_seen_at)
+    return created, updated, unchanged
+
 
-        for raw in records:
+def _normalize_chunks(path: Path, start: int = 0) -> Iterator[tuple[list[dict], int, bool]]:
+    """Yield ``(records, errors, failed)`` for each chunk of raw records read from *path*.
+
+    The first *start* raw records are skipped, to resume from a checkpoint.
+    *failed* is set on the last chunk if the file could not be read to the end.
+    """
+    if start:
+        logger.info("Resuming %s at record %d", path.name, start)
+    else:
+        logger.info("Importing %s", path.name)
+    for raw_chunk in _chunked(_read_file(path, start), CHUNK_SIZE):
+        records = []
+        errors = 0
+        failed = raw_chunk[-1] is _READ_FAILED
+        if failed:
+            raw_chunk.pop()
+        for raw in raw_chunk:
             record = normalize_record(raw)
             if not record:
                 errors += 1
                 continue
+            records.append(record)
+        yield records, errors, failed
 
-            processed += 1
-            location = crud.get_or_create_location(db, record["location_name"])
-            game_system = crud.get_or_create_game_system(db, record["game_system"])
-            _, was_created = crud.upsert_event(db, record, location, game_system)
-            if was_created:
-                created += 1
-            else:
-                updated += 1
 
+def _parse_worker(path: Path, start: int, out: queue.Queue, stop: threading.Event) -> None:
+    """Process-pool task: stream one file's normalized chunks back to the writer.
+
+    Returns early once *stop* is set, when the writer has given up reading.
+    """
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                out.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    try:
+        for records, errors, failed in _normalize_chunks(path, start):
+            if not put((path.name, records, errors, failed)):
+                return
+    finally:
+        put((path.name, None, 0, False))
+
+
+def _parallel_chunks(
+    sources: list[tuple[Path, int]], workers: int
+) -> Iterator[tuple[str, list[dict], int, bool]]:
+    """Parse and normalize ``(path, start)`` *sources* in a process pool, yielding chunks.
+
+    The caller stays the only DB writer.  The queue is bounded so workers block
+    rather than buffering whole files when the writer falls behind.  If the
+    caller stops early (the generator is closed, e.g. because a write failed),
+    the workers are told to stop and the pool is shut down.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Manager() as manager, ProcessPoolExecutor(workers, mp_context=ctx) as pool:
+        out = manager.Queue(maxsize=workers * 2)
+        stop = manager.Event()
+        futures = [pool.submit(_parse_worker, path, start, out, stop) for path, start in sources]
+        try:
+            remaining = len(sources)
+            while remaining:
+                try:
+                    name, records, errors, failed = out.get(timeout=1)
+                except queue.Empty:
+                    # A worker that dies without posting its sentinel would hang the loop.
+                    if any(future.done() and future.exception() for future in futures):
+                        break
+                    continue
+                if records is None:
+                    remaining -= 1
+                    continue
+                yield name, records, errors, failed
+            for future in futures:
+                future.result()  # re-raise worker failures in the writer
+        finally:
+            stop.set()
+            # Unblock workers waiting on a full queue, then let them exit.
+            with contextlib.suppress(queue.Empty):
+                while True:
+                    out.get_nowait()
+            pool.shutdown(cancel_futures=True)
+
+
+def file_digest(path: Path, size: int | None = None) -> str:
+    """SHA-256 of *path*, or of only its first *size* bytes."""
+    digest = hashlib.sha256()
+    remaining = size
+    with open(path, "rb") as f:
+        while block := f.read(READ_SIZE if remaining is None else min(READ_SIZE, remaining)):
+            digest.update(block)
+            if remaining is not None:
+                remaining -= len(block)
+    return digest.hexdigest()
+
+
+def _is_ndjson(path: Path) -> bool:
+    return path.name.removesuffix(".gz").endswith(".ndjson")
+
+
+def _changed_files(
+    db: Session, files: list[Path], force: bool
+) -> list[tuple[Path, os.stat_result, str, int]]:
+    """Return ``(path, stat, digest, start)`` for each file that differs from the manifest.
+
+    A matching size and mtime skips a file without reading it; otherwise the
+    content digest decides, so a touched-but-identical file is skipped too.
+    An NDJSON file that only had lines appended since it was imported gets the
+    record count already imported as *start*, so only the new lines are read.
+    """
+    manifest = crud.get_import_manifest(db)
+    changed = []
+    for path in files:
+        start = 0
+        try:
+            stat = path.stat()
+            entry = manifest.get(str(path)) if not force else None
+            if entry and entry.size == stat.st_size and entry.mtime_ns == stat.st_mtime_ns:
+                continue
+            digest = file_digest(path)
+            if entry and entry.digest == digest:
+                crud.record_import_manifest(
+                    db, str(path), stat.st_size, stat.st_mtime_ns, digest, entry.record_count
+                )
+                continue
+            if (
+                entry
+                and _is_ndjson(path)
+                and stat.st_size > entry.size
+                and file_digest(path, entry.size) == entry.digest
+            ):
+                logger.info("%s was appended to since its last import", path.name)
+                start = entry.record_count
+        except OSError as exc:
+            logger.error("Failed to read %s: %s", path, exc)
+            continue
+        changed.append((path, stat, digest, start))
+    return changed
+
+
+def _save_progress(
+    db: Session,
+    changed: dict[str, tuple[Path, os.stat_result, str, int]],
+    offsets: dict[str, int],
+) -> None:
+    """Checkpoint every file's offset and commit it together with the imported rows."""
+    for name, offset in offsets.items():
+        path, _, digest, _ = changed[name]
+        crud.save_import_checkpoint(db, str(path), digest, offset)
+    db.commit()
+
+
+def archive_events(
+    db: Session, days: int = ARCHIVE_AFTER_DAYS, batch_size: int = ARCHIVE_BATCH_SIZE
+) -> tuple[int, int]:
+    """Move expired events more than *days* old to ``events_archive``.
+
+    Each batch of *batch_size* events is committed on its own, so readers and
+    other writers get the database between batches.  Afterwards the freed
+    pages are returned to the filesystem.  Returns ``(archived, pages_reclaimed)``.
+    """
+    cutoff = date.today() - timedelta(days=days)
+    archived = last_id = 0
+    while ids := crud.archive_expired_events(db, cutoff, batch_size, after_id=last_id):
+        db.commit()
+        archived += len(ids)
+        last_id = ids[-1]
+    if not archived:
+        return 0, 0
+    pages = crud.incremental_vacuum(db)
+    logger.info("Archived %d expired events, reclaimed %d pages", archived, pages)
+    return archived, pages
+
+
+def run_import(
+    db: Session,
+    data_dir: Path = DATA_DIR,
+    workers: int | None = None,
+    force: bool = False,
+    skip_unchanged: bool = True,
+    commit_every: int | None = None,
+    on_progress: Callable[[dict], None] | None = None,
+    paths: list[Path] | None = None,
+    near_duplicates: str | None = None,
+) -> dict:
+    """Import the data files in *data_dir* that changed since they were last imported.
+
+    Files recorded in the import manifest with the same content are skipped
+    unless *force* is set.  With *workers* > 1 (default ``IMPORT_WORKERS``) files
+    are parsed and normalized in a process pool while this thread performs all
+    database writes.  With *skip_unchanged*, re-seen events whose content is the
+    same are counted as ``unchanged`` and only have ``last_seen_at`` bumped.
+
+    Work is committed every *commit_every* raw records (default ``COMMIT_EVERY``)
+    together with a checkpoint per file, so the write lock is released between
+    batches and an interrupted import picks up where it stopped.  Old events are
+    expired only once every file has been read, and expired events past
+    ``ARCHIVE_AFTER_DAYS`` are then moved to the archive (see archive_events).
+    *on_progress*, if given, is called with the running counters after each
+    chunk.  *paths* limits the run to those files instead of everything in
+    *data_dir*.
+
+    Once every file is read, newly created events are checked for near
+    duplicates at the same location and date; *near_duplicates* overrides
+    ``NEAR_DUPLICATE_ACTION`` (``flag``, ``merge`` or ``off``).
+    """
+    all_files = sorted(paths) if paths is not None else find_input_files(data_dir)
+    if not all_files:
+        logger.warning("No import files found in %s", data_dir)
+        return {
+            "processed": 0,
+            "created": 0,
+            "updated": 0,
+            "unchanged": 0,
+            "expired": 0,
+            "errors": 0,
+            "skipped": 0,
+            "near_duplicates": 0,
+            "archived": 0,
+            "pages_reclaimed": 0,
+            "file_errors": {},
+        }
+
+    changed = {entry[0].name: entry for entry in _changed_files(db, all_files, force)}
+    processed = created = updated = unchanged = errors = 0
+    file_errors = dict.fromkeys(changed, 0)
+    new_groups: set[tuple[int, int, date]] = set()
+    failed_files: set[str] = set()
+
+    if changed:
+        location_ids = crud.get_location_ids(db)
+        game_system_ids = crud.get_game_system_ids(db)
+        known_events = crud.get_event_states(db)
+
+        checkpoints = crud.get_import_checkpoints(db)
+        offsets = {}
+        for name, (path, _, digest, start) in changed.items():
+            checkpoint = checkpoints.get(str(path))
+            resumable = checkpoint and checkpoint.digest == digest and not force
+            offsets[name] = checkpoint.record_offset if resumable else start
+        sources = [(path, offsets[name]) for name, (path, _, _, _) in changed.items()]
+
+        workers = min(workers or IMPORT_WORKERS, len(sources))
+        if workers > 1:
+            chunks = _parallel_chunks(sources, workers)
+        else:
+            chunks = (
+                (path.name, records, chunk_errors, failed)
+                for path, start in sources
+                for records, chunk_errors, failed in _normalize_chunks(path, start)
+            )
+
+        commit_every = commit_every or COMMIT_EVERY
+        uncommitted = 0
+        # Closed explicitly, so a failed write stops the parse workers right away.
+        with contextlib.closing(chunks):
+            for name, records, chunk_errors, failed in chunks:
+                chunk_created, chunk_updated, chunk_unchanged = _import_chunk(
+                    db,
+                    records,
+                    location_ids,
+                    game_system_ids,
+                    known_events,
+                    skip_unchanged,
+                    new_groups,
+                )
+                processed += len(records)
+                created += chunk_created
+                updated += chunk_updated
+                unchanged += chunk_unchanged
+                errors += chunk_errors
+                file_errors[name] += chunk_errors
+                offsets[name] += len(records) + chunk_errors
+                uncommitted += len(records) + chunk_errors
+                if failed:
+                    # The unread rest of the file counts as one error.
+                    errors += 1
+                    file_errors[name] += 1
+                    failed_files.add(name)
+                if uncommitted >= commit_every:
+                    _save_progress(db, changed, offsets)
+                    uncommitted = 0
+                if on_progress:
+                    on_progress(
+                        {
+                            "processed": processed,
+                            "created": created,
+                            "updated": updated,
+                            "unchanged": unchanged,
+                            "errors": errors,
+                        }
+                    )
+
+        # A file that could not be read to the end stays out of the manifest, so
+        # the next run reads it again.
+        for name, (path, stat, digest, _) in changed.items():
+            if name in failed_files:
+                continue
+            crud.record_import_manifest(
+                db, str(path), stat.st_size, stat.st_mtime_ns, digest, offsets[name]
+            )
+        crud.clear_import_checkpoints(db, [str(path) for path, _, _, _ in changed.values()])
+
+    matched = resolve_near_duplicates(db, new_groups, action=near_duplicates)
     expired = crud.expire_old_events(db, days=EXPIRY_DAYS)
     db.commit()
+    archived, pages_reclaimed = archive_events(db)
 
     result = {
         "processed": processed,
         "created": created,
         "updated": updated,
+        "unchanged": unchanged,
         "expired": expired,
         "errors": errors,
+        "skipped": len(all_files) - len(changed),
+        "near_duplicates": matched,
+        "archived": archived,
+        "pages_reclaimed": pages_reclaimed,
+        "file_errors": file_errors,
     }
     logger.info("Import complete: %s", result)
     return result
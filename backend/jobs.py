@@ -0,0 +1,137 @@
+"""In-process background jobs for long-running admin tasks.
+
+Each job is a row in the ``jobs`` table and runs on its own thread with its own
+session.  Only one job of a given kind may be queued or running at a time.
+Progress counters are kept in memory while a job runs and written to the row
+when it finishes.
+"""
+
+import json
+import logging
+import threading
+from collections.abc import Callable
+from datetime import UTC, datetime
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ("queued", "running")
+
+# A job target does the work with the session it is given, calls the progress
+# callback with its running counters, and returns a JSON-serializable result.
+JobTarget = Callable[[Session, Callable[[dict], None]], dict]
+
+_lock = threading.Lock()
+_progress: dict[int, dict] = {}
+
+
+class JobAlreadyRunning(Exception):
+    def __init__(self, job: Job):
+        super().__init__(f"A {job.kind} job is already {job.status} (id {job.id})")
+        self.job = job
+
+
+def _utcnow() -> datetime:
+    return datetime.now(UTC)
+
+
+def _create_job(session_factory: sessionmaker, kind: str) -> Job:
+    with _lock, session_factory() as db:
+        active = db.query(Job).filter(Job.kind == kind, Job.status.in_(ACTIVE_STATUSES)).first()
+        if active:
+            raise JobAlreadyRunning(active)
+        job = Job(kind=kind, status="queued", progress="{}")
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        db.expunge(job)
+    return job
+
+
+def start_job(session_factory: sessionmaker, kind: str, target: JobTarget) -> Job:
+    """Create a job row and run *target* on a background thread.
+
+    Raises JobAlreadyRunning if a job of the same *kind* is still queued or running.
+    """
+    job = _create_job(session_factory, kind)
+    thread = threading.Thread(
+        target=_run, args=(session_factory, job.id, target), name=f"job-{kind}-{job.id}"
+    )
+    thread.daemon = True
+    thread.start()
+    return job
+
+
+def run_job(session_factory: sessionmaker, kind: str, target: JobTarget) -> Job:
+    """Like start_job, but run *target* in the calling thread and return the finished job."""
+    job = _create_job(session_factory, kind)
+    _run(session_factory, job.id, target)
+    with session_factory() as db:
+        finished = db.get(Job, job.id)
+        db.expunge(finished)
+    return finished
+
+
+def get_job(db: Session, job_id: int) -> Job | None:
+    """Return the job row, with live progress counters if it is still running."""
+    job = db.get(Job, job_id)
+    if job and job_id in _progress:
+        job.progress = json.dumps(_progress[job_id])
+        db.expunge(job)  # the live counters are not meant to be flushed
+    return job
+
+
+def _finish(
+    session_factory: sessionmaker, job_id: int, status: str, result=None, error=None
+) -> None:
+    with session_factory() as db:
+        job = db.get(Job, job_id)
+        job.status = status
+        job.progress = json.dumps(_progress.get(job_id, {}))
+        job.result = json.dumps(result) if result is not None else None
+        job.error = error
+        job.finished_at = _utcnow()
+        db.commit()
+
+
+def _run(session_factory: sessionmaker, job_id: int, target: JobTarget) -> None:
+    _progress[job_id] = {}
+
+    def report(progress: dict) -> None:
+        _progress[job_id] = dict(progress)
+
+    try:
+        with session_factory() as db:
+            job = db.get(Job, job_id)
+            job.status = "running"
+            job.started_at = _utcnow()
+            db.commit()
+            result = target(db, report)
+    except Exception as exc:
+        logger.exception("Job %d failed", job_id)
+        _finish(session_factory, job_id, "failed", error=str(exc))
+    else:
+        _finish(session_factory, job_id, "succeeded", result=result)
+    finally:
+        _progress.pop(job_id, None)
+
+
+def fail_interrupted_jobs(db: Session) -> int:
+    """Mark jobs left queued or running by a previous process as failed."""
+    count = (
+        db.query(Job)
+        .filter(Job.status.in_(ACTIVE_STATUSES))
+        .update(
+            {
+                "status": "failed",
+                "error": "Interrupted by a server restart",
+                "finished_at": _utcnow(),
+            },
+            synchronize_session=False,
+        )
+    )
+    db.commit()
+    return count
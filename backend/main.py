@@ -4,19 +4,36 @@ import os
 from contextlib import asynccontextmanager
 from datetime import date
 from pathlib import Path
+from typing import Literal
 
+import orjson
 from dotenv import load_dotenv
-from fastapi import Depends, FastAPI, Header, HTTPException, Query
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse, Response
 from fastapi.staticfiles import StaticFiles
-from sqlalchemy.orm import Session
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, sessionmaker
 
 from . import databridge as crud
-from . import schemas
-from .database import create_tables, get_db
+from . import jobs, schemas, watcher
+from .database import (
+    SessionLocal,
+    create_tables,
+    data_generation,
+    get_async_read_db,
+    get_db,
+    get_read_db,
+    get_read_session_factory,
+    get_session_factory,
+    note_external_writes,
+    table_version,
+)
 from .importer import compute_dedup_hash, run_import
+from .models import GameSystem, Location
 from .newsletter import build_preview_email, run_newsletter
+from .response_cache import CachedResponse, ResponseCache, etag_matches
 
 load_dotenv()
 
@@ -30,6 +47,21 @@ logging.basicConfig(level=logging.INFO)
 # Leave unset (or empty) to keep admin endpoints open — useful for local dev.
 _ADMIN_SECRET = os.getenv("ADMIN_SECRET", "")
 
+# Set WATCH_DATA_DIR=1 to import new and changed data files continuously from
+# inside the API process (see backend/watcher.py).
+_WATCH_DATA_DIR = os.getenv("WATCH_DATA_DIR", "").lower() in ("1", "true", "yes")
+
+# Serialized GET /events pages kept in memory, keyed by their normalized
+# filters; any committed write invalidates them, including one from another
+# process.  0 disables the cache.
+EVENTS_CACHE_SIZE = int(os.getenv("EVENTS_CACHE_SIZE", "128"))
+events_cache = ResponseCache(EVENTS_CACHE_SIZE)
+
+# GET /locations and /games are served from memory until their table is written.
+# Browsers may reuse them for REFERENCE_MAX_AGE seconds before revalidating.
+REFERENCE_MAX_AGE = int(os.getenv("REFERENCE_MAX_AGE", "60"))
+reference_cache = ResponseCache(2)
+
 
 def _verify_admin(x_admin_secret: str | None = Header(None)) -> None:
     if _ADMIN_SECRET and x_admin_secret != _ADMIN_SECRET:
@@ -39,7 +71,14 @@ def _verify_admin(x_admin_secret: str | None = Header(None)) -> None:
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     create_tables()
+    with SessionLocal() as db:
+        jobs.fail_interrupted_jobs(db)
+    if _WATCH_DATA_DIR:
+        thread, stop = watcher.start_in_background(SessionLocal)
     yield
+    if _WATCH_DATA_DIR:
+        stop.set()
+        thread.join(timeout=10)
 
 
 app = FastAPI(
@@ -55,6 +94,8 @@ app.add_middleware(
     allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
+    # The frontend reads the next page's URL from GET /events.
+    expose_headers=["Link", "ETag"],
 )
 
 # ---------------------------------------------------------------------------
@@ -118,37 +159,177 @@ def create_events_batch(payload: list[schemas.EventIn], db: Session = Depends(ge
     return {"created": created, "updated": updated, "errors": errors}
 
 
-@app.get("/events", response_model=list[schemas.EventOut], tags=["events"])
-def list_events(
+# Event rows from events_query(rows=True) are encoded straight to JSON with
+# orjson, without building EventOut models.  Keys follow the schemas' field
+# order and orjson formats dates, datetimes and strings the way pydantic does,
+# so the bytes match what response_model would produce.
+_EVENT_END = len(crud.EVENT_ROW_FIELDS)
+_LOCATION_END = _EVENT_END + len(crud.LOCATION_ROW_FIELDS)
+
+
+def _serialize_events(rows, format: str) -> bytes:
+    event_fields, location_fields = crud.EVENT_ROW_FIELDS, crud.LOCATION_ROW_FIELDS
+    game_system_fields = crud.GAME_SYSTEM_ROW_FIELDS
+    if format == "compact":
+        locations, game_systems, events = {}, {}, []
+        for row in rows:
+            location_id, game_system_id = row[_EVENT_END], row[_LOCATION_END]
+            event = dict(zip(event_fields, row[:_EVENT_END], strict=True))
+            event["location_id"] = location_id
+            event["game_system_id"] = game_system_id
+            events.append(event)
+            if location_id not in locations:
+                locations[location_id] = dict(
+                    zip(location_fields, row[_EVENT_END:_LOCATION_END], strict=True)
+                )
+            if game_system_id not in game_systems:
+                game_systems[game_system_id] = dict(
+                    zip(game_system_fields, row[_LOCATION_END:], strict=True)
+                )
+        page = {
+            "locations": list(locations.values()),
+            "game_systems": list(game_systems.values()),
+            "events": events,
+        }
+        return orjson.dumps(page)
+
+    events = []
+    for row in rows:
+        event = dict(zip(event_fields, row[:_EVENT_END], strict=True))
+        event["location"] = dict(zip(location_fields, row[_EVENT_END:_LOCATION_END], strict=True))
+        event["game_system"] = dict(zip(game_system_fields, row[_LOCATION_END:], strict=True))
+        events.append(event)
+    return orjson.dumps(events)
+
+
+@app.get("/events", response_model=list[schemas.EventOut] | schemas.EventPageOut, tags=["events"])
+async def list_events(
+    request: Request,
     location_id: int | None = Query(None, description="Filter by location ID"),
     game_system_ids: list[int] = Query(default=[], description="Filter by game system ID(s)"),
     date_from: date | None = Query(None, description="Earliest event date (YYYY-MM-DD)"),
     date_to: date | None = Query(None, description="Latest event date (YYYY-MM-DD)"),
+    q: str | None = Query(
+        None,
+        max_length=200,
+        description="Search title, description, location and game system; best match first",
+    ),
+    cursor: str | None = Query(
+        None, description="Start after this position: the cursor from the previous page's Link"
+    ),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
-    db: Session = Depends(get_db),
+    format: Literal["full", "compact"] = Query(
+        "full",
+        description="compact lists each location and game system once and refers to them by id",
+    ),
+    if_none_match: str | None = Header(None),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    return crud.get_events(db, location_id, game_system_ids, date_from, date_to, skip, limit)
+    after = None
+    if cursor is not None:
+        if q:
+            raise HTTPException(status_code=400, detail="cursor cannot be combined with q")
+        try:
+            after = crud.decode_event_cursor(cursor)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+    terms = crud.search_terms(q) if q else None
+
+    # Read before querying: a write that commits while the query runs then
+    # leaves this page under an outdated generation, never to be served.
+    note_external_writes(db.bind.url)
+    generation = data_generation()
+    key = (location_id, tuple(sorted(set(game_system_ids))), date_from, date_to)
+    # "!!!" has no terms either, but it matches nothing rather than everything.
+    key += (terms, bool(q and not q.isspace()), after, skip, limit, format)
+    entry = events_cache.get(key, generation)
+    if entry is None:
+        ranked = (
+            not terms
+            or await db.scalar(crud.search_match_count_query(terms)) <= crud.SEARCH_RANK_LIMIT
+        )
+        stmt = crud.events_query(
+            location_id,
+            game_system_ids,
+            date_from,
+            date_to,
+            skip,
+            limit,
+            q,
+            ranked,
+            after,
+            rows=True,
+        )
+        rows = (await db.execute(stmt)).all()
+
+        headers = {"Cache-Control": "no-cache"}
+        # A full page links to the next one by cursor.  Searches page with skip.
+        if len(rows) == limit and not q:
+            last = rows[-1]
+            next_url = request.url.remove_query_params("skip").include_query_params(
+                cursor=crud.encode_event_cursor(last.date, last.id)
+            )
+            headers["Link"] = f'<{next_url}>; rel="next"'
+        body = _serialize_events(rows, format)
+        entry = CachedResponse(generation, body, headers)
+        events_cache.put(key, entry)
+
+    return _cached_response(entry, if_none_match)
+
+
+def _cached_response(entry: CachedResponse, if_none_match: str | None) -> Response:
+    if etag_matches(entry.etag, if_none_match):
+        return Response(status_code=304, headers=entry.headers)
+    return Response(entry.body, media_type="application/json", headers=entry.headers)
+
+
+async def _reference_list(
+    db: AsyncSession, table: str, stmt, adapter: TypeAdapter, if_none_match: str | None
+) -> Response:
+    """Serve a whole reference table from reference_cache, rebuilt after it is written."""
+    note_external_writes(db.bind.url)
+    version = table_version(table)
+    entry = reference_cache.get(table, version)
+    if entry is None:
+        rows = (await db.scalars(stmt)).all()
+        body = adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+        headers = {"Cache-Control": f"public, max-age={REFERENCE_MAX_AGE}"}
+        entry = CachedResponse(version, body, headers)
+        reference_cache.put(table, entry)
+    return _cached_response(entry, if_none_match)
 
 
 # ---------------------------------------------------------------------------
 # Locations
 # ---------------------------------------------------------------------------
 
+_LOCATION_LIST = TypeAdapter(list[schemas.LocationOut])
+
 
 @app.get("/locations", response_model=list[schemas.LocationOut], tags=["locations"])
-def list_locations(db: Session = Depends(get_db)):
-    return crud.get_locations(db)
+async def list_locations(
+    if_none_match: str | None = Header(None), db: AsyncSession = Depends(get_async_read_db)
+):
+    return await _reference_list(
+        db, Location.__tablename__, crud.locations_query(), _LOCATION_LIST, if_none_match
+    )
 
 
 # ---------------------------------------------------------------------------
 # Game Systems
 # ---------------------------------------------------------------------------
 
+_GAME_SYSTEM_LIST = TypeAdapter(list[schemas.GameSystemOut])
+
 
 @app.get("/games", response_model=list[schemas.GameSystemOut], tags=["games"])
-def list_game_systems(db: Session = Depends(get_db)):
-    return crud.get_game_systems(db)
+async def list_game_systems(
+    if_none_match: str | None = Header(None), db: AsyncSession = Depends(get_async_read_db)
+):
+    return await _reference_list(
+        db, GameSystem.__tablename__, crud.game_systems_query(), _GAME_SYSTEM_LIST, if_none_match
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -173,18 +354,67 @@ def subscribe(payload: schemas.SubscribeIn, db: Session = Depends(get_db)):
 # ---------------------------------------------------------------------------
 
 
-@app.post("/admin/import", tags=["admin"], dependencies=[Depends(_verify_admin)])
-def trigger_import(db: Session = Depends(get_db)):
-    return run_import(db)
+def _start_job(session_factory: sessionmaker, kind: str, target: jobs.JobTarget):
+    try:
+        return jobs.start_job(session_factory, kind, target)
+    except jobs.JobAlreadyRunning as exc:
+        raise HTTPException(
+            status_code=409, detail={"message": str(exc), "job_id": exc.job.id}
+        ) from exc
+
 
+@app.post(
+    "/admin/import",
+    response_model=schemas.JobOut,
+    status_code=202,
+    tags=["admin"],
+    dependencies=[Depends(_verify_admin)],
+)
+def trigger_import(
+    force: bool = Query(False, description="Re-import files even if they are unchanged"),
+    session_factory: sessionmaker = Depends(get_session_factory),
+):
+    return _start_job(
+        session_factory,
+        "import",
+        lambda db, report: run_import(db, force=force, on_progress=report),
+    )
+
+
+@app.post(
+    "/admin/newsletter",
+    response_model=schemas.JobOut,
+    status_code=202,
+    tags=["admin"],
+    dependencies=[Depends(_verify_admin)],
+)
+def trigger_newsletter(
+    session_factory: sessionmaker = Depends(get_session_factory),
+    read_session_factory: sessionmaker = Depends(get_read_session_factory),
+):
+    # The newsletter only reads, so it doesn't hold the writer while sending mail.
+    def target(db: Session, report) -> dict:
+        with read_session_factory() as read_db:
+            return run_newsletter(read_db, on_progress=report)
 
-@app.post("/admin/newsletter", tags=["admin"], dependencies=[Depends(_verify_admin)])
-def trigger_newsletter(db: Session = Depends(get_db)):
-    return run_newsletter(db)
+    return _start_job(session_factory, "newsletter", target)
+
+
+@app.get(
+    "/admin/jobs/{job_id}",
+    response_model=schemas.JobOut,
+    tags=["admin"],
+    dependencies=[Depends(_verify_admin)],
+)
+def get_job(job_id: int, db: Session = Depends(get_read_db)):
+    job = jobs.get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
 
 
 @app.get("/admin/preview-email", tags=["admin"])
-def preview_email(db: Session = Depends(get_db)):
+def preview_email(db: Session = Depends(get_read_db)):
     today = date.today()
     date_from = today.replace(day=1)
     last_day = calendar.monthrange(today.year, today.month)[1]
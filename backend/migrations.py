@@ -0,0 +1,258 @@
+"""Idempotent schema migrations, applied at startup after create_all.
+
+create_all only creates missing tables, so changes to existing tables are
+made here.  Each step checks the live schema first and is safe to re-run.
+"""
+
+import hashlib
+import json
+import logging
+
+from sqlalchemy import Connection, Engine, LargeBinary, inspect, text
+
+from .importer import compute_dedup_hash, dedup_key_source
+
+logger = logging.getLogger(__name__)
+
+
+def _columns(conn: Connection, table: str) -> set[str]:
+    return {column["name"] for column in inspect(conn).get_columns(table)}
+
+
+def _add_column(conn: Connection, table: str, name: str, definition: str) -> None:
+    if name not in _columns(conn, table):
+        logger.info("Adding %s.%s", table, name)
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {definition}"))
+
+
+def _add_manifest_record_count(conn: Connection) -> None:
+    # Lets the importer resume an appended NDJSON file after its last record.
+    _add_column(conn, "import_manifest", "record_count", "INTEGER NOT NULL DEFAULT 0")
+
+
+def _compact_dedup_keys(conn: Connection) -> None:
+    """Rebuild ``events`` with 16-byte BLOB dedup keys in place of 64-char SHA-256 hex.
+
+    The new key is recomputed from each row's location, game system, title and
+    date (plus start time, for events created with one).  The stored SHA-256 is
+    checked against the same fields, so only a key that provably matches what
+    the importer would compute is replaced; any other row keeps the first 16
+    bytes of its old hash, which stays unique.  The rebuild also drops the
+    redundant ``ix_events_id`` and ``ix_events_dedup_hash`` indexes.
+    """
+    columns = {column["name"]: column for column in inspect(conn).get_columns("events")}
+    if isinstance(columns["dedup_hash"]["type"], LargeBinary):
+        return
+
+    from .models import Event
+
+    rows = conn.execute(
+        text(
+            "SELECT e.id, l.name, g.name, e.title, e.date, e.start_time, e.dedup_hash"
+            " FROM events e"
+            " JOIN locations l ON l.id = e.location_id"
+            " JOIN game_systems g ON g.id = e.game_system_id"
+        )
+    ).all()
+    keys = []
+    unmatched = 0
+    for event_id, location, game_system, title, event_date, start_time, old_hash in rows:
+        for time in (None, start_time) if start_time else (None,):
+            source = dedup_key_source(location, game_system, title, event_date, time)
+            if hashlib.sha256(source.encode()).hexdigest() == old_hash:
+                key = compute_dedup_hash(location, game_system, title, event_date, time)
+                break
+        else:
+            unmatched += 1
+            key = bytes.fromhex(old_hash)[:16]
+        keys.append({"id": event_id, "key": key})
+    logger.info(
+        "Compacting %d event dedup keys (%d kept from their old hash)", len(rows), unmatched
+    )
+
+    names = [column.name for column in Event.__table__.columns if column.name in columns]
+    targets = ", ".join(names)
+    sources = ", ".join("k.key" if name == "dedup_hash" else f"e.{name}" for name in names)
+    conn.execute(text("CREATE TEMP TABLE dedup_keys (id INTEGER PRIMARY KEY, key BLOB NOT NULL)"))
+    if keys:
+        conn.execute(text("INSERT INTO dedup_keys (id, key) VALUES (:id, :key)"), keys)
+    conn.execute(text("ALTER TABLE events RENAME TO events_old"))
+    for index in inspect(conn).get_indexes("events_old"):
+        conn.execute(text(f'DROP INDEX "{index["name"]}"'))
+    Event.__table__.create(conn)
+    conn.execute(
+        text(
+            f"INSERT INTO events ({targets}) SELECT {sources}"
+            " FROM events_old e JOIN dedup_keys k ON k.id = e.id"
+        )
+    )
+    conn.execute(text("DROP TABLE events_old"))
+    conn.execute(text("DROP TABLE dedup_keys"))
+
+
+def _add_near_duplicate_columns(conn: Connection) -> None:
+    _add_column(conn, "events", "duplicate_of_id", "INTEGER REFERENCES events (id)")
+    _add_column(conn, "events", "is_merged", "BOOLEAN NOT NULL DEFAULT 0")
+
+
+# Event indexes replaced by the current live-event indexes.
+_SUPERSEDED_EVENT_INDEXES = (
+    "ix_events_date",
+    "ix_events_live_date",
+    "ix_events_live_location_date",
+    "ix_events_live_game_system_date",
+)
+
+
+def _live_event_indexes(conn: Connection) -> None:
+    """Create the partial indexes on live events and drop the indexes they replace."""
+    from .models import Event
+
+    for index in Event.__table__.indexes:
+        index.create(conn, checkfirst=True)
+    for name in _SUPERSEDED_EVENT_INDEXES:
+        conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+
+def _normalize_subscriber_preferences(conn: Connection) -> None:
+    """Move ``subscribers.location_ids`` / ``game_system_ids`` JSON into the association tables.
+
+    Ids that are not integers are dropped and repeats are collapsed.  The
+    JSON columns are dropped once copied.
+    """
+    columns = _columns(conn, "subscribers")
+    if "location_ids" not in columns:
+        return
+
+    links = {"location_ids": set(), "game_system_ids": set()}
+    for row in conn.execute(
+        text("SELECT id, location_ids, game_system_ids FROM subscribers")
+    ).mappings():
+        for column, pairs in links.items():
+            try:
+                ids = json.loads(row[column] or "[]")
+            except ValueError:
+                logger.warning("Subscriber %d has unreadable %s; dropping it", row["id"], column)
+                continue
+            pairs.update((row["id"], i) for i in ids if isinstance(i, int))
+
+    for column, table, id_column in (
+        ("location_ids", "subscriber_locations", "location_id"),
+        ("game_system_ids", "subscriber_game_systems", "game_system_id"),
+    ):
+        if links[column]:
+            conn.execute(
+                text(
+                    f"INSERT OR IGNORE INTO {table} (subscriber_id, {id_column})"
+                    " VALUES (:subscriber_id, :id)"
+                ),
+                [{"subscriber_id": s, "id": i} for s, i in sorted(links[column])],
+            )
+        conn.execute(text(f"ALTER TABLE subscribers DROP COLUMN {column}"))
+    logger.info(
+        "Moved %d location and %d game system subscriptions out of JSON columns",
+        len(links["location_ids"]),
+        len(links["game_system_ids"]),
+    )
+
+
+def _event_search_index(conn: Connection) -> None:
+    """Create the events_fts full-text index and its triggers, then fill it from events."""
+    if inspect(conn).has_table("events_fts"):
+        return
+
+    from .models import EVENTS_FTS_DDL
+
+    for statement in EVENTS_FTS_DDL:
+        conn.execute(text(statement))
+    count = conn.execute(
+        text(
+            "INSERT INTO events_fts (rowid, title, description, location, game_system)"
+            " SELECT e.id, e.title, e.description, l.name, g.name FROM events e"
+            " JOIN locations l ON l.id = e.location_id"
+            " JOIN game_systems g ON g.id = e.game_system_id"
+        )
+    ).rowcount
+    logger.info("Indexed %d events for full-text search", count)
+
+
+def _autoincrement_event_ids(conn: Connection) -> None:
+    """Rebuild ``events`` with ``AUTOINCREMENT`` so archived event ids are never reused.
+
+    Without it SQLite hands out the ids of deleted rows again, so an event
+    created after archival could take an id already in ``events_archive``.
+    The id sequence starts past the highest id in either table.  The
+    full-text index keeps its rows: its triggers are dropped during the copy.
+    """
+    sql = conn.execute(
+        text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'events'")
+    ).scalar()
+    if "AUTOINCREMENT" in sql.upper():
+        return
+
+    from .models import EVENTS_FTS_DDL, Event
+
+    logger.info("Rebuilding events with AUTOINCREMENT ids")
+    triggers = conn.execute(
+        text("SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'events_fts_%'")
+    ).scalars()
+    for name in list(triggers):
+        conn.execute(text(f"DROP TRIGGER {name}"))
+    conn.execute(text("ALTER TABLE events RENAME TO events_old"))
+    for index in inspect(conn).get_indexes("events_old"):
+        conn.execute(text(f'DROP INDEX "{index["name"]}"'))
+    Event.__table__.create(conn)  # also recreates the events_fts triggers
+    conn.execute(text("DROP TRIGGER events_fts_insert"))
+    names = ", ".join(column.name for column in Event.__table__.columns)
+    conn.execute(text(f"INSERT INTO events ({names}) SELECT {names} FROM events_old"))
+    conn.execute(text("DROP TABLE events_old"))
+    for statement in EVENTS_FTS_DDL:
+        conn.execute(text(statement))
+    conn.execute(text("DELETE FROM sqlite_sequence WHERE name = 'events'"))
+    conn.execute(
+        text(
+            "INSERT INTO sqlite_sequence (name, seq) SELECT 'events', max("
+            " (SELECT coalesce(max(id), 0) FROM events),"
+            " (SELECT coalesce(max(id), 0) FROM events_archive))"
+        )
+    )
+
+
+def _archive_dedup_index(conn: Connection) -> None:
+    from .models import EventArchive
+
+    for index in EventArchive.__table__.indexes:
+        index.create(conn, checkfirst=True)
+
+
+MIGRATIONS = [
+    _add_manifest_record_count,
+    _compact_dedup_keys,
+    _add_near_duplicate_columns,
+    _live_event_indexes,
+    _normalize_subscriber_preferences,
+    _event_search_index,
+    _autoincrement_event_ids,
+    _archive_dedup_index,
+]
+
+
+def _enable_incremental_vacuum(engine: Engine) -> None:
+    """Switch the database to ``auto_vacuum=INCREMENTAL`` so archival can shrink the file.
+
+    An existing database only changes mode through a full VACUUM, which runs
+    once, outside a transaction.
+    """
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        if conn.exec_driver_sql("PRAGMA auto_vacuum").scalar() == 2:  # INCREMENTAL
+            return
+        logger.info("Enabling incremental auto-vacuum (one-time VACUUM)")
+        conn.exec_driver_sql("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.exec_driver_sql("VACUUM")
+
+
+def run_migrations(engine: Engine) -> None:
+    with engine.begin() as conn:
+        for migration in MIGRATIONS:
+            migration(conn)
+    _enable_incremental_vacuum(engine)
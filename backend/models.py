@@ -1,4 +1,23 @@
-from sqlalchemy import Boolean, Column, Date, DateTime, ForeignKey, Integer, String, Text, func
+from sqlalchemy import (
+    DDL,
+    BigInteger,
+    Boolean,
+    Column,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    MetaData,
+    String,
+    Table,
+    Text,
+    event,
+    func,
+    text,
+)
+from sqlalchemy.ext.associationproxy import association_proxy
 from sqlalchemy.orm import relationship
 
 from .database import Base
@@ -34,31 +53,256 @@ class GameSystem(Base):
 class Event(Base):
     __tablename__ = "events"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     location_id = Column(Integer, ForeignKey("locations.id"), nullable=False)
     game_system_id = Column(Integer, ForeignKey("game_systems.id"), nullable=False)
     title = Column(String, nullable=False)
-    date = Column(Date, nullable=False, index=True)
+    date = Column(Date, nullable=False)
     start_time = Column(String)
     description = Column(Text)
     source_url = Column(String)
     source_type = Column(String)
     last_seen_at = Column(DateTime)
     is_expired = Column(Boolean, default=False, nullable=False)
-    dedup_hash = Column(String, unique=True, nullable=False, index=True)
+    # Set by near-duplicate detection (see near_duplicates.py); merged events are hidden.
+    duplicate_of_id = Column(Integer, ForeignKey("events.id"))
+    is_merged = Column(Boolean, default=False, server_default="0", nullable=False)
+    # 16-byte blake2b of the identifying fields; the UNIQUE constraint is its only index.
+    dedup_hash = Column(LargeBinary(16), unique=True, nullable=False)
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
     location = relationship("Location", back_populates="events")
     game_system = relationship("GameSystem", back_populates="events")
 
+    # Listings only ever read live events, so the date indexes leave expired rows
+    # out.  Queries must spell the filter ``is_expired = 0`` (databridge.LIVE) for
+    # SQLite to use them.  id follows date so listings ordered by (date, id) and
+    # cursor pages starting after a (date, id) need no sort.  The trailing
+    # is_expired lets counts and id-only reads be answered from the index alone:
+    # SQLite 3.40 does not treat a column that only appears in the partial WHERE
+    # as covered.
+    __table_args__ = (
+        Index(
+            "ix_events_live_date_id",
+            "date",
+            "id",
+            "is_expired",
+            sqlite_where=text("is_expired = 0"),
+        ),
+        Index(
+            "ix_events_live_location_date_id",
+            "location_id",
+            "date",
+            "id",
+            "is_expired",
+            sqlite_where=text("is_expired = 0"),
+        ),
+        Index(
+            "ix_events_live_game_system_date_id",
+            "game_system_id",
+            "date",
+            "id",
+            "is_expired",
+            sqlite_where=text("is_expired = 0"),
+        ),
+        # Ids of archived events are never handed out again, so they stay unique
+        # across events and events_archive.
+        {"sqlite_autoincrement": True},
+    )
+
+
+# Full-text index over each event's title, description, location and game system
+# name, keyed by event id.  SQLAlchemy can't declare an FTS5 table, so it is
+# created alongside events (see below) and kept current by triggers.
+EVENTS_FTS_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(
+        title, description, location, game_system,
+        tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS events_fts_insert AFTER INSERT ON events BEGIN
+        INSERT INTO events_fts (rowid, title, description, location, game_system)
+        SELECT new.id, new.title, new.description, l.name, g.name
+        FROM locations l, game_systems g
+        WHERE l.id = new.location_id AND g.id = new.game_system_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS events_fts_delete AFTER DELETE ON events BEGIN
+        DELETE FROM events_fts WHERE rowid = old.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS events_fts_update
+    AFTER UPDATE OF title, description, location_id, game_system_id ON events BEGIN
+        DELETE FROM events_fts WHERE rowid = old.id;
+        INSERT INTO events_fts (rowid, title, description, location, game_system)
+        SELECT new.id, new.title, new.description, l.name, g.name
+        FROM locations l, game_systems g
+        WHERE l.id = new.location_id AND g.id = new.game_system_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS events_fts_location_name
+    AFTER UPDATE OF name ON locations BEGIN
+        UPDATE events_fts SET location = new.name
+        WHERE rowid IN (SELECT id FROM events WHERE location_id = new.id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS events_fts_game_system_name
+    AFTER UPDATE OF name ON game_systems BEGIN
+        UPDATE events_fts SET game_system = new.name
+        WHERE rowid IN (SELECT id FROM events WHERE game_system_id = new.id);
+    END""",
+]
+
+# Read-side handle on events_fts for queries.  It lives in its own MetaData so
+# create_all doesn't try to create it as a plain table.
+events_fts = Table(
+    "events_fts",
+    MetaData(),
+    Column("rowid", Integer, primary_key=True),
+    Column("events_fts", Text),  # the hidden column MATCH and bm25() take
+)
+
+for _ddl in EVENTS_FTS_DDL:
+    event.listen(Event.__table__, "after_create", DDL(_ddl).execute_if(dialect="sqlite"))
+event.listen(
+    Event.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS events_fts").execute_if(dialect="sqlite"),
+)
+
+
+class EventArchive(Base):
+    """Expired events moved out of ``events`` once past the archive horizon.
+
+    Rows keep their event id; see importer.archive_events.
+    """
+
+    __tablename__ = "events_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    location_id = Column(Integer, ForeignKey("locations.id"), nullable=False)
+    game_system_id = Column(Integer, ForeignKey("game_systems.id"), nullable=False)
+    title = Column(String, nullable=False)
+    date = Column(Date, nullable=False)
+    start_time = Column(String)
+    description = Column(Text)
+    source_url = Column(String)
+    source_type = Column(String)
+    last_seen_at = Column(DateTime)
+    duplicate_of_id = Column(Integer)
+    is_merged = Column(Boolean, default=False, nullable=False)
+    dedup_hash = Column(LargeBinary(16), nullable=False)
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
+    archived_at = Column(DateTime, default=func.now())
+
+    # The importer looks up re-seen dedup hashes here so it doesn't create
+    # archived events again.
+    __table_args__ = (Index("ix_events_archive_dedup_hash", "dedup_hash"),)
+
 
 class Subscriber(Base):
     __tablename__ = "subscribers"
 
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String, unique=True, nullable=False, index=True)
-    location_ids = Column(Text, default="[]")
-    game_system_ids = Column(Text, default="[]")
     is_active = Column(Boolean, default=True, nullable=False)
     created_at = Column(DateTime, default=func.now())
+
+    location_links = relationship(
+        "SubscriberLocation",
+        cascade="all, delete-orphan",
+        lazy="selectin",
+        order_by="SubscriberLocation.location_id",
+    )
+    game_system_links = relationship(
+        "SubscriberGameSystem",
+        cascade="all, delete-orphan",
+        lazy="selectin",
+        order_by="SubscriberGameSystem.game_system_id",
+    )
+    # Read and assigned as plain id lists, like the JSON columns they replace.
+    location_ids = association_proxy(
+        "location_links",
+        "location_id",
+        creator=lambda location_id: SubscriberLocation(location_id=location_id),
+    )
+    game_system_ids = association_proxy(
+        "game_system_links",
+        "game_system_id",
+        creator=lambda game_system_id: SubscriberGameSystem(game_system_id=game_system_id),
+    )
+
+
+# Subscriber preferences.  The primary key serves "what does this subscriber
+# follow"; the reverse index serves "who follows this location / game system".
+
+
+class SubscriberLocation(Base):
+    __tablename__ = "subscriber_locations"
+
+    subscriber_id = Column(
+        Integer, ForeignKey("subscribers.id", ondelete="CASCADE"), primary_key=True
+    )
+    location_id = Column(Integer, ForeignKey("locations.id"), primary_key=True)
+
+    __table_args__ = (
+        Index("ix_subscriber_locations_location", "location_id", "subscriber_id"),
+        {"sqlite_with_rowid": False},
+    )
+
+
+class SubscriberGameSystem(Base):
+    __tablename__ = "subscriber_game_systems"
+
+    subscriber_id = Column(
+        Integer, ForeignKey("subscribers.id", ondelete="CASCADE"), primary_key=True
+    )
+    game_system_id = Column(Integer, ForeignKey("game_systems.id"), primary_key=True)
+
+    __table_args__ = (
+        Index("ix_subscriber_game_systems_game_system", "game_system_id", "subscriber_id"),
+        {"sqlite_with_rowid": False},
+    )
+
+
+class ImportManifest(Base):
+    """One row per data file the importer has fully read, used to skip unchanged files."""
+
+    __tablename__ = "import_manifest"
+
+    id = Column(Integer, primary_key=True)
+    path = Column(String, unique=True, nullable=False)
+    size = Column(BigInteger, nullable=False)
+    mtime_ns = Column(BigInteger, nullable=False)
+    digest = Column(String, nullable=False)
+    record_count = Column(Integer, nullable=False, default=0)
+    imported_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+
+class ImportCheckpoint(Base):
+    """How far into a data file an in-progress import has committed.
+
+    Written in the same transaction as each batch of imported events and removed
+    once the import finishes, so an interrupted run resumes where it stopped.
+    """
+
+    __tablename__ = "import_checkpoints"
+
+    id = Column(Integer, primary_key=True)
+    path = Column(String, unique=True, nullable=False)
+    digest = Column(String, nullable=False)
+    record_offset = Column(Integer, nullable=False)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+
+class Job(Base):
+    """A background run of an admin task (see backend/jobs.py)."""
+
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String, nullable=False, index=True)
+    status = Column(String, nullable=False, default="queued")
+    progress = Column(Text, default="{}")
+    result = Column(Text)
+    error = Column(Text)
+    created_at = Column(DateTime, default=func.now())
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
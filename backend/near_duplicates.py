@@ -0,0 +1,225 @@
+"""Near-duplicate event detection with MinHash/LSH.
+
+The exact dedup key misses the same event scraped from two sources with a
+slightly different title ("Friday Night 40K" vs. "Fri Night 40k League").
+After each import, run_import passes the (location, game system, date) groups
+that gained events to resolve_near_duplicates.  Within each group, titles are
+normalized and split into character shingles.  MinHash signatures are then
+banded into LSH buckets, so only titles that share a bucket are compared,
+instead of every pair (small groups, where that costs more than it saves,
+compare every pair).  Candidate pairs with the same numbers in their titles
+whose shingle Jaccard similarity reaches the threshold are clustered.  The
+event with the lowest id is the canonical one.
+
+NEAR_DUPLICATE_ACTION decides what happens to the others:
+
+* ``flag``  (default) — set ``duplicate_of_id``; the event stays listed
+* ``merge`` — also set ``is_merged``, fill the canonical event's empty fields
+              from it and hide it from listings
+* ``off``   — skip detection
+
+Matched events keep their rows, so a later import of the same record updates
+them instead of re-creating the duplicate.
+"""
+
+import logging
+import os
+import re
+import zlib
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import date
+
+from sqlalchemy.orm import Session
+
+from . import databridge as crud
+
+logger = logging.getLogger(__name__)
+
+ACTIONS = ("flag", "merge", "off")
+NEAR_DUPLICATE_ACTION = os.getenv("NEAR_DUPLICATE_ACTION", "flag")
+# Minimum Jaccard similarity of two titles' shingle sets to count as duplicates.
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.6"))
+SHINGLE_SIZE = 3
+NUM_PERM = 64
+# Groups smaller than this compare every pair directly; that is cheaper than
+# computing signatures until the pair count grows quadratically.
+LSH_MIN_GROUP = 64
+
+_PRIME = (1 << 61) - 1
+_MIX_A, _MIX_B = 0x1F3D5B79A2C4E6F1 % _PRIME, 0x2545F4914F6CDD1D % _PRIME
+_WORD = re.compile(r"[a-z0-9]+")
+_NUMBER = re.compile(r"\d+")
+# Abbreviations scrapers commonly disagree on, expanded before shingling.
+_ABBREVIATIONS = {
+    "mon": "monday",
+    "tue": "tuesday",
+    "tues": "tuesday",
+    "wed": "wednesday",
+    "weds": "wednesday",
+    "thu": "thursday",
+    "thur": "thursday",
+    "thurs": "thursday",
+    "fri": "friday",
+    "sat": "saturday",
+    "sun": "sunday",
+    "tourney": "tournament",
+    "ltp": "learn to play",
+}
+
+Group = tuple[int, int, date]
+
+
+def normalize_title(title: str) -> str:
+    words = _WORD.findall(title.lower())
+    return " ".join(_ABBREVIATIONS.get(word, word) for word in words)
+
+
+def shingles(title: str, size: int = SHINGLE_SIZE) -> frozenset[int]:
+    """Return the CRC-32 hashes of *title*'s character shingles after normalizing it."""
+    text = normalize_title(title)
+    if len(text) <= size:
+        return frozenset([zlib.crc32(text.encode())])
+    return frozenset(zlib.crc32(text[i : i + size].encode()) for i in range(len(text) - size + 1))
+
+
+def minhash(hashes: frozenset[int], num_perm: int = NUM_PERM) -> tuple[int, ...]:
+    """One-permutation MinHash signature of *hashes*, densified by rotation.
+
+    Each hash is mixed once and lands in one of *num_perm* bins, keeping the
+    bin minimum — one pass over the shingles instead of one per permutation.
+    An empty bin borrows the value of the next non-empty bin, offset by the
+    distance, so similar sets still agree on it (Shrivastava & Li, 2014).
+    """
+    bins: list[int | None] = [None] * num_perm
+    for h in hashes:
+        mixed = (_MIX_A * h + _MIX_B) % _PRIME
+        index, value = mixed % num_perm, mixed // num_perm
+        current = bins[index]
+        if current is None or value < current:
+            bins[index] = value
+    signature = list(bins)
+    nearest = 0
+    for i in range(2 * num_perm - 1, -1, -1):
+        if bins[i % num_perm] is not None:
+            nearest = i
+        elif i < num_perm:
+            signature[i] = bins[nearest % num_perm] + (nearest - i) * _PRIME
+    return tuple(signature)
+
+
+def lsh_bands(threshold: float, num_perm: int = NUM_PERM) -> tuple[int, int]:
+    """Pick ``(bands, rows)`` whose LSH curve crosses 50% just below *threshold*.
+
+    Two signatures share a bucket with probability ``1 - (1 - s**rows)**bands``
+    for Jaccard similarity ``s``, which rises steeply around
+    ``(1 / bands) ** (1 / rows)``.  Placing that point at or below the threshold
+    favours recall; candidates are verified exactly afterwards.
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        if (1 / bands) ** (1 / rows) <= threshold:
+            best = (bands, rows)
+    return best
+
+
+def jaccard(a: frozenset[int], b: frozenset[int]) -> float:
+    return len(a & b) / len(a | b)
+
+
+def numbers(title: str) -> frozenset[str]:
+    return frozenset(_NUMBER.findall(title))
+
+
+def _candidate_buckets(
+    shingle_sets: dict[int, frozenset[int]], threshold: float
+) -> list[list[int]]:
+    if len(shingle_sets) < LSH_MIN_GROUP:
+        return [list(shingle_sets)]
+    bands, rows = lsh_bands(threshold)
+    buckets: dict[tuple, list[int]] = defaultdict(list)
+    for event_id, hashes in shingle_sets.items():
+        signature = minhash(hashes)
+        for band in range(bands):
+            buckets[band, signature[band * rows : (band + 1) * rows]].append(event_id)
+    return [members for members in buckets.values() if len(members) > 1]
+
+
+def find_near_duplicates(
+    titles: dict[int, str], threshold: float = NEAR_DUPLICATE_THRESHOLD
+) -> dict[int, int]:
+    """Cluster near-duplicate *titles* (keyed by event id).
+
+    Returns a map from each duplicate's id to its canonical id, the lowest id
+    in its cluster.  Ids with no near duplicate are left out.
+    """
+    if len(titles) < 2:
+        return {}
+    shingle_sets = {event_id: shingles(title) for event_id, title in titles.items()}
+    # "Round 1" and "Round 2" are different events however similar the rest is.
+    number_sets = {event_id: numbers(title) for event_id, title in titles.items()}
+
+    parent = {event_id: event_id for event_id in titles}
+
+    def root(event_id: int) -> int:
+        while parent[event_id] != event_id:
+            parent[event_id] = parent[parent[event_id]]
+            event_id = parent[event_id]
+        return event_id
+
+    checked = set()
+    for members in _candidate_buckets(shingle_sets, threshold):
+        for i, a in enumerate(members):
+            for b in members[i + 1 :]:
+                if (a, b) in checked:
+                    continue
+                checked.add((a, b))
+                if number_sets[a] != number_sets[b]:
+                    continue
+                if jaccard(shingle_sets[a], shingle_sets[b]) >= threshold:
+                    ra, rb = root(a), root(b)
+                    parent[max(ra, rb)] = min(ra, rb)
+
+    matches = {}
+    for event_id in titles:
+        canonical = root(event_id)
+        if canonical != event_id:
+            matches[event_id] = canonical
+    return matches
+
+
+def resolve_near_duplicates(
+    db: Session,
+    groups: Iterable[Group],
+    threshold: float | None = None,
+    action: str | None = None,
+) -> int:
+    """Detect near duplicates among the events in *groups* and flag or merge them.
+
+    *groups* are ``(location_id, game_system_id, date)`` tuples.  Events that
+    are expired or already matched are not considered.  Returns the number of
+    events newly marked as duplicates; the caller commits.
+    """
+    action = action or NEAR_DUPLICATE_ACTION
+    if action not in ACTIONS:
+        raise ValueError(f"Unknown near-duplicate action {action!r}; expected one of {ACTIONS}")
+    groups = set(groups)
+    if action == "off" or not groups:
+        return 0
+    threshold = NEAR_DUPLICATE_THRESHOLD if threshold is None else threshold
+
+    titles: dict[Group, dict[int, str]] = defaultdict(dict)
+    for event_id, group, title in crud.get_duplicate_candidates(db, {g[2] for g in groups}):
+        if group in groups:
+            titles[group][event_id] = title
+
+    matches = {}
+    for group_titles in titles.values():
+        matches.update(find_near_duplicates(group_titles, threshold))
+    if matches:
+        crud.mark_duplicates(db, matches, merge=action == "merge")
+        logger.info("Marked %d near-duplicate events (%s)", len(matches), action)
+    return len(matches)
@@ -1,8 +1,8 @@
 import calendar as _cal
-import json
 import logging
 import os
 import smtplib
+from collections.abc import Callable
 from datetime import date as _date
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
@@ -150,8 +150,8 @@ def _build_filter_url(subscriber: Subscriber) -> str:
     """
     if not _SITE_URL:
         return ""
-    location_ids = json.loads(subscriber.location_ids or "[]")
-    game_system_ids = json.loads(subscriber.game_system_ids or "[]")
+    location_ids = list(subscriber.location_ids)
+    game_system_ids = list(subscriber.game_system_ids)
     parts: list[str] = []
     if location_ids:
         parts.append(f"location_id={location_ids[0]}")
@@ -329,7 +329,7 @@ def send_email(to_addr: str, subject: str, html_body: str) -> None:
         smtp.sendmail(_EMAIL_FROM, [to_addr], msg.as_string())
 
 
-def run_newsletter(db: Session) -> dict:
+def run_newsletter(db: Session, on_progress: Callable[[dict], None] | None = None) -> dict:
     subscribers = databridge.get_active_subscribers(db)
     sent = skipped = errors = 0
 
@@ -337,16 +337,25 @@ def run_newsletter(db: Session) -> dict:
         events = databridge.get_events_for_subscriber(db, sub)
         if not events:
             skipped += 1
-            continue
-        try:
-            filter_url = _build_filter_url(sub)
-            html = build_html_email(sub, events, filter_url=filter_url)
-            send_email(sub.email, "Your Monthly Wargame Events", html)
-            sent += 1
-            logger.info("Newsletter sent to %s (%d events)", sub.email, len(events))
-        except Exception as exc:
-            errors += 1
-            logger.error("Failed to send newsletter to %s: %s", sub.email, exc)
+        else:
+            try:
+                filter_url = _build_filter_url(sub)
+                html = build_html_email(sub, events, filter_url=filter_url)
+                send_email(sub.email, "Your Monthly Wargame Events", html)
+                sent += 1
+                logger.info("Newsletter sent to %s (%d events)", sub.email, len(events))
+            except Exception as exc:
+                errors += 1
+                logger.error("Failed to send newsletter to %s: %s", sub.email, exc)
+        if on_progress:
+            on_progress(
+                {
+                    "subscribers": len(subscribers),
+                    "sent": sent,
+                    "skipped": skipped,
+                    "errors": errors,
+                }
+            )
 
     result = {"sent": sent, "skipped": skipped, "errors": errors}
     logger.info("Newsletter run complete: %s", result)
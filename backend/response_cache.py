@@ -0,0 +1,74 @@
+"""Bounded in-process cache of serialized GET responses.
+
+Entries are tagged with the data generation (database.data_generation) they
+were built under, and a lookup under any other generation is a miss, so a
+commit that writes rows invalidates the whole cache without touching it.
+Each entry keeps the response body as bytes with a strong ETag, so a hit
+costs neither a query nor serialization, and a client that already has the
+body gets a 304.
+"""
+
+import hashlib
+from collections import OrderedDict
+from collections.abc import Hashable
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag for *body*: it changes whenever a byte does."""
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(etag: str, if_none_match: str | None) -> bool:
+    """Whether an ``If-None-Match`` header value names *etag* (or ``*``).
+
+    If-None-Match uses the weak comparison, so a ``W/`` prefix is ignored.
+    """
+    if not if_none_match:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+class CachedResponse:
+    __slots__ = ("generation", "body", "etag", "headers")
+
+    def __init__(self, generation: int, body: bytes, headers: dict[str, str] | None = None):
+        self.generation = generation
+        self.body = body
+        self.etag = make_etag(body)
+        self.headers = {**(headers or {}), "ETag": self.etag}
+
+
+class ResponseCache:
+    """Least-recently-used map of request keys to CachedResponse, at most *maxsize* entries.
+
+    Not locked: it is only used from the event loop, by async endpoints.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Hashable, CachedResponse] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, generation: int) -> CachedResponse | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.generation != generation:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: Hashable, entry: CachedResponse) -> None:
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
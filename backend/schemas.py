@@ -1,5 +1,6 @@
 import json
 from datetime import date, datetime
+from typing import Any
 
 from pydantic import BaseModel, EmailStr, field_validator
 
@@ -34,12 +35,39 @@ class EventOut(BaseModel):
     source_url: str | None = None
     source_type: str | None = None
     last_seen_at: datetime | None = None
+    duplicate_of_id: int | None = None
     location: LocationOut
     game_system: GameSystemOut
 
     model_config = {"from_attributes": True}
 
 
+class EventRowOut(BaseModel):
+    """EventOut with its location and game system referenced by id (see EventPageOut)."""
+
+    id: int
+    title: str
+    date: date
+    start_time: str | None = None
+    description: str | None = None
+    source_url: str | None = None
+    source_type: str | None = None
+    last_seen_at: datetime | None = None
+    duplicate_of_id: int | None = None
+    location_id: int
+    game_system_id: int
+
+    model_config = {"from_attributes": True}
+
+
+class EventPageOut(BaseModel):
+    """GET /events?format=compact: each location and game system on the page once."""
+
+    locations: list[LocationOut]
+    game_systems: list[GameSystemOut]
+    events: list[EventRowOut]
+
+
 class EventIn(BaseModel):
     location_name: str
     game_system: str
@@ -67,7 +95,27 @@ class SubscribeOut(BaseModel):
 
     @field_validator("location_ids", "game_system_ids", mode="before")
     @classmethod
-    def parse_json_list(cls, v):
+    def copy_id_list(cls, v):
+        # Subscriber exposes its ids through association proxies, not lists.
+        return list(v)
+
+    model_config = {"from_attributes": True}
+
+
+class JobOut(BaseModel):
+    id: int
+    kind: str
+    status: str
+    progress: dict[str, Any]
+    result: dict[str, Any] | None = None
+    error: str | None = None
+    created_at: datetime | None = None
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+    @field_validator("progress", "result", mode="before")
+    @classmethod
+    def parse_json_dict(cls, v):
         if isinstance(v, str):
             return json.loads(v)
         return v
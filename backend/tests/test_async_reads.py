@@ -0,0 +1,600 @@
+"""Tests for the async read endpoints (/events, /locations, /games)."""
+
+import sqlite3
+from contextlib import closing, contextmanager
+from datetime import date, datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+
+from backend import databridge as crud
+from backend import models  # noqa: F401 — models registers ORM classes with Base
+from backend.database import (
+    Base,
+    configure_sqlite,
+    create_async_read_engine,
+    get_async_read_db,
+)
+from backend.main import app, events_cache, reference_cache
+from backend.models import Event, GameSystem, Location, Subscriber
+from backend.newsletter import build_html_email
+from backend.response_cache import CachedResponse, ResponseCache
+from backend.schemas import EventOut, EventPageOut, GameSystemOut, LocationOut
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture()
+def db_url(tmp_path):
+    return f"sqlite:///{tmp_path / 'reads.db'}"
+
+
+@pytest.fixture()
+def db(db_url):
+    engine = configure_sqlite(create_engine(db_url))
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture()
+def async_engine(db_url):
+    return create_async_read_engine(db_url)
+
+
+@pytest.fixture()
+def client(async_engine, db):
+    factory = async_sessionmaker(async_engine, autoflush=False)
+
+    async def override_get_async_read_db():
+        async with factory() as session:
+            yield session
+
+    app.dependency_overrides[get_async_read_db] = override_get_async_read_db
+    events_cache.clear()
+    reference_cache.clear()
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture()
+def seeded(db):
+    store = Location(name="Dragon's Lair", city="Austin", state="TX")
+    other = Location(name="Game Haven", city="Dallas", state="TX")
+    forty_k = GameSystem(name="Warhammer 40K", slug="warhammer-40k")
+    kill_team = GameSystem(name="Kill Team", slug="kill-team")
+    db.add_all([store, other, forty_k, kill_team])
+    db.flush()
+    today = date.today()
+    events = [
+        Event(
+            title=f"Event {i}",
+            date=today + timedelta(days=i),
+            location_id=(store if i % 2 else other).id,
+            game_system_id=(forty_k if i < 3 else kill_team).id,
+            dedup_hash=bytes([i]) * 16,
+        )
+        for i in range(1, 6)
+    ]
+    events.append(
+        Event(
+            title="Old",
+            date=today - timedelta(days=1),
+            location_id=store.id,
+            game_system_id=forty_k.id,
+            dedup_hash=bytes(16),
+            is_expired=True,
+        )
+    )
+    db.add_all(events)
+    db.commit()
+    return {"store": store, "other": other, "forty_k": forty_k, "kill_team": kill_team}
+
+
+def _seed_page(db, count):
+    """*count* upcoming events spread over 10 locations and 5 game systems."""
+    locations = [Location(name=f"Store {i}") for i in range(10)]
+    game_systems = [GameSystem(name=f"Game {i}", slug=f"game-{i}") for i in range(5)]
+    db.add_all(locations + game_systems)
+    db.flush()
+    db.add_all(
+        Event(
+            title=f"Event {i}",
+            date=date.today() + timedelta(days=i % 60),
+            location_id=locations[i % 10].id,
+            game_system_id=game_systems[i % 5].id,
+            dedup_hash=i.to_bytes(16, "big"),
+        )
+        for i in range(count)
+    )
+    db.commit()
+    return locations, game_systems
+
+
+@contextmanager
+def _statements(engine):
+    """Collect the SQL statements *engine* runs inside the block."""
+    statements = []
+
+    def listener(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+
+def _write_elsewhere(db_url, statement):
+    """Run *statement* on a bare sqlite3 connection, as another process would."""
+    with closing(sqlite3.connect(db_url.removeprefix("sqlite:///"))) as conn, conn:
+        conn.execute(statement)
+
+
+@contextmanager
+def _during_commit(db, request):
+    """Call *request* on each commit of *db*, after the commit starts but before
+    SQLite has it, and collect the responses."""
+    responses = []
+
+    def listener(conn):
+        responses.append(request())
+
+    engine = db.get_bind()
+    event.listen(engine, "commit", listener)
+    try:
+        yield responses
+    finally:
+        event.remove(engine, "commit", listener)
+
+
+# ---------------------------------------------------------------------------
+# Endpoints
+# ---------------------------------------------------------------------------
+
+
+class TestAsyncEndpoints:
+    def test_locations_are_sorted_by_name(self, client, seeded):
+        response = client.get("/locations")
+        assert response.status_code == 200
+        assert [loc["name"] for loc in response.json()] == ["Dragon's Lair", "Game Haven"]
+
+    def test_games_are_sorted_by_name(self, client, seeded):
+        response = client.get("/games")
+        assert response.status_code == 200
+        assert [game["name"] for game in response.json()] == ["Kill Team", "Warhammer 40K"]
+
+    def test_events_include_related_rows(self, client, seeded):
+        events = client.get("/events").json()
+        assert [e["title"] for e in events] == [f"Event {i}" for i in range(1, 6)]
+        assert events[0]["location"]["name"] == "Dragon's Lair"
+        assert events[0]["game_system"]["name"] == "Warhammer 40K"
+
+    def test_events_filters_and_paging(self, client, seeded):
+        params = {"location_id": seeded["store"].id, "skip": 1, "limit": 1}
+        assert [e["title"] for e in client.get("/events", params=params).json()] == ["Event 3"]
+
+        params = {"game_system_ids": [seeded["kill_team"].id]}
+        titles = [e["title"] for e in client.get("/events", params=params).json()]
+        assert titles == ["Event 3", "Event 4", "Event 5"]
+
+
+# ---------------------------------------------------------------------------
+# Shared statements
+# ---------------------------------------------------------------------------
+
+
+class TestSyncHelpers:
+    def test_sync_helpers_match_the_endpoints(self, client, db, seeded):
+        assert [e.title for e in crud.get_events(db)] == [
+            e["title"] for e in client.get("/events").json()
+        ]
+        assert [loc.name for loc in crud.get_locations(db)] == [
+            loc["name"] for loc in client.get("/locations").json()
+        ]
+        assert [game.name for game in crud.get_game_systems(db)] == [
+            game["name"] for game in client.get("/games").json()
+        ]
+
+    def test_events_query_loads_relations_eagerly(self, db, seeded):
+        event = crud.get_events(db, limit=1)[0]
+        db.expunge(event)
+        assert event.location.name == "Dragon's Lair"
+        assert event.game_system.name == "Warhammer 40K"
+
+
+class TestEagerLoading:
+    """Reading a page of events, and everything rendered from it, costs a fixed
+    number of statements however many locations and game systems it spans."""
+
+    @pytest.mark.parametrize("count", [5, 500])
+    def test_event_page_is_one_statement(self, db, count):
+        _seed_page(db, count)
+
+        with Session(db.get_bind()) as fresh, _statements(db.get_bind()) as statements:
+            events = crud.get_events(fresh, limit=500)
+            [EventOut.model_validate(e) for e in events]
+
+        assert len(events) == count
+        assert len(statements) == 1
+
+    def test_endpoint_page_is_one_statement(self, client, async_engine, db):
+        _seed_page(db, 500)
+
+        with _statements(async_engine.sync_engine) as statements:
+            response = client.get("/events", params={"limit": 500})
+
+        assert len(response.json()) == 500
+        assert len(statements) == 1
+
+    def test_newsletter_events_are_one_statement(self, db):
+        locations, game_systems = _seed_page(db, 500)
+        subscriber = Subscriber(
+            email="a@example.com",
+            location_ids=[loc.id for loc in locations],
+            game_system_ids=[gs.id for gs in game_systems],
+        )
+        db.add(subscriber)
+        db.commit()
+
+        with Session(db.get_bind()) as fresh:
+            subscriber = fresh.get(Subscriber, subscriber.id)
+            with _statements(db.get_bind()) as statements:
+                events = crud.get_events_for_subscriber(fresh, subscriber)
+                build_html_email(subscriber, events)
+
+        assert len(events) == 500
+        assert len(statements) == 1
+
+
+# ---------------------------------------------------------------------------
+# Row serialization
+# ---------------------------------------------------------------------------
+
+
+class TestRowSerialization:
+    """GET /events encodes plain rows itself; the bytes must match what
+    response_model would have produced from the ORM objects."""
+
+    @pytest.fixture()
+    def awkward(self, db, seeded):
+        db.add(
+            Event(
+                title='Ré\u2028"quoted"\t\x01 😀',
+                description="</script>\\",
+                date=date.today(),
+                start_time="18:00",
+                source_url="https://example.com/e?a=1&b=2",
+                last_seen_at=datetime(2026, 3, 7, 18, 30, 5, 123000),
+                location_id=seeded["other"].id,
+                game_system_id=seeded["kill_team"].id,
+                dedup_hash=bytes([7]) * 16,
+            )
+        )
+        seeded["store"].website = "https://dragons.example"
+        db.commit()
+
+    def test_fields_follow_the_schemas(self):
+        assert tuple(EventOut.model_fields) == crud.EVENT_ROW_FIELDS + ("location", "game_system")
+        assert tuple(LocationOut.model_fields) == crud.LOCATION_ROW_FIELDS
+        assert tuple(GameSystemOut.model_fields) == crud.GAME_SYSTEM_ROW_FIELDS
+
+    def test_full_page_matches_pydantic(self, client, db, awkward):
+        adapter = TypeAdapter(list[EventOut])
+        expected = adapter.dump_json(
+            adapter.validate_python(crud.get_events(db), from_attributes=True)
+        )
+
+        assert client.get("/events").content == expected
+
+    def test_compact_page_matches_pydantic(self, client, db, awkward):
+        events = crud.get_events(db)
+        expected = EventPageOut.model_validate(
+            {
+                "locations": list({e.location_id: e.location for e in events}.values()),
+                "game_systems": list({e.game_system_id: e.game_system for e in events}.values()),
+                "events": events,
+            },
+            from_attributes=True,
+        ).model_dump_json()
+
+        assert client.get("/events", params={"format": "compact"}).content == expected.encode()
+
+
+# ---------------------------------------------------------------------------
+# format=compact
+# ---------------------------------------------------------------------------
+
+
+class TestCompactFormat:
+    def test_compact_page_expands_to_the_full_page(self, client, seeded):
+        full = client.get("/events").json()
+        compact = client.get("/events", params={"format": "compact"}).json()
+
+        locations = {loc["id"]: loc for loc in compact["locations"]}
+        game_systems = {gs["id"]: gs for gs in compact["game_systems"]}
+        expanded = [
+            {
+                **{k: v for k, v in e.items() if k not in ("location_id", "game_system_id")},
+                "location": locations[e["location_id"]],
+                "game_system": game_systems[e["game_system_id"]],
+            }
+            for e in compact["events"]
+        ]
+        assert expanded == full
+
+    def test_each_location_and_game_system_is_listed_once(self, client, seeded):
+        compact = client.get("/events", params={"format": "compact"}).json()
+
+        assert [loc["name"] for loc in compact["locations"]] == ["Dragon's Lair", "Game Haven"]
+        assert [gs["name"] for gs in compact["game_systems"]] == ["Warhammer 40K", "Kill Team"]
+        assert "location" not in compact["events"][0]
+
+    def test_next_link_keeps_the_format(self, client, seeded):
+        first = client.get("/events", params={"format": "compact", "limit": 3})
+        second = client.get(_next_link(first))
+
+        assert [e["title"] for e in second.json()["events"]] == ["Event 4", "Event 5"]
+
+    def test_formats_are_cached_apart(self, client, seeded):
+        assert isinstance(client.get("/events").json(), list)
+        assert isinstance(client.get("/events", params={"format": "compact"}).json(), dict)
+
+    def test_unknown_format(self, client, seeded):
+        assert client.get("/events", params={"format": "xml"}).status_code == 422
+
+
+# ---------------------------------------------------------------------------
+# Response cache
+# ---------------------------------------------------------------------------
+
+
+class TestEventsCache:
+    def test_repeat_request_is_served_from_memory(self, client, async_engine, seeded):
+        first = client.get("/events", params={"limit": 2})
+        with _statements(async_engine.sync_engine) as statements:
+            second = client.get("/events", params={"limit": 2})
+
+        assert statements == []
+        assert second.content == first.content
+        assert second.headers["etag"] == first.headers["etag"]
+        assert second.headers["link"] == first.headers["link"]
+
+    def test_filters_are_normalized(self, client, async_engine, seeded):
+        ids = [seeded["kill_team"].id, seeded["forty_k"].id]
+        first = client.get("/events", params={"game_system_ids": ids})
+        with _statements(async_engine.sync_engine) as statements:
+            second = client.get("/events", params={"game_system_ids": ids[::-1] + ids[:1]})
+
+        assert statements == []
+        assert second.content == first.content
+
+    def test_matching_etag_gets_304(self, client, async_engine, seeded):
+        etag = client.get("/events").headers["etag"]
+        with _statements(async_engine.sync_engine) as statements:
+            response = client.get("/events", headers={"If-None-Match": f'"other", W/{etag}'})
+
+        assert statements == []
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+    def test_stale_etag_gets_the_page(self, client, seeded):
+        response = client.get("/events", headers={"If-None-Match": '"stale"'})
+
+        assert response.status_code == 200
+        assert len(response.json()) == 5
+
+    def test_committed_write_invalidates_the_cache(self, client, db, seeded):
+        first = client.get("/events")
+        db.add(
+            Event(
+                title="Event 6",
+                date=date.today() + timedelta(days=6),
+                location_id=seeded["store"].id,
+                game_system_id=seeded["forty_k"].id,
+                dedup_hash=bytes([6]) * 16,
+            )
+        )
+        db.commit()
+
+        second = client.get("/events", headers={"If-None-Match": first.headers["etag"]})
+
+        assert second.status_code == 200
+        assert second.headers["etag"] != first.headers["etag"]
+        assert [e["title"] for e in second.json()][-1] == "Event 6"
+
+    def test_request_during_a_commit_is_not_served_after_it(self, client, db, seeded):
+        client.get("/events")
+        with _during_commit(db, lambda: client.get("/events")) as during:
+            db.add(
+                Event(
+                    title="Event 6",
+                    date=date.today() + timedelta(days=6),
+                    location_id=seeded["store"].id,
+                    game_system_id=seeded["forty_k"].id,
+                    dedup_hash=bytes([6]) * 16,
+                )
+            )
+            db.commit()
+
+        assert "Event 6" not in [e["title"] for e in during[0].json()]
+        response = client.get("/events", headers={"If-None-Match": during[0].headers["etag"]})
+        assert response.status_code == 200
+        assert [e["title"] for e in response.json()][-1] == "Event 6"
+
+    def test_write_from_another_process_invalidates_the_cache(self, client, db_url, seeded):
+        first = client.get("/events")
+        _write_elsewhere(db_url, "UPDATE events SET title = 'Renamed' WHERE title = 'Event 1'")
+
+        response = client.get("/events", headers={"If-None-Match": first.headers["etag"]})
+
+        assert response.status_code == 200
+        assert response.json()[0]["title"] == "Renamed"
+
+    def test_cache_is_bounded(self):
+        cache = ResponseCache(2)
+        for key in "abc":
+            cache.put(key, CachedResponse(0, key.encode()))
+        cache.get("b", 0)
+        cache.put("d", CachedResponse(0, b"d"))
+
+        assert len(cache) == 2
+        assert cache.get("b", 0).body == b"b"
+        assert cache.get("a", 0) is None
+        assert cache.get("b", 1) is None
+
+
+class TestReferenceCache:
+    @pytest.mark.parametrize("path", ["/locations", "/games"])
+    def test_repeat_request_is_served_from_memory(self, client, async_engine, seeded, path):
+        first = client.get(path)
+        with _statements(async_engine.sync_engine) as statements:
+            second = client.get(path)
+            not_modified = client.get(path, headers={"If-None-Match": first.headers["etag"]})
+
+        assert statements == []
+        assert second.content == first.content
+        assert first.headers["cache-control"].startswith("public, max-age=")
+        assert not_modified.status_code == 304
+
+    def test_new_location_refreshes_the_list(self, client, db, seeded):
+        first = client.get("/locations")
+        crud.get_or_create_location(db, "Dragon's Lair")
+        db.commit()
+        assert client.get("/locations").headers["etag"] == first.headers["etag"]
+
+        crud.get_or_create_location(db, "Hobby Hut")
+        db.commit()
+        response = client.get("/locations", headers={"If-None-Match": first.headers["etag"]})
+
+        assert response.status_code == 200
+        assert "Hobby Hut" in [loc["name"] for loc in response.json()]
+
+    def test_request_during_a_commit_is_not_served_after_it(self, client, db, seeded):
+        client.get("/locations")
+        with _during_commit(db, lambda: client.get("/locations")) as during:
+            crud.get_or_create_location(db, "Hobby Hut")
+            db.commit()
+
+        assert "Hobby Hut" not in [loc["name"] for loc in during[0].json()]
+        response = client.get("/locations", headers={"If-None-Match": during[0].headers["etag"]})
+        assert response.status_code == 200
+        assert "Hobby Hut" in [loc["name"] for loc in response.json()]
+
+    def test_write_from_another_process_refreshes_the_list(self, client, db_url, seeded):
+        first = client.get("/locations")
+        _write_elsewhere(db_url, "INSERT INTO locations (name) VALUES ('Hobby Hut')")
+
+        response = client.get("/locations", headers={"If-None-Match": first.headers["etag"]})
+
+        assert response.status_code == 200
+        assert "Hobby Hut" in [loc["name"] for loc in response.json()]
+
+    def test_writes_to_other_tables_keep_the_list(self, client, async_engine, db, seeded):
+        client.get("/games")
+        crud.get_or_create_location(db, "Hobby Hut")
+        db.commit()
+
+        with _statements(async_engine.sync_engine) as statements:
+            client.get("/games")
+
+        assert statements == []
+
+
+# ---------------------------------------------------------------------------
+# Cursor pagination
+# ---------------------------------------------------------------------------
+
+
+def _next_link(response):
+    link = response.headers.get("link")
+    if link is None:
+        return None
+    url, rel = link.split("; ")
+    assert rel == 'rel="next"'
+    return url.strip("<>")
+
+
+class TestCursorPagination:
+    def test_cursor_round_trips(self):
+        cursor = crud.encode_event_cursor(date(2026, 3, 7), 42)
+        assert crud.decode_event_cursor(cursor) == (date(2026, 3, 7), 42)
+
+    def test_following_links_visits_every_event_once(self, client, seeded):
+        titles = []
+        response = client.get("/events", params={"limit": 2})
+        while True:
+            titles += [e["title"] for e in response.json()]
+            url = _next_link(response)
+            if url is None:
+                break
+            response = client.get(url)
+
+        assert titles == [f"Event {i}" for i in range(1, 6)]
+
+    def test_events_sharing_a_date_are_not_skipped(self, client, db, seeded):
+        db.add_all(
+            Event(
+                title=f"Event 2{suffix}",
+                date=date.today() + timedelta(days=2),
+                location_id=seeded["store"].id,
+                game_system_id=seeded["forty_k"].id,
+                dedup_hash=suffix.encode() * 16,
+            )
+            for suffix in "abc"
+        )
+        db.commit()
+
+        titles = []
+        url = "/events?limit=2"
+        while url:
+            response = client.get(url)
+            titles += [e["title"] for e in response.json()]
+            url = _next_link(response)
+
+        assert sorted(titles) == sorted(f"Event {i}" for i in [1, 2, "2a", "2b", "2c", 3, 4, 5])
+        assert len(titles) == 8
+
+    def test_link_keeps_filters_and_drops_skip(self, client, seeded):
+        params = {"game_system_ids": [seeded["kill_team"].id], "skip": 1, "limit": 1}
+        url = _next_link(client.get("/events", params=params))
+
+        assert "skip" not in url
+        assert f"game_system_ids={seeded['kill_team'].id}" in url
+        assert [e["title"] for e in client.get(url).json()] == ["Event 5"]
+
+    def test_page_does_not_shift_when_earlier_events_are_added(self, client, db, seeded):
+        first = client.get("/events", params={"limit": 2})
+        db.add(
+            Event(
+                title="Event 0",
+                date=date.today(),
+                location_id=seeded["store"].id,
+                game_system_id=seeded["forty_k"].id,
+                dedup_hash=bytes([9]) * 16,
+            )
+        )
+        db.commit()
+
+        second = client.get(_next_link(first))
+
+        assert [e["title"] for e in second.json()] == ["Event 3", "Event 4"]
+
+    def test_invalid_cursor(self, client, seeded):
+        assert client.get("/events", params={"cursor": "not-a-cursor"}).status_code == 400
+
+    def test_cursor_with_search_is_rejected(self, client, seeded):
+        cursor = crud.encode_event_cursor(date.today(), 1)
+        response = client.get("/events", params={"cursor": cursor, "q": "event"})
+
+        assert response.status_code == 400
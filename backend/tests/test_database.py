@@ -0,0 +1,166 @@
+"""Tests for the SQLite connection profile in backend/database.py."""
+
+import threading
+import time
+
+import pytest
+from sqlalchemy import column, create_engine, event, insert, select, table, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from backend import database
+from backend.database import configure_sqlite, create_read_engine, create_write_engine
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture()
+def engine(tmp_path):
+    engine = configure_sqlite(create_engine(f"sqlite:///{tmp_path / 'profile.db'}"))
+    yield engine
+    engine.dispose()
+
+
+def _pragma(conn, name):
+    return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+
+# ---------------------------------------------------------------------------
+# configure_sqlite
+# ---------------------------------------------------------------------------
+
+
+class TestSqliteProfile:
+    def test_pragmas_are_applied_to_each_connection(self, engine):
+        with engine.connect() as conn:
+            assert _pragma(conn, "journal_mode") == "wal"
+            assert _pragma(conn, "synchronous") == 1  # NORMAL
+            assert _pragma(conn, "cache_size") == -database.SQLITE_CACHE_SIZE_KB
+            assert _pragma(conn, "temp_store") == 2  # MEMORY
+            assert _pragma(conn, "busy_timeout") == database.SQLITE_BUSY_TIMEOUT_MS
+
+    def test_readers_are_not_blocked_by_an_open_write(self, engine):
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE t (x INTEGER)"))
+            conn.execute(text("INSERT INTO t VALUES (1)"))
+
+        with engine.connect() as writer, engine.connect() as reader:
+            writer.execute(text("BEGIN EXCLUSIVE"))
+            writer.execute(text("INSERT INTO t VALUES (2)"))
+            assert reader.execute(text("SELECT count(*) FROM t")).scalar() == 1
+            writer.rollback()
+
+
+# ---------------------------------------------------------------------------
+# create_read_engine / create_write_engine
+# ---------------------------------------------------------------------------
+
+
+class TestEngineSplit:
+    @pytest.fixture()
+    def url(self, tmp_path):
+        url = f"sqlite:///{tmp_path / 'split.db'}"
+        setup = create_engine(url)
+        with setup.begin() as conn:
+            conn.execute(text("CREATE TABLE t (x INTEGER)"))
+        setup.dispose()
+        return url
+
+    def test_read_engine_rejects_writes(self, url):
+        engine = create_read_engine(url)
+        with engine.connect() as conn, pytest.raises(OperationalError):
+            conn.execute(text("INSERT INTO t VALUES (1)"))
+        engine.dispose()
+
+    def test_concurrent_writes_queue_instead_of_failing(self, url):
+        engine = create_write_engine(url)
+
+        def write(n):
+            with Session(engine) as db:
+                db.execute(text("INSERT INTO t VALUES (:n)"), {"n": n})
+                time.sleep(0.05)  # still holding the writer connection
+                db.commit()
+
+        threads = [threading.Thread(target=write, args=(n,)) for n in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT count(*) FROM t")).scalar() == 5
+        assert engine.pool.size() == 1
+        engine.dispose()
+
+    def test_reads_do_not_wait_for_the_writer(self, url):
+        write_engine = create_write_engine(url)
+        read_engine = create_read_engine(url)
+
+        with Session(write_engine) as writer:
+            writer.execute(text("INSERT INTO t VALUES (1)"))
+            with Session(read_engine) as reader:
+                assert reader.execute(text("SELECT count(*) FROM t")).scalar() == 0
+            writer.commit()
+
+        write_engine.dispose()
+        read_engine.dispose()
+
+
+# ---------------------------------------------------------------------------
+# data_generation
+# ---------------------------------------------------------------------------
+
+
+class TestDataGeneration:
+    @pytest.fixture()
+    def scratch(self, engine):
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE t (x INTEGER)"))
+        return table("t", column("x"))
+
+    def test_committed_write_changes_the_generation(self, engine, scratch):
+        before = database.data_generation()
+        with Session(engine) as db:
+            db.execute(insert(scratch).values(x=1))
+            db.commit()
+
+        assert database.data_generation() != before
+
+    def test_reads_and_rolled_back_writes_do_not(self, engine, scratch):
+        before = database.data_generation()
+        with Session(engine) as db:
+            db.execute(select(scratch.c.x)).all()
+            db.commit()
+            db.execute(insert(scratch).values(x=1))
+            db.rollback()
+            db.commit()
+
+        assert database.data_generation() == before
+
+    def test_table_version_follows_writes_to_that_table(self, engine, scratch):
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE other (x INTEGER)"))
+        other = table("other", column("x"))
+        before = database.table_version("t")
+
+        with Session(engine) as db:
+            db.execute(insert(other), [{"x": 1}, {"x": 2}])
+            db.commit()
+        assert database.table_version("t") == before
+
+        with Session(engine) as db:
+            db.execute(scratch.update().values(x=2))
+            db.commit()
+        assert database.table_version("t") == database.data_generation()
+
+    def test_generation_changes_again_once_the_commit_is_visible(self, engine, scratch):
+        seen = []
+        event.listen(engine, "commit", lambda conn: seen.append(database.data_generation()))
+        with Session(engine) as db:
+            db.execute(insert(scratch).values(x=1))
+            db.commit()
+
+        assert database.data_generation() != seen[0]
+        assert database.table_version("t") == database.data_generation()
@@ -9,6 +9,7 @@ from datetime import date as date_type
 
 import pytest
 from sqlalchemy import create_engine
+from sqlalchemy import event as event_api
 from sqlalchemy.orm import sessionmaker
 
 from backend import models  # noqa: F401 — registers ORM classes with Base
@@ -285,3 +286,50 @@ class TestUpsertEventDeduplication:
 
         assert was_created is False
         assert event2.is_expired is False
+
+    def test_skip_unchanged_leaves_unchanged_row_clean(self, db):
+        from datetime import datetime
+
+        record = _make_record(time="18:00", last_seen_at=datetime(2026, 2, 20, 12))
+        loc = get_or_create_location(db, record["location_name"])
+        gs = get_or_create_game_system(db, record["game_system"])
+        event, _ = upsert_event(db, record, loc, gs)
+        db.commit()
+
+        later = {**record, "last_seen_at": datetime(2026, 2, 27, 12)}
+        event2, was_created = upsert_event(db, later, loc, gs, skip_unchanged=True)
+
+        assert was_created is False
+        assert event2 not in db.dirty
+        assert event2.last_seen_at == datetime(2026, 2, 27, 12)
+
+    def test_aware_last_seen_at_is_stored_and_compared_as_utc(self, db):
+        from datetime import datetime, timedelta, timezone
+
+        seen = datetime(2026, 2, 20, 12, tzinfo=timezone(timedelta(hours=2)))
+        record = _make_record(time="18:00", last_seen_at=seen)
+        loc = get_or_create_location(db, record["location_name"])
+        gs = get_or_create_game_system(db, record["game_system"])
+        event, _ = upsert_event(db, record, loc, gs)
+        db.commit()
+        db.expire_all()
+
+        assert event.last_seen_at == datetime(2026, 2, 20, 10)
+        statements = []
+        event_api.listen(db.get_bind(), "before_cursor_execute", lambda *a: statements.append(a[2]))
+        upsert_event(db, record, loc, gs, skip_unchanged=True)
+
+        assert not [s for s in statements if s.startswith("UPDATE events")]
+
+    def test_skip_unchanged_still_applies_real_changes(self, db):
+        record = _make_record(time="18:00", source_url="https://example.com/1")
+        loc = get_or_create_location(db, record["location_name"])
+        gs = get_or_create_game_system(db, record["game_system"])
+        upsert_event(db, record, loc, gs)
+        db.commit()
+
+        changed = {**record, "source_url": "https://example.com/2"}
+        event, _ = upsert_event(db, changed, loc, gs, skip_unchanged=True)
+        db.commit()
+
+        assert event.source_url == "https://example.com/2"
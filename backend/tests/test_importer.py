@@ -0,0 +1,778 @@
+"""Tests for the flat-file importer (run_import and its helpers)."""
+
+import gzip
+import io
+import json
+import os
+import threading
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+
+from backend import databridge as crud
+from backend import importer, models  # noqa: F401 — models registers ORM classes with Base
+from backend.database import Base
+from backend.importer import iter_json_array, run_import
+from backend.migrations import run_migrations
+from backend.models import (
+    Event,
+    EventArchive,
+    GameSystem,
+    ImportCheckpoint,
+    ImportManifest,
+    Location,
+)
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture()
+def engine():
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture()
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+_FUTURE = (date.today() + timedelta(days=10)).isoformat()
+
+
+def _raw(
+    location_name="Game Vault",
+    game_system="Warhammer 40,000",
+    title="Friday Night 40K",
+    date=_FUTURE,
+    **kwargs,
+):
+    return {
+        "location_name": location_name,
+        "game_system": game_system,
+        "title": title,
+        "date": date,
+        **kwargs,
+    }
+
+
+def _write(path, records):
+    path.write_text(json.dumps(records), encoding="utf-8")
+    return path
+
+
+# ---------------------------------------------------------------------------
+# iter_json_array — streaming reader
+# ---------------------------------------------------------------------------
+
+
+class TestIterJsonArray:
+    def _read(self, text, read_size=7):
+        return list(iter_json_array(io.StringIO(text), read_size=read_size))
+
+    def test_yields_each_element(self):
+        records = [_raw(title=f"Event {i}") for i in range(25)]
+        assert self._read(json.dumps(records)) == records
+
+    def test_matches_json_load_with_awkward_content(self):
+        records = [
+            {"title": 'Brackets ] and } and "quotes", inside', "n": 12345678901234},
+            {"nested": {"list": [1, 2, {"x": None}]}, "unicode": "Dragon’s Den ✓"},
+            3.25,
+            "plain string",
+        ]
+        text = json.dumps(records, indent=2, ensure_ascii=False)
+        for read_size in (1, 2, 5, 64, 4096):
+            assert self._read(text, read_size) == records
+
+    def test_number_split_across_reads_is_not_truncated(self):
+        assert self._read("[123456789, 42]", read_size=3) == [123456789, 42]
+
+    def test_empty_array(self):
+        assert self._read("  [ \n ]  ") == []
+
+    def test_top_level_object_is_single_record(self):
+        assert self._read(json.dumps(_raw())) == [_raw()]
+
+    def test_malformed_input_raises_after_valid_elements(self):
+        reader = iter_json_array(io.StringIO('[{"a": 1}, {"b": '), read_size=4)
+        assert next(reader) == {"a": 1}
+        with pytest.raises(json.JSONDecodeError):
+            next(reader)
+
+    def test_malformed_element_fails_without_reading_on(self):
+        tail = ", ".join(json.dumps(_raw(title=f"Event {i}")) for i in range(20_000))
+        f = io.StringIO(f'[{{"a": 1}}, {{"b": tru}}, {tail}]')
+        reader = iter_json_array(f, read_size=1024)
+
+        assert next(reader) == {"a": 1}
+        with pytest.raises(json.JSONDecodeError):
+            next(reader)
+        assert f.tell() <= 2048
+
+    def test_missing_separator_raises(self):
+        with pytest.raises(json.JSONDecodeError):
+            self._read('[{"a": 1} {"b": 2}]')
+
+
+# ---------------------------------------------------------------------------
+# Input formats
+# ---------------------------------------------------------------------------
+
+
+class TestInputFormats:
+    def _records(self, prefix):
+        return [_raw(title=f"{prefix} {i}") for i in range(3)]
+
+    def test_every_format_is_imported(self, db, tmp_path):
+        _write(tmp_path / "a.json", self._records("json"))
+        (tmp_path / "b.ndjson").write_text(
+            "\n".join(json.dumps(r) for r in self._records("ndjson")) + "\n\n", encoding="utf-8"
+        )
+        with gzip.open(tmp_path / "c.json.gz", "wt", encoding="utf-8") as f:
+            json.dump(self._records("json.gz"), f)
+        with gzip.open(tmp_path / "d.ndjson.gz", "wt", encoding="utf-8") as f:
+            f.writelines(json.dumps(r) + "\n" for r in self._records("ndjson.gz"))
+        (tmp_path / "notes.txt").write_text("not an import file", encoding="utf-8")
+
+        result = run_import(db, tmp_path)
+
+        assert result["created"] == 12
+        assert set(result["file_errors"]) == {"a.json", "b.ndjson", "c.json.gz", "d.ndjson.gz"}
+
+    def test_formats_share_the_dedup_hash(self, db, tmp_path):
+        _write(tmp_path / "a.json", self._records("same"))
+        with gzip.open(tmp_path / "b.ndjson.gz", "wt", encoding="utf-8") as f:
+            f.writelines(json.dumps(r) + "\n" for r in self._records("same"))
+
+        result = run_import(db, tmp_path)
+
+        assert result["created"] == 3
+        assert result["unchanged"] == 3
+
+    def test_truncated_ndjson_keeps_complete_lines(self, db, tmp_path):
+        lines = [json.dumps(r) for r in self._records("ndjson")]
+        (tmp_path / "a.ndjson").write_text("\n".join(lines) + '\n{"title": "half', encoding="utf-8")
+
+        assert run_import(db, tmp_path)["created"] == 3
+
+
+# ---------------------------------------------------------------------------
+# run_import
+# ---------------------------------------------------------------------------
+
+
+class TestRunImport:
+    def test_empty_directory_returns_zero_counts(self, db, tmp_path):
+        result = run_import(db, tmp_path)
+        assert result == {
+            "processed": 0,
+            "created": 0,
+            "updated": 0,
+            "unchanged": 0,
+            "expired": 0,
+            "errors": 0,
+            "skipped": 0,
+            "near_duplicates": 0,
+            "archived": 0,
+            "pages_reclaimed": 0,
+            "file_errors": {},
+        }
+
+    def test_fresh_import_creates_events(self, db, tmp_path):
+        _write(
+            tmp_path / "a.json",
+            [_raw(title="Event A"), _raw(title="Event B"), _raw(game_system="Age of Sigmar")],
+        )
+        result = run_import(db, tmp_path)
+
+        assert result["processed"] == 3
+        assert result["created"] == 3
+        assert result["updated"] == 0
+        assert db.query(Event).count() == 3
+
+    def test_reimport_updates_instead_of_duplicating(self, db, tmp_path):
+        _write(tmp_path / "a.json", [_raw(title="Event A"), _raw(title="Event B")])
+        run_import(db, tmp_path)
+        result = run_import(db, tmp_path, force=True, skip_unchanged=False)
+
+        assert result["created"] == 0
+        assert result["updated"] == 2
+        assert db.query(Event).count() == 2
+
+    def test_duplicate_within_one_file_is_single_event(self, db, tmp_path):
+        _write(tmp_path / "a.json", [_raw(), _raw(source_url="https://example.com/2")])
+        result = run_import(db, tmp_path)
+
+        assert result["created"] == 1
+        assert result["updated"] == 1
+        event_row = db.query(Event).one()
+        assert event_row.source_url == "https://example.com/2"
+
+    def test_locations_and_game_systems_created_once(self, db, tmp_path):
+        _write(
+            tmp_path / "a.json",
+            [_raw(title=f"Event {i}", location_name=f"Store {i % 3}") for i in range(10)],
+        )
+        _write(tmp_path / "b.json", [_raw(location_name="Store 1", title="Other")])
+        run_import(db, tmp_path)
+
+        assert db.query(Location).count() == 3
+        assert db.query(GameSystem).count() == 1
+
+    def test_game_system_slugs_are_unique(self, db, tmp_path):
+        _write(
+            tmp_path / "a.json",
+            [_raw(game_system="Kill Team"), _raw(game_system="Kill-Team")],
+        )
+        run_import(db, tmp_path)
+
+        slugs = sorted(gs.slug for gs in db.query(GameSystem))
+        assert slugs == ["kill-team", "kill-team-1"]
+
+    def test_invalid_records_are_counted_as_errors(self, db, tmp_path):
+        _write(tmp_path / "a.json", [_raw(), _raw(title=""), _raw(date="not-a-date")])
+        result = run_import(db, tmp_path)
+
+        assert result["processed"] == 1
+        assert result["errors"] == 2
+
+    def test_errors_are_reported_per_file(self, db, tmp_path):
+        _write(tmp_path / "a.json", [_raw(), _raw(title="")])
+        _write(tmp_path / "b.json", [_raw(title="Other")])
+        result = run_import(db, tmp_path)
+
+        assert result["file_errors"] == {"a.json": 1, "b.json": 0}
+
+    def test_reimport_revives_expired_event(self, db, tmp_path):
+        _write(tmp_path / "a.json", [_raw()])
+        run_import(db, tmp_path)
+        db.query(Event).update({"is_expired": True})
+        db.commit()
+
+        run_import(db, tmp_path, force=True)
+        assert db.query(Event).one().is_expired is False
+
+    def test_records_before_a_parse_error_are_kept(self, db, tmp_path):
+        (tmp_path / "a.json").write_text(json.dumps([_raw()])[:-1] + ", {oops", encoding="utf-8")
+        _write(tmp_path / "b.json", [_raw(title="Other")])
+        result = run_import(db, tmp_path)
+
+        assert result["processed"] == 2
+        assert db.query(Event).count() == 2
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_parse_error_is_reported_and_retried(self, engine, tmp_path, workers):
+        ok, ok2 = json.dumps(_raw()), json.dumps(_raw(title="Other"))
+        (tmp_path / "a.json").write_text(f'[{ok}, {{"title": tru}}, {ok2}]', encoding="utf-8")
+        _write(tmp_path / "b.json", [_raw(title="Third")])
+        Session = sessionmaker(bind=engine)
+
+        with Session() as db:
+            result = run_import(db, tmp_path, workers=workers)
+        assert result["processed"] == 2
+        assert result["errors"] == 1
+        assert result["file_errors"] == {"a.json": 1, "b.json": 0}
+
+        with Session() as db:
+            retried = run_import(db, tmp_path, workers=workers)
+            assert db.query(ImportManifest).one().path.endswith("b.json")
+        assert retried["skipped"] == 1
+        assert retried["file_errors"] == {"a.json": 1}
+
+    def test_old_events_are_expired(self, db, tmp_path):
+        old = (date.today() - timedelta(days=60)).isoformat()
+        _write(tmp_path / "a.json", [_raw(date=old), _raw()])
+        result = run_import(db, tmp_path)
+
+        assert result["expired"] == 1
+
+    def test_statement_count_does_not_grow_per_record(self, db, engine, tmp_path):
+        statements = []
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        _write(
+            tmp_path / "a.json",
+            [_raw(title=f"Event {i}", location_name=f"Store {i % 5}") for i in range(200)],
+        )
+        run_import(db, tmp_path)
+
+        assert db.query(Event).count() == 200
+        assert len(statements) < 20
+
+
+# ---------------------------------------------------------------------------
+# run_import — write avoidance for re-seen events
+# ---------------------------------------------------------------------------
+
+
+class TestSkipUnchanged:
+    def test_identical_reimport_counts_unchanged_and_writes_nothing(self, db, engine, tmp_path):
+        _write(
+            tmp_path / "a.json",
+            [_raw(title=f"Event {i}", last_seen_at="2026-02-20T12:00:00") for i in range(5)],
+        )
+        run_import(db, tmp_path)
+
+        statements = []
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        result = run_import(db, tmp_path, force=True)
+
+        assert result["unchanged"] == 5
+        assert result["created"] == result["updated"] == 0
+        writes = [s for s in statements if s.startswith(("INSERT INTO events", "UPDATE events"))]
+        assert writes == [s for s in writes if "is_expired" in s]  # only expire_old_events
+
+    def test_identical_reimport_with_utc_offset_writes_nothing(self, db, engine, tmp_path):
+        _write(tmp_path / "a.json", [_raw(last_seen_at="2026-02-20T12:00:00+02:00")])
+        run_import(db, tmp_path)
+        assert db.query(Event).one().last_seen_at == datetime(2026, 2, 20, 10)
+
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        result = run_import(db, tmp_path, force=True)
+
+        assert result["unchanged"] == 1
+        assert not [s for s in statements if s.startswith("UPDATE events SET last_seen_at")]
+
+    def test_newer_last_seen_is_bumped_without_touching_updated_at(self, db, tmp_path):
+        a = _write(tmp_path / "a.json", [_raw(last_seen_at="2026-02-20T12:00:00")])
+        run_import(db, tmp_path)
+        db.query(Event).update({"updated_at": datetime(2026, 1, 1)})
+        db.commit()
+
+        _write(a, [_raw(last_seen_at="2026-02-27T12:00:00")])
+        result = run_import(db, tmp_path)
+
+        assert result["unchanged"] == 1
+        db.expire_all()
+        event_row = db.query(Event).one()
+        assert event_row.last_seen_at == datetime(2026, 2, 27, 12)
+        assert event_row.updated_at == datetime(2026, 1, 1)
+
+    def test_changed_source_url_is_updated(self, db, tmp_path):
+        a = _write(tmp_path / "a.json", [_raw(source_url="https://example.com/1"), _raw(title="B")])
+        run_import(db, tmp_path)
+
+        _write(a, [_raw(source_url="https://example.com/2"), _raw(title="B")])
+        result = run_import(db, tmp_path)
+
+        assert result["updated"] == 1
+        assert result["unchanged"] == 1
+        db.expire_all()
+        assert db.query(Event).filter_by(title="Friday Night 40K").one().source_url == (
+            "https://example.com/2"
+        )
+
+    def test_expired_event_counts_as_updated(self, db, tmp_path):
+        _write(tmp_path / "a.json", [_raw()])
+        run_import(db, tmp_path)
+        db.query(Event).update({"is_expired": True})
+        db.commit()
+
+        result = run_import(db, tmp_path, force=True)
+        assert result["updated"] == 1
+        assert db.query(Event).one().is_expired is False
+
+
+# ---------------------------------------------------------------------------
+# run_import — import manifest
+# ---------------------------------------------------------------------------
+
+
+class TestImportManifest:
+    def test_unchanged_files_are_skipped(self, db, engine, tmp_path):
+        _write(tmp_path / "a.json", [_raw(title="Event A")])
+        _write(tmp_path / "b.json", [_raw(title="Event B")])
+        run_import(db, tmp_path)
+
+        statements = []
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        result = run_import(db, tmp_path)
+
+        assert result["skipped"] == 2
+        assert result["processed"] == 0
+        assert not any("events.dedup_hash" in s for s in statements)
+
+    def test_only_changed_file_is_reimported(self, db, tmp_path):
+        _write(tmp_path / "a.json", [_raw(title="Event A")])
+        b = _write(tmp_path / "b.json", [_raw(title="Event B")])
+        run_import(db, tmp_path)
+
+        _write(b, [_raw(title="Event B"), _raw(title="Event C")])
+        result = run_import(db, tmp_path)
+
+        assert result["skipped"] == 1
+        assert result["processed"] == 2
+        assert result["created"] == 1
+        assert list(result["file_errors"]) == ["b.json"]
+
+    def test_touched_file_with_same_content_is_skipped(self, db, tmp_path):
+        a = _write(tmp_path / "a.json", [_raw()])
+        run_import(db, tmp_path)
+        stat = a.stat()
+        os.utime(a, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        assert run_import(db, tmp_path)["skipped"] == 1
+        # the new mtime is recorded, so the next run skips without hashing
+        entry = db.query(ImportManifest).one()
+        assert entry.mtime_ns == a.stat().st_mtime_ns
+
+    def test_force_reimports_unchanged_files(self, db, tmp_path):
+        _write(tmp_path / "a.json", [_raw()])
+        run_import(db, tmp_path)
+
+        result = run_import(db, tmp_path, force=True)
+        assert result["skipped"] == 0
+        assert result["unchanged"] == 1
+
+    def test_appended_ndjson_imports_only_new_lines(self, db, tmp_path):
+        path = tmp_path / "feed.ndjson"
+        path.write_text(json.dumps(_raw(title="Event A")) + "\n", encoding="utf-8")
+        run_import(db, tmp_path)
+
+        with path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(_raw(title="Event B")) + "\n")
+        result = run_import(db, tmp_path)
+
+        assert result["processed"] == 1
+        assert result["created"] == 1
+        assert db.query(ImportManifest).one().record_count == 2
+
+    def test_rewritten_ndjson_is_read_from_the_start(self, db, tmp_path):
+        path = tmp_path / "feed.ndjson"
+        path.write_text(json.dumps(_raw(title="Event A")) + "\n", encoding="utf-8")
+        run_import(db, tmp_path)
+
+        lines = [json.dumps(_raw(title=t)) for t in ("Event Z", "Event B")]
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        result = run_import(db, tmp_path)
+
+        assert result["processed"] == 2
+        assert result["created"] == 2
+
+    def test_paths_limits_the_run(self, db, tmp_path):
+        a = _write(tmp_path / "a.json", [_raw(title="Event A")])
+        _write(tmp_path / "b.json", [_raw(title="Event B")])
+
+        result = run_import(db, tmp_path, paths=[a])
+
+        assert result["processed"] == 1
+        assert [e.title for e in db.query(Event)] == ["Event A"]
+
+
+# ---------------------------------------------------------------------------
+# run_import — chunked commits and resumable checkpoints
+# ---------------------------------------------------------------------------
+
+
+class TestCheckpoints:
+    @pytest.fixture(autouse=True)
+    def small_chunks(self, monkeypatch):
+        monkeypatch.setattr(importer, "CHUNK_SIZE", 2)
+
+    def _crash_on_chunk(self, monkeypatch, n):
+        real = importer.crud.bulk_upsert_events
+        calls = 0
+
+        def bulk_upsert_events(*args, **kwargs):
+            nonlocal calls
+            calls += 1
+            if calls == n:
+                raise RuntimeError("simulated crash")
+            return real(*args, **kwargs)
+
+        monkeypatch.setattr(importer.crud, "bulk_upsert_events", bulk_upsert_events)
+        return lambda: monkeypatch.setattr(importer.crud, "bulk_upsert_events", real)
+
+    def test_commits_every_n_records(self, db, engine, tmp_path):
+        commits = []
+        event.listen(engine, "commit", lambda conn: commits.append(conn))
+        _write(tmp_path / "a.json", [_raw(title=f"Event {i}") for i in range(10)])
+
+        run_import(db, tmp_path, commit_every=4)
+
+        # 10 records in chunks of 2 → commits after records 4 and 8, then the final one
+        assert len(commits) == 3
+        assert db.query(ImportCheckpoint).count() == 0
+
+    def test_interrupted_import_resumes_from_checkpoint(self, engine, tmp_path, monkeypatch):
+        Session = sessionmaker(bind=engine)
+        old = (date.today() - timedelta(days=60)).isoformat()
+        _write(
+            tmp_path / "a.json",
+            [_raw(title="Old", date=old)] + [_raw(title=f"Event {i}") for i in range(9)],
+        )
+        restore = self._crash_on_chunk(monkeypatch, 3)
+
+        with Session() as db, pytest.raises(RuntimeError):
+            run_import(db, tmp_path, commit_every=2)
+
+        with Session() as db:
+            assert db.query(Event).count() == 4
+            assert db.query(ImportCheckpoint).one().record_offset == 4
+            # expiry waits for the whole import to finish
+            assert db.query(Event).filter_by(title="Old").one().is_expired is False
+
+        restore()
+        with Session() as db:
+            result = run_import(db, tmp_path, commit_every=2)
+            assert result["processed"] == 6
+            assert result["created"] == 6
+            assert result["expired"] == 1
+            assert db.query(Event).count() == 10
+            assert db.query(ImportCheckpoint).count() == 0
+
+    def test_checkpoint_is_ignored_when_file_changed(self, engine, tmp_path, monkeypatch):
+        Session = sessionmaker(bind=engine)
+        a = _write(tmp_path / "a.json", [_raw(title=f"Event {i}") for i in range(6)])
+        restore = self._crash_on_chunk(monkeypatch, 2)
+        with Session() as db, pytest.raises(RuntimeError):
+            run_import(db, tmp_path, commit_every=2)
+        restore()
+
+        _write(a, [_raw(title=f"Changed {i}") for i in range(6)])
+        with Session() as db:
+            result = run_import(db, tmp_path, commit_every=2)
+            assert result["processed"] == 6
+            assert result["created"] == 6
+
+
+class TestOtherWriters:
+    def test_location_and_game_system_created_between_commits(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(importer, "CHUNK_SIZE", 1)
+        engine = create_engine(f"sqlite:///{tmp_path / 'events.db'}")
+        Base.metadata.create_all(bind=engine)
+        data_dir = tmp_path / "data"
+        data_dir.mkdir()
+        _write(
+            data_dir / "a.json",
+            [_raw(), _raw(location_name="New Store", game_system="New Game", title="Opening")],
+        )
+        Session = sessionmaker(bind=engine)
+
+        def create_elsewhere(progress):
+            # e.g. a POST /events committed while the import released the lock
+            with Session() as other:
+                crud.get_or_create_location(other, "New Store")
+                crud.get_or_create_game_system(other, "New Game")
+                other.commit()
+
+        with Session() as db:
+            result = run_import(db, data_dir, commit_every=1, on_progress=create_elsewhere)
+
+            assert result["created"] == 2
+            opening = db.query(Event).filter_by(title="Opening").one()
+            assert opening.location.name == "New Store"
+            assert opening.game_system.slug == "new-game"
+            assert db.query(Location).count() == 2
+            assert db.query(GameSystem).count() == 2
+        engine.dispose()
+
+
+# ---------------------------------------------------------------------------
+# run_import — process-pool parsing
+# ---------------------------------------------------------------------------
+
+
+class TestParallelImport:
+    def _write_sources(self, tmp_path):
+        for n in range(3):
+            _write(
+                tmp_path / f"source{n}.json",
+                [_raw(title=f"Source {n} event {i}", location_name=f"Store {n}") for i in range(40)]
+                + [_raw(title="")] * n,
+            )
+
+    def test_matches_serial_import(self, engine, tmp_path):
+        self._write_sources(tmp_path)
+        Session = sessionmaker(bind=engine)
+
+        with Session() as db:
+            parallel = run_import(db, tmp_path, workers=3)
+            assert db.query(Event).count() == 120
+            assert db.query(Location).count() == 3
+        with Session() as db:
+            serial = run_import(db, tmp_path, workers=1, force=True)
+
+        assert parallel["created"] == 120
+        assert parallel["errors"] == 3
+        assert parallel["file_errors"] == {"source0.json": 0, "source1.json": 1, "source2.json": 2}
+        assert serial["created"] == 0
+        assert serial["unchanged"] == parallel["processed"]
+        assert serial["file_errors"] == parallel["file_errors"]
+
+    def test_failed_write_stops_the_workers(self, tmp_path, monkeypatch):
+        # A file database: each thread gets its own connection to an in-memory one.
+        engine = create_engine(f"sqlite:///{tmp_path / 'events.db'}")
+        Base.metadata.create_all(bind=engine)
+        data_dir = tmp_path / "data"
+        data_dir.mkdir()
+        # Enough chunks per file that the workers fill the queue and wait on it.
+        for n in range(2):
+            _write(
+                data_dir / f"source{n}.json",
+                [_raw(title=f"Source {n} event {i}") for i in range(importer.CHUNK_SIZE * 12)],
+            )
+        real = importer.crud.bulk_upsert_events
+        calls = 0
+
+        def bulk_upsert_events(*args, **kwargs):
+            nonlocal calls
+            calls += 1
+            if calls == 2:
+                raise RuntimeError("simulated crash")
+            return real(*args, **kwargs)
+
+        monkeypatch.setattr(importer.crud, "bulk_upsert_events", bulk_upsert_events)
+        raised = []
+
+        def target():
+            with sessionmaker(bind=engine)() as db:
+                try:
+                    run_import(db, data_dir, workers=2)
+                except RuntimeError as exc:
+                    raised.append(exc)
+
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        thread.join(timeout=60)
+
+        assert not thread.is_alive()
+        assert [str(exc) for exc in raised] == ["simulated crash"]
+        engine.dispose()
+
+
+# ---------------------------------------------------------------------------
+# Archival
+# ---------------------------------------------------------------------------
+
+
+class TestArchiveEvents:
+    @pytest.fixture()
+    def file_db(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'archive.db'}")
+        Base.metadata.create_all(bind=engine)
+        run_migrations(engine)
+        with sessionmaker(bind=engine)() as db:
+            yield db
+        engine.dispose()
+
+    def _write_old_and_new(self, data_dir, age, old=300, new=5):
+        data_dir.mkdir()
+        past = (date.today() - timedelta(days=age)).isoformat()
+        _write(
+            data_dir / "events.json",
+            [_raw(title=f"Old {i}", date=past, description="x" * 500) for i in range(old)]
+            + [_raw(title=f"New {i}") for i in range(new)],
+        )
+
+    def test_old_expired_events_move_to_archive(self, file_db, tmp_path):
+        self._write_old_and_new(tmp_path / "data", age=importer.ARCHIVE_AFTER_DAYS + 10)
+
+        result = run_import(file_db, tmp_path / "data")
+
+        assert result["expired"] == 300
+        assert result["archived"] == 300
+        assert result["pages_reclaimed"] > 0
+        assert file_db.query(Event).count() == 5
+        archived = file_db.query(EventArchive).order_by(EventArchive.id).all()
+        assert len(archived) == 300
+        assert archived[0].title == "Old 0"
+        assert archived[0].archived_at is not None
+
+    def test_recently_expired_events_stay(self, file_db, tmp_path):
+        self._write_old_and_new(tmp_path / "data", age=importer.EXPIRY_DAYS + 10, old=25)
+
+        result = run_import(file_db, tmp_path / "data")
+
+        assert result["expired"] == 25
+        assert (result["archived"], result["pages_reclaimed"]) == (0, 0)
+        assert file_db.query(Event).count() == 30
+
+    def test_archives_in_batches(self, file_db, tmp_path):
+        self._write_old_and_new(tmp_path / "data", age=importer.EXPIRY_DAYS + 10, old=25)
+        run_import(file_db, tmp_path / "data")
+        commits = []
+        event.listen(file_db, "after_commit", lambda session: commits.append(1))
+
+        archived, _ = importer.archive_events(file_db, days=importer.EXPIRY_DAYS, batch_size=10)
+
+        assert archived == 25
+        assert len(commits) == 3
+        assert file_db.query(Event).count() == 5
+
+    def _import_new(self, db, tmp_path):
+        more = tmp_path / "more"
+        more.mkdir()
+        _write(more / "events.json", [_raw(title="Brand New")])
+        run_import(db, more)
+        return db.query(Event).filter(Event.title == "Brand New").one()
+
+    def test_reimport_after_archiving(self, file_db, tmp_path):
+        self._write_old_and_new(tmp_path / "data", age=importer.ARCHIVE_AFTER_DAYS + 10, old=30)
+        run_import(file_db, tmp_path / "data")
+        archived_ids = {e.id for e in file_db.query(EventArchive)}
+
+        again = run_import(file_db, tmp_path / "data", force=True)
+        third = run_import(file_db, tmp_path / "data", force=True)
+
+        assert (again["created"], again["unchanged"], again["archived"]) == (0, 35, 0)
+        assert third["archived"] == 0
+        assert file_db.query(Event).count() == 5
+        assert file_db.query(EventArchive).count() == 30
+        new_event = self._import_new(file_db, tmp_path)
+        assert new_event.id not in archived_ids
+
+    def test_archived_ids_are_not_reused(self, file_db, tmp_path):
+        self._write_old_and_new(
+            tmp_path / "data", age=importer.ARCHIVE_AFTER_DAYS + 10, old=3, new=0
+        )
+        run_import(file_db, tmp_path / "data")
+        top = max(e.id for e in file_db.query(EventArchive))
+
+        new_event = self._import_new(file_db, tmp_path)
+
+        assert new_event.id > top
+
+    def test_already_archived_row_is_skipped(self, file_db, tmp_path):
+        self._write_old_and_new(
+            tmp_path / "data", age=importer.ARCHIVE_AFTER_DAYS + 10, old=2, new=0
+        )
+        run_import(file_db, tmp_path / "data")
+        event_id = file_db.query(EventArchive).first().id
+        # A copy left behind in events (as a failed archive pass could leave).
+        file_db.execute(
+            text(
+                "INSERT INTO events (id, location_id, game_system_id, title, date, is_expired,"
+                " is_merged, dedup_hash) SELECT id, location_id, game_system_id, title, date, 1,"
+                " 0, dedup_hash FROM events_archive WHERE id = :id"
+            ),
+            {"id": event_id},
+        )
+        file_db.commit()
+
+        archived, _ = importer.archive_events(file_db)
+
+        assert archived == 1
+        assert file_db.query(Event).filter(Event.id == event_id).count() == 0
+        assert file_db.query(EventArchive).count() == 2
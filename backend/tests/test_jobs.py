@@ -0,0 +1,163 @@
+"""Tests for the background job runner and the /admin job endpoints."""
+
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend import jobs, models  # noqa: F401 — models registers ORM classes with Base
+from backend.database import (
+    Base,
+    get_db,
+    get_read_db,
+    get_read_session_factory,
+    get_session_factory,
+)
+from backend.main import app
+from backend.models import Job
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture()
+def session_factory(tmp_path):
+    """File-backed database, since jobs use their own connections on other threads."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'jobs.db'}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture()
+def client(session_factory):
+    def override_get_db():
+        with session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: session_factory
+    app.dependency_overrides[get_read_session_factory] = lambda: session_factory
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def _wait_for(client, job_id, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(f"/admin/jobs/{job_id}").json()
+        if job["status"] not in jobs.ACTIVE_STATUSES:
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def _blocking_target(release):
+    def target(db, report):
+        report({"step": 1})
+        release.wait(5)
+        return {"done": True}
+
+    return target
+
+
+# ---------------------------------------------------------------------------
+# Admin endpoints
+# ---------------------------------------------------------------------------
+
+
+class TestJobEndpoints:
+    def test_import_returns_202_and_runs_in_background(self, client):
+        response = client.post("/admin/import")
+        assert response.status_code == 202
+        body = response.json()
+        assert body["kind"] == "import"
+        assert body["status"] == "queued"
+
+        job = _wait_for(client, body["id"])
+        assert job["status"] == "succeeded"
+        assert job["result"]["processed"] > 0
+        assert job["progress"]["processed"] == job["result"]["processed"]
+        assert job["started_at"] is not None
+        assert job["finished_at"] is not None
+
+    def test_newsletter_returns_202(self, client):
+        response = client.post("/admin/newsletter")
+        assert response.status_code == 202
+
+        job = _wait_for(client, response.json()["id"])
+        assert job["status"] == "succeeded"
+        assert job["result"] == {"sent": 0, "skipped": 0, "errors": 0}
+
+    def test_unknown_job_is_404(self, client):
+        assert client.get("/admin/jobs/999").status_code == 404
+
+    def test_second_job_of_same_kind_is_409(self, client, session_factory):
+        release = threading.Event()
+        running = jobs.start_job(session_factory, "import", _blocking_target(release))
+        try:
+            response = client.post("/admin/import")
+            assert response.status_code == 409
+            assert response.json()["detail"]["job_id"] == running.id
+        finally:
+            release.set()
+        _wait_for(client, running.id)
+
+
+# ---------------------------------------------------------------------------
+# Job runner
+# ---------------------------------------------------------------------------
+
+
+class TestJobRunner:
+    def test_live_progress_is_reported_while_running(self, client, session_factory):
+        release = threading.Event()
+        job = jobs.start_job(session_factory, "import", _blocking_target(release))
+        try:
+            deadline = time.monotonic() + 5
+            while client.get(f"/admin/jobs/{job.id}").json()["progress"] != {"step": 1}:
+                assert time.monotonic() < deadline
+                time.sleep(0.01)
+            assert client.get(f"/admin/jobs/{job.id}").json()["status"] == "running"
+        finally:
+            release.set()
+
+        finished = _wait_for(client, job.id)
+        assert finished["result"] == {"done": True}
+        assert finished["progress"] == {"step": 1}
+
+    def test_different_kinds_run_concurrently(self, client, session_factory):
+        release = threading.Event()
+        first = jobs.start_job(session_factory, "import", _blocking_target(release))
+        second = jobs.start_job(session_factory, "newsletter", _blocking_target(release))
+        release.set()
+
+        assert _wait_for(client, first.id)["status"] == "succeeded"
+        assert _wait_for(client, second.id)["status"] == "succeeded"
+
+    def test_failure_is_recorded(self, client, session_factory):
+        def target(db, report):
+            raise RuntimeError("boom")
+
+        job = jobs.start_job(session_factory, "import", target)
+        finished = _wait_for(client, job.id)
+
+        assert finished["status"] == "failed"
+        assert finished["error"] == "boom"
+
+    def test_interrupted_jobs_are_failed_on_startup(self, session_factory):
+        with session_factory() as db:
+            db.add(Job(kind="import", status="running", progress="{}"))
+            db.add(Job(kind="newsletter", status="succeeded", progress="{}"))
+            db.commit()
+
+            assert jobs.fail_interrupted_jobs(db) == 1
+            statuses = sorted(job.status for job in db.query(Job))
+            assert statuses == ["failed", "succeeded"]
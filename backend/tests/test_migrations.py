@@ -0,0 +1,433 @@
+"""Tests for the startup schema migrations in backend/migrations.py."""
+
+import hashlib
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.schema import CreateTable
+
+from backend import models  # noqa: F401 — models registers ORM classes with Base
+from backend.database import Base
+from backend.databridge import get_events, get_events_for_subscriber, get_subscribers_for_location
+from backend.importer import compute_dedup_hash, run_import
+from backend.migrations import run_migrations
+from backend.models import EVENTS_FTS_DDL, Event, Subscriber
+
+# Schema of the events table before dedup keys were compacted.
+_LEGACY_EVENTS = """
+CREATE TABLE events (
+    id INTEGER NOT NULL PRIMARY KEY,
+    location_id INTEGER NOT NULL REFERENCES locations (id),
+    game_system_id INTEGER NOT NULL REFERENCES game_systems (id),
+    title VARCHAR NOT NULL,
+    date DATE NOT NULL,
+    start_time VARCHAR,
+    description TEXT,
+    source_url VARCHAR,
+    source_type VARCHAR,
+    last_seen_at DATETIME,
+    is_expired BOOLEAN NOT NULL,
+    dedup_hash VARCHAR NOT NULL,
+    created_at DATETIME,
+    updated_at DATETIME
+)
+"""
+
+# Schema of the subscribers table before preferences moved to association tables.
+_LEGACY_SUBSCRIBERS = """
+CREATE TABLE subscribers (
+    id INTEGER NOT NULL PRIMARY KEY,
+    email VARCHAR NOT NULL UNIQUE,
+    location_ids TEXT,
+    game_system_ids TEXT,
+    is_active BOOLEAN NOT NULL,
+    created_at DATETIME
+)
+"""
+
+_FUTURE = (date.today() + timedelta(days=10)).isoformat()
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture()
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture()
+def legacy_engine(engine):
+    """Current schema, except events is the pre-migration table."""
+    tables = [t for name, t in Base.metadata.tables.items() if name != "events"]
+    Base.metadata.create_all(engine, tables=tables)
+    with engine.begin() as conn:
+        conn.execute(text(_LEGACY_EVENTS))
+        conn.execute(text("CREATE INDEX ix_events_id ON events (id)"))
+        conn.execute(text("CREATE INDEX ix_events_date ON events (date)"))
+        conn.execute(text("CREATE UNIQUE INDEX ix_events_dedup_hash ON events (dedup_hash)"))
+        conn.execute(text("INSERT INTO locations (id, name) VALUES (1, 'Game Vault')"))
+        conn.execute(
+            text("INSERT INTO game_systems (id, name, slug) VALUES (1, 'Warhammer 40,000', '40k')")
+        )
+    return engine
+
+
+def _legacy_hash(location, game_system, title, event_date, time=None):
+    raw = f"{location}|{game_system}|{title}|{event_date}|{time or ''}".lower().strip()
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _insert_legacy(engine, event_id, title, dedup_hash, start_time=None):
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO events (id, location_id, game_system_id, title, date, start_time,"
+                " is_expired, dedup_hash) VALUES (:id, 1, 1, :title, :date, :time, 0, :hash)"
+            ),
+            {
+                "id": event_id,
+                "title": title,
+                "date": _FUTURE,
+                "time": start_time,
+                "hash": dedup_hash,
+            },
+        )
+
+
+# ---------------------------------------------------------------------------
+# _compact_dedup_keys
+# ---------------------------------------------------------------------------
+
+
+class TestCompactDedupKeys:
+    def test_keys_are_recomputed(self, legacy_engine):
+        _insert_legacy(
+            legacy_engine,
+            1,
+            "Event A",
+            _legacy_hash("Game Vault", "Warhammer 40,000", "Event A", _FUTURE),
+        )
+        run_migrations(legacy_engine)
+
+        with sessionmaker(bind=legacy_engine)() as db:
+            event = db.query(Event).one()
+            assert event.title == "Event A"
+            assert event.dedup_hash == compute_dedup_hash(
+                "Game Vault", "Warhammer 40,000", "Event A", _FUTURE
+            )
+
+    def test_key_hashed_with_start_time_is_matched(self, legacy_engine):
+        old = _legacy_hash("Game Vault", "Warhammer 40,000", "Event A", _FUTURE, "18:00")
+        _insert_legacy(legacy_engine, 1, "Event A", old, start_time="18:00")
+        run_migrations(legacy_engine)
+
+        with sessionmaker(bind=legacy_engine)() as db:
+            assert db.query(Event).one().dedup_hash == compute_dedup_hash(
+                "Game Vault", "Warhammer 40,000", "Event A", _FUTURE, "18:00"
+            )
+
+    def test_unverifiable_key_keeps_its_old_hash(self, legacy_engine):
+        old = _legacy_hash("game vault ", "Warhammer 40,000", " Event A", _FUTURE)
+        _insert_legacy(legacy_engine, 1, "Event A", old)
+        run_migrations(legacy_engine)
+
+        with sessionmaker(bind=legacy_engine)() as db:
+            assert db.query(Event).one().dedup_hash == bytes.fromhex(old)[:16]
+
+    def test_redundant_indexes_are_dropped(self, legacy_engine):
+        run_migrations(legacy_engine)
+
+        indexes = {index["name"] for index in inspect(legacy_engine).get_indexes("events")}
+        assert not indexes & {"ix_events_id", "ix_events_dedup_hash"}
+
+    def test_reimport_after_migration_does_not_duplicate(self, legacy_engine, tmp_path):
+        _insert_legacy(
+            legacy_engine,
+            1,
+            "Event A",
+            _legacy_hash("Game Vault", "Warhammer 40,000", "Event A", _FUTURE),
+        )
+        run_migrations(legacy_engine)
+        (tmp_path / "events.ndjson").write_text(
+            '{"location_name": "Game Vault", "game_system": "Warhammer 40,000",'
+            f' "title": "Event A", "date": "{_FUTURE}"}}\n',
+            encoding="utf-8",
+        )
+
+        with sessionmaker(bind=legacy_engine)() as db:
+            result = run_import(db, tmp_path)
+            assert result["created"] == 0
+            assert db.query(Event).count() == 1
+
+    def test_is_idempotent(self, legacy_engine):
+        _insert_legacy(
+            legacy_engine,
+            1,
+            "Event A",
+            _legacy_hash("Game Vault", "Warhammer 40,000", "Event A", _FUTURE),
+        )
+        run_migrations(legacy_engine)
+        run_migrations(legacy_engine)
+
+        with sessionmaker(bind=legacy_engine)() as db:
+            assert db.query(Event).count() == 1
+
+
+# ---------------------------------------------------------------------------
+# _live_event_indexes
+# ---------------------------------------------------------------------------
+
+
+def _query_plans(engine, fn):
+    """Run *fn* and return the EXPLAIN QUERY PLAN details of each SELECT it issued."""
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    with sessionmaker(bind=engine)() as db:
+        fn(db)
+    event.remove(engine, "before_cursor_execute", capture)
+    with engine.connect() as conn:
+        return [
+            " ".join(row[3] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {s}", p))
+            for s, p in statements
+        ]
+
+
+class TestLiveEventIndexes:
+    def test_existing_database_gets_partial_indexes(self, legacy_engine):
+        run_migrations(legacy_engine)
+        run_migrations(legacy_engine)
+
+        indexes = inspect(legacy_engine).get_indexes("events")
+        assert {index["name"] for index in indexes} == {
+            "ix_events_live_date_id",
+            "ix_events_live_location_date_id",
+            "ix_events_live_game_system_date_id",
+        }
+        with legacy_engine.connect() as conn:
+            sql = conn.exec_driver_sql(
+                "SELECT sql FROM sqlite_master WHERE name = 'ix_events_live_date_id'"
+            ).scalar()
+        assert sql.endswith("WHERE is_expired = 0")
+
+    def test_superseded_live_indexes_are_replaced(self, engine):
+        Base.metadata.create_all(engine)
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    "CREATE INDEX ix_events_live_date ON events (date, is_expired)"
+                    " WHERE is_expired = 0"
+                )
+            )
+
+        run_migrations(engine)
+
+        names = {index["name"] for index in inspect(engine).get_indexes("events")}
+        assert "ix_events_live_date" not in names
+        assert "ix_events_live_date_id" in names
+
+    def test_cursor_pages_need_no_sort(self, engine):
+        Base.metadata.create_all(engine)
+        after = (date.today(), 10)
+
+        plans = _query_plans(engine, lambda db: get_events(db, location_id=1, after=after))
+
+        assert "USING INDEX ix_events_live_location_date_id" in plans[0]
+        assert "TEMP B-TREE" not in plans[0]
+
+    @pytest.mark.parametrize(
+        ("filters", "index"),
+        [
+            ({"date_from": date.today()}, "ix_events_live_date_id"),
+            ({"location_id": 1, "date_from": date.today()}, "ix_events_live_location_date_id"),
+            ({"game_system_ids": [1]}, "ix_events_live_game_system_date_id"),
+        ],
+    )
+    def test_event_listings_use_partial_indexes(self, engine, filters, index):
+        Base.metadata.create_all(engine)
+
+        [plan] = _query_plans(engine, lambda db: get_events(db, **filters))
+
+        assert f"USING INDEX {index}" in plan
+
+
+# ---------------------------------------------------------------------------
+# _normalize_subscriber_preferences
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture()
+def legacy_subscribers(engine):
+    """Current schema, except subscribers keeps its JSON preference columns."""
+    tables = [t for name, t in Base.metadata.tables.items() if name != "subscribers"]
+    Base.metadata.create_all(engine, tables=tables)
+    with engine.begin() as conn:
+        conn.execute(text(_LEGACY_SUBSCRIBERS))
+        conn.execute(
+            text(
+                "INSERT INTO subscribers (id, email, location_ids, game_system_ids, is_active)"
+                " VALUES (1, 'a@example.com', '[2, 1, 2]', '[3]', 1),"
+                " (2, 'b@example.com', '[]', NULL, 1),"
+                " (3, 'c@example.com', 'not json', '[1]', 1)"
+            )
+        )
+    return engine
+
+
+class TestNormalizeSubscriberPreferences:
+    def test_json_ids_move_to_association_tables(self, legacy_subscribers):
+        run_migrations(legacy_subscribers)
+
+        with sessionmaker(bind=legacy_subscribers)() as db:
+            first, second, third = db.query(Subscriber).order_by(Subscriber.id)
+            assert list(first.location_ids) == [1, 2]
+            assert list(first.game_system_ids) == [3]
+            assert list(second.location_ids) == []
+            assert list(second.game_system_ids) == []
+            assert list(third.location_ids) == []
+            assert list(third.game_system_ids) == [1]
+
+    def test_json_columns_are_dropped(self, legacy_subscribers):
+        run_migrations(legacy_subscribers)
+        run_migrations(legacy_subscribers)
+
+        columns = {c["name"] for c in inspect(legacy_subscribers).get_columns("subscribers")}
+        assert "location_ids" not in columns
+        assert "game_system_ids" not in columns
+
+    def test_subscribers_for_location_use_reverse_index(self, engine):
+        Base.metadata.create_all(engine)
+
+        [plan] = _query_plans(engine, lambda db: get_subscribers_for_location(db, 1))
+
+        assert "ix_subscriber_locations_location" in plan
+
+    def test_subscriber_events_read_the_association_tables(self, engine):
+        Base.metadata.create_all(engine)
+        with engine.begin() as conn:
+            conn.execute(text("INSERT INTO locations (id, name) VALUES (1, 'Game Vault')"))
+            conn.execute(
+                text("INSERT INTO game_systems (id, name, slug) VALUES (1, 'Kill Team', 'kt')")
+            )
+
+        with sessionmaker(bind=engine)() as db:
+            subscriber = Subscriber(email="a@example.com", location_ids=[1])
+            db.add(subscriber)
+            db.add(
+                Event(
+                    location_id=1,
+                    game_system_id=1,
+                    title="League",
+                    date=date.today() + timedelta(days=1),
+                    dedup_hash=bytes(16),
+                )
+            )
+            db.commit()
+
+            assert [e.title for e in get_events_for_subscriber(db, subscriber)] == ["League"]
+            assert get_subscribers_for_location(db, 1) == [subscriber]
+
+
+# ---------------------------------------------------------------------------
+# _autoincrement_event_ids
+# ---------------------------------------------------------------------------
+
+
+class TestAutoincrementEventIds:
+    @pytest.fixture()
+    def plain_ids_engine(self, engine):
+        """Current schema, except events ids are a plain INTEGER PRIMARY KEY."""
+        tables = [t for name, t in Base.metadata.tables.items() if name != "events"]
+        Base.metadata.create_all(engine, tables=tables)
+        ddl = str(CreateTable(Event.__table__).compile(engine)).replace(" AUTOINCREMENT", "")
+        with engine.begin() as conn:
+            conn.execute(text(ddl))
+            for index in Event.__table__.indexes:
+                index.create(conn)
+            for statement in EVENTS_FTS_DDL:
+                conn.execute(text(statement))
+            conn.execute(text("INSERT INTO locations (id, name) VALUES (1, 'Game Vault')"))
+            conn.execute(
+                text("INSERT INTO game_systems (id, name, slug) VALUES (1, 'Kill Team', 'kt')")
+            )
+            for event_id, title in ((1, "Kill Team League"), (2, "Painting Night")):
+                conn.execute(
+                    text(
+                        "INSERT INTO events (id, location_id, game_system_id, title, date,"
+                        " is_expired, is_merged, dedup_hash)"
+                        " VALUES (:id, 1, 1, :title, :date, 0, 0, :hash)"
+                    ),
+                    {
+                        "id": event_id,
+                        "title": title,
+                        "date": _FUTURE,
+                        "hash": bytes([event_id]) * 16,
+                    },
+                )
+            conn.execute(
+                text(
+                    "INSERT INTO events_archive (id, location_id, game_system_id, title, date,"
+                    " is_merged, dedup_hash) VALUES (9, 1, 1, 'Old', '2020-01-01', 0, :hash)"
+                ),
+                {"hash": bytes(16)},
+            )
+        return engine
+
+    def test_ids_start_past_the_archive(self, plain_ids_engine):
+        run_migrations(plain_ids_engine)
+        run_migrations(plain_ids_engine)
+
+        with plain_ids_engine.begin() as conn:
+            sql = conn.execute(
+                text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'events'")
+            ).scalar()
+            assert "AUTOINCREMENT" in sql
+            conn.execute(
+                text(
+                    "INSERT INTO events (location_id, game_system_id, title, date, is_expired,"
+                    " is_merged, dedup_hash) VALUES (1, 1, 'New', :date, 0, 0, :hash)"
+                ),
+                {"date": _FUTURE, "hash": bytes([5]) * 16},
+            )
+            new_id = conn.execute(text("SELECT id FROM events WHERE title = 'New'")).scalar()
+        assert new_id == 10
+
+    def test_events_indexes_and_search_survive(self, plain_ids_engine):
+        run_migrations(plain_ids_engine)
+
+        names = {index["name"] for index in inspect(plain_ids_engine).get_indexes("events")}
+        assert names == {index.name for index in Event.__table__.indexes}
+        with sessionmaker(bind=plain_ids_engine)() as db:
+            assert [e.title for e in get_events(db)] == ["Kill Team League", "Painting Night"]
+            assert [e.title for e in get_events(db, q="league")] == ["Kill Team League"]
+            db.get(Event, 2).title = "Hobby Night"
+            db.commit()
+            assert [e.title for e in get_events(db, q="hobby")] == ["Hobby Night"]
+
+
+# ---------------------------------------------------------------------------
+# _enable_incremental_vacuum
+# ---------------------------------------------------------------------------
+
+
+class TestIncrementalVacuum:
+    def test_existing_database_switches_to_incremental(self, legacy_engine):
+        with legacy_engine.connect() as conn:
+            assert conn.exec_driver_sql("PRAGMA auto_vacuum").scalar() == 0
+
+        run_migrations(legacy_engine)
+        run_migrations(legacy_engine)
+
+        with legacy_engine.connect() as conn:
+            assert conn.exec_driver_sql("PRAGMA auto_vacuum").scalar() == 2
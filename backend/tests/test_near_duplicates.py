@@ -0,0 +1,175 @@
+"""Tests for MinHash/LSH near-duplicate detection and its use in run_import."""
+
+import json
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend import models, near_duplicates  # noqa: F401 — models registers ORM classes with Base
+from backend.database import Base
+from backend.databridge import get_events
+from backend.importer import run_import
+from backend.models import Event
+from backend.near_duplicates import (
+    find_near_duplicates,
+    lsh_bands,
+    normalize_title,
+    resolve_near_duplicates,
+)
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture()
+def db():
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+_FUTURE = (date.today() + timedelta(days=10)).isoformat()
+
+
+def _raw(title, location_name="Game Vault", game_system="Warhammer 40,000", date=_FUTURE, **kw):
+    return {
+        "location_name": location_name,
+        "game_system": game_system,
+        "title": title,
+        "date": date,
+        **kw,
+    }
+
+
+def _write(path, records):
+    path.write_text(json.dumps(records), encoding="utf-8")
+
+
+# ---------------------------------------------------------------------------
+# find_near_duplicates — pure functions
+# ---------------------------------------------------------------------------
+
+
+class TestFindNearDuplicates:
+    def test_abbreviations_are_expanded(self):
+        assert normalize_title("Fri. Night 40k!") == "friday night 40k"
+
+    def test_reworded_title_matches(self):
+        titles = {1: "Friday Night 40K", 2: "Fri Night 40k League"}
+        assert find_near_duplicates(titles) == {2: 1}
+
+    def test_different_events_do_not_match(self):
+        titles = {1: "Friday Night 40K", 2: "Kill Team Tournament", 3: "Learn to Play"}
+        assert find_near_duplicates(titles) == {}
+
+    def test_cluster_uses_lowest_id_as_canonical(self):
+        titles = {7: "Friday Night 40K", 3: "Fri Night 40K", 5: "Friday Night 40k League"}
+        assert find_near_duplicates(titles) == {5: 3, 7: 3}
+
+    def test_large_group_uses_lsh_buckets(self, monkeypatch):
+        monkeypatch.setattr(near_duplicates, "LSH_MIN_GROUP", 10)
+        kinds = ["Night", "League", "Tournament", "Open Play", "Crusade", "Learn to Play"]
+        systems = ["40K", "Kill Team", "Age of Sigmar", "Bolt Action", "Infinity", "Malifaux"]
+        titles = {
+            i: f"{kind} {system}"
+            for i, (kind, system) in enumerate((k, s) for k in kinds for s in systems)
+        }
+        assert len(titles) >= near_duplicates.LSH_MIN_GROUP
+        titles[100] = "Crusade Night 40K"
+        titles[101] = "Crusade Night 40k (Discord)"
+
+        assert find_near_duplicates(titles) == {101: 100}
+
+    def test_different_numbers_do_not_match(self):
+        titles = {1: "40K League Week 3", 2: "40K League Week 4"}
+        assert find_near_duplicates(titles, threshold=0.1) == {}
+
+    def test_threshold_is_configurable(self):
+        titles = {1: "Friday Night 40K", 2: "Fri Night 40k League"}
+        assert find_near_duplicates(titles, threshold=0.9) == {}
+
+    @pytest.mark.parametrize("threshold", [0.3, 0.5, 0.6, 0.8, 0.9])
+    def test_lsh_bands_favour_recall(self, threshold):
+        bands, rows = lsh_bands(threshold)
+        assert bands * rows == 64
+        assert (1 / bands) ** (1 / rows) <= threshold
+
+
+# ---------------------------------------------------------------------------
+# run_import — flag and merge
+# ---------------------------------------------------------------------------
+
+
+class TestImportNearDuplicates:
+    def test_flagged_duplicate_stays_listed(self, db, tmp_path):
+        _write(tmp_path / "a.json", [_raw("Friday Night 40K"), _raw("Fri Night 40k League")])
+
+        result = run_import(db, tmp_path, near_duplicates="flag")
+
+        assert result["near_duplicates"] == 1
+        canonical, duplicate = db.query(Event).order_by(Event.id).all()
+        assert duplicate.duplicate_of_id == canonical.id
+        assert not duplicate.is_merged
+        assert len(get_events(db)) == 2
+
+    def test_merged_duplicate_is_hidden_and_fills_canonical(self, db, tmp_path):
+        _write(
+            tmp_path / "a.json",
+            [
+                _raw("Friday Night 40K", source_type="facebook"),
+                _raw("Fri Night 40k League", source_type="discord", description="All welcome"),
+            ],
+        )
+
+        run_import(db, tmp_path, near_duplicates="merge")
+
+        [event] = get_events(db)
+        assert event.title == "Friday Night 40K"
+        assert event.source_type == "facebook"
+        assert event.description == "All welcome"
+
+    def test_only_same_location_date_and_game_system_are_compared(self, db, tmp_path):
+        later = (date.today() + timedelta(days=11)).isoformat()
+        _write(
+            tmp_path / "a.json",
+            [
+                _raw("Friday Night 40K"),
+                _raw("Fri Night 40k League", location_name="Dragon's Den"),
+                _raw("Fri Night 40k League", date=later),
+                _raw("Fri Night 40k League", game_system="Kill Team"),
+            ],
+        )
+
+        assert run_import(db, tmp_path, near_duplicates="merge")["near_duplicates"] == 0
+
+    def test_new_event_is_matched_against_existing_ones(self, db, tmp_path):
+        _write(tmp_path / "a.json", [_raw("Friday Night 40K")])
+        run_import(db, tmp_path, near_duplicates="flag")
+        _write(tmp_path / "b.json", [_raw("Fri Night 40k League")])
+
+        assert run_import(db, tmp_path, near_duplicates="flag")["near_duplicates"] == 1
+
+    def test_reimport_does_not_recreate_merged_duplicate(self, db, tmp_path):
+        _write(tmp_path / "a.json", [_raw("Friday Night 40K"), _raw("Fri Night 40k League")])
+        run_import(db, tmp_path, near_duplicates="merge")
+
+        result = run_import(db, tmp_path, near_duplicates="merge", force=True)
+
+        assert result["created"] == 0
+        assert len(get_events(db)) == 1
+
+    def test_off_skips_detection(self, db, tmp_path):
+        _write(tmp_path / "a.json", [_raw("Friday Night 40K"), _raw("Fri Night 40k League")])
+
+        assert run_import(db, tmp_path, near_duplicates="off")["near_duplicates"] == 0
+        assert db.query(Event).filter(Event.duplicate_of_id.isnot(None)).count() == 0
+
+    def test_unknown_action_is_rejected(self, db):
+        with pytest.raises(ValueError):
+            resolve_near_duplicates(db, [], action="delete")
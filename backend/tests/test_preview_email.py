@@ -10,7 +10,7 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from backend import models  # noqa: F401 — registers ORM classes with Base
-from backend.database import Base, get_db
+from backend.database import Base, get_db, get_read_db
 from backend.main import app
 from backend.newsletter import build_preview_email
 
@@ -170,6 +170,7 @@ def client(db):
         yield db
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     yield TestClient(app)
     app.dependency_overrides.clear()
 
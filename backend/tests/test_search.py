@@ -0,0 +1,204 @@
+"""Tests for full-text event search (events_fts and the q parameter on GET /events)."""
+
+from datetime import date, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from backend import databridge as crud
+from backend import models  # noqa: F401 — models registers ORM classes with Base
+from backend.database import Base, configure_sqlite, create_async_read_engine, get_async_read_db
+from backend.importer import archive_events
+from backend.main import app
+from backend.migrations import run_migrations
+from backend.models import Event, GameSystem, Location
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture()
+def db_url(tmp_path):
+    return f"sqlite:///{tmp_path / 'search.db'}"
+
+
+@pytest.fixture()
+def engine(db_url):
+    engine = configure_sqlite(create_engine(db_url))
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture()
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture()
+def seeded(db):
+    vault = Location(name="Game Vault")
+    den = Location(name="Dragon's Den")
+    forty_k = GameSystem(name="Warhammer 40,000", slug="40k")
+    kill_team = GameSystem(name="Kill Team", slug="kill-team")
+    db.add_all([vault, den, forty_k, kill_team])
+    db.flush()
+
+    def add(title, location, game_system, description=None, days=1, **kwargs):
+        event = Event(
+            title=title,
+            description=description,
+            date=date.today() + timedelta(days=days),
+            location_id=location.id,
+            game_system_id=game_system.id,
+            dedup_hash=title.encode().ljust(16, b"\0")[:16],
+            **kwargs,
+        )
+        db.add(event)
+        return event
+
+    add("Friday Night 40K", vault, forty_k, "Open play")
+    add("Kill Team League", den, kill_team, "Week 3 of the league", days=2)
+    add("Painting Night", vault, forty_k, "Bring your kill team models", days=3)
+    add("Kill Team Tournament", vault, kill_team, days=-60, is_expired=True)
+    db.commit()
+    return {"vault": vault, "den": den, "forty_k": forty_k, "kill_team": kill_team}
+
+
+def _titles(events):
+    return [event.title for event in events]
+
+
+# ---------------------------------------------------------------------------
+# databridge
+# ---------------------------------------------------------------------------
+
+
+class TestSearchTerms:
+    def test_every_word_becomes_a_quoted_prefix(self):
+        assert crud.search_terms("kill tea") == '"kill"* "tea"*'
+
+    def test_fts_syntax_is_not_parsed(self):
+        assert crud.search_terms('40k-"league" OR NEAR(') == '"40k"* "league"* "OR"* "NEAR"*'
+
+    def test_no_words(self):
+        assert crud.search_terms(" -*() ") is None
+
+
+class TestSearch:
+    def test_title_match_ranks_above_description_match(self, db, seeded):
+        assert _titles(crud.get_events(db, q="kill team")) == [
+            "Kill Team League",
+            "Painting Night",
+        ]
+
+    def test_prefix_matching(self, db, seeded):
+        assert _titles(crud.get_events(db, q="leag")) == ["Kill Team League"]
+
+    def test_matches_location_and_game_system_names(self, db, seeded):
+        assert _titles(crud.get_events(db, q="dragon")) == ["Kill Team League"]
+        assert _titles(crud.get_events(db, q="warhammer")) == [
+            "Friday Night 40K",
+            "Painting Night",
+        ]
+
+    def test_combines_with_filters(self, db, seeded):
+        events = crud.get_events(db, location_id=seeded["vault"].id, q="night")
+        assert _titles(events) == ["Friday Night 40K", "Painting Night"]
+
+    def test_broad_search_is_listed_by_date(self, db, seeded, monkeypatch):
+        painting = crud.get_events(db, q="painting")[0]
+        painting.date = date.today()
+        db.commit()
+        assert _titles(crud.get_events(db, q="kill team")) == ["Kill Team League", "Painting Night"]
+
+        monkeypatch.setattr(crud, "SEARCH_RANK_LIMIT", 1)
+
+        assert _titles(crud.get_events(db, q="kill team")) == ["Painting Night", "Kill Team League"]
+
+    def test_blank_query_lists_by_date(self, db, seeded):
+        assert _titles(crud.get_events(db, q=" ")) == _titles(crud.get_events(db))
+
+    @pytest.mark.parametrize("q", ["!!!", "-", " *() "])
+    def test_query_without_words_matches_nothing(self, db, seeded, q):
+        assert crud.get_events(db, q=q) == []
+
+
+class TestSearchIndexSync:
+    def test_updated_title_is_reindexed(self, db, seeded):
+        event = crud.get_events(db, q="painting")[0]
+        event.title = "Hobby Night"
+        db.commit()
+
+        assert crud.get_events(db, q="painting") == []
+        assert _titles(crud.get_events(db, q="hobby")) == ["Hobby Night"]
+
+    def test_renamed_location_is_reindexed(self, db, seeded):
+        seeded["den"].name = "Wyrm's Hoard"
+        db.commit()
+
+        assert crud.get_events(db, q="dragon") == []
+        assert _titles(crud.get_events(db, q="wyrm")) == ["Kill Team League"]
+
+    def test_archived_events_leave_the_index(self, db, seeded):
+        archive_events(db, days=30)
+
+        count = db.execute(
+            text("SELECT count(*) FROM events_fts WHERE events_fts MATCH 'tournament'")
+        )
+        assert count.scalar() == 0
+
+    def test_migration_indexes_existing_events(self, engine, db, seeded):
+        with engine.begin() as conn:
+            conn.execute(text("DROP TABLE events_fts"))
+            for trigger in ("insert", "delete", "update", "location_name", "game_system_name"):
+                conn.execute(text(f"DROP TRIGGER IF EXISTS events_fts_{trigger}"))
+
+        run_migrations(engine)
+
+        assert _titles(crud.get_events(db, q="league")) == ["Kill Team League"]
+
+
+# ---------------------------------------------------------------------------
+# GET /events?q=
+# ---------------------------------------------------------------------------
+
+
+class TestSearchEndpoint:
+    @pytest.fixture()
+    def client(self, db_url, engine):
+        factory = async_sessionmaker(create_async_read_engine(db_url), autoflush=False)
+
+        async def override_get_async_read_db():
+            async with factory() as session:
+                yield session
+
+        app.dependency_overrides[get_async_read_db] = override_get_async_read_db
+        yield TestClient(app)
+        app.dependency_overrides.clear()
+
+    def test_q_searches_events(self, client, seeded):
+        response = client.get("/events", params={"q": "kill team"})
+
+        assert response.status_code == 200
+        assert [e["title"] for e in response.json()] == ["Kill Team League", "Painting Night"]
+
+    def test_q_without_words_returns_no_events(self, client, seeded):
+        assert len(client.get("/events").json()) > 0
+
+        response = client.get("/events", params={"q": "!!!"})
+
+        assert response.status_code == 200
+        assert response.json() == []
+
+    def test_q_with_fts_syntax_is_safe(self, client, seeded):
+        response = client.get("/events", params={"q": '"unbalanced AND ('})
+
+        assert response.status_code == 200
+        assert response.json() == []
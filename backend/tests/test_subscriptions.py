@@ -0,0 +1,70 @@
+"""Tests for POST /subscribe and the subscriber preference tables."""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend import models  # noqa: F401 — models registers ORM classes with Base
+from backend.database import Base, get_db
+from backend.main import app
+from backend.models import SubscriberGameSystem, SubscriberLocation
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture()
+def session_factory():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture()
+def client(session_factory):
+    def override_get_db():
+        with session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+# ---------------------------------------------------------------------------
+# POST /subscribe
+# ---------------------------------------------------------------------------
+
+
+class TestSubscribe:
+    def test_response_keeps_id_lists(self, client):
+        response = client.post(
+            "/subscribe",
+            json={"email": "a@example.com", "location_ids": [2, 1, 2], "game_system_ids": [3]},
+        )
+
+        assert response.status_code == 201
+        body = response.json()
+        assert body["email"] == "a@example.com"
+        assert body["location_ids"] == [1, 2]
+        assert body["game_system_ids"] == [3]
+        assert body["is_active"] is True
+
+    def test_resubscribing_replaces_preferences(self, client, session_factory):
+        client.post("/subscribe", json={"email": "a@example.com", "location_ids": [1, 2]})
+        response = client.post(
+            "/subscribe",
+            json={"email": "a@example.com", "location_ids": [2, 3], "game_system_ids": [1]},
+        )
+
+        assert response.json()["location_ids"] == [2, 3]
+        assert response.json()["game_system_ids"] == [1]
+        with session_factory() as db:
+            assert db.scalar(select(func.count()).select_from(SubscriberLocation)) == 2
+            assert db.scalar(select(func.count()).select_from(SubscriberGameSystem)) == 1
@@ -0,0 +1,128 @@
+"""Tests for the data-directory watcher (continuous ingestion)."""
+
+import json
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend import jobs, models  # noqa: F401 — models registers ORM classes with Base
+from backend.database import Base
+from backend.models import Event, Job
+from backend.watcher import DataDirWatcher
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture()
+def session_factory(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'watch.db'}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture()
+def data_dir(tmp_path):
+    path = tmp_path / "data"
+    path.mkdir()
+    return path
+
+
+@pytest.fixture()
+def watcher(session_factory, data_dir):
+    return DataDirWatcher(session_factory, data_dir, debounce=5)
+
+
+_FUTURE = (date.today() + timedelta(days=10)).isoformat()
+
+
+def _line(title):
+    record = {
+        "location_name": "Game Vault",
+        "game_system": "Warhammer 40,000",
+        "title": title,
+        "date": _FUTURE,
+    }
+    return json.dumps(record) + "\n"
+
+
+def _titles(session_factory):
+    with session_factory() as db:
+        return sorted(e.title for e in db.query(Event))
+
+
+# ---------------------------------------------------------------------------
+# DataDirWatcher.poll
+# ---------------------------------------------------------------------------
+
+
+class TestDataDirWatcher:
+    def test_new_file_waits_for_debounce(self, watcher, session_factory, data_dir):
+        (data_dir / "feed.ndjson").write_text(_line("Event A"), encoding="utf-8")
+
+        assert watcher.poll(now=0) is None
+        assert watcher.poll(now=4) is None
+        assert _titles(session_factory) == []
+
+        job = watcher.poll(now=5)
+        assert job.status == "succeeded"
+        assert _titles(session_factory) == ["Event A"]
+
+    def test_write_during_debounce_restarts_the_wait(self, watcher, session_factory, data_dir):
+        path = data_dir / "feed.ndjson"
+        path.write_text(_line("Event A"), encoding="utf-8")
+        watcher.poll(now=0)
+
+        with path.open("a", encoding="utf-8") as f:
+            f.write(_line("Event B"))
+        assert watcher.poll(now=5) is None
+
+        assert watcher.poll(now=10).status == "succeeded"
+        assert _titles(session_factory) == ["Event A", "Event B"]
+
+    def test_settled_file_is_imported_once(self, watcher, session_factory, data_dir):
+        (data_dir / "feed.ndjson").write_text(_line("Event A"), encoding="utf-8")
+        watcher.poll(now=0)
+        watcher.poll(now=5)
+
+        assert watcher.poll(now=10) is None
+        assert watcher.poll(now=20) is None
+        with session_factory() as db:
+            assert db.query(Job).count() == 1
+
+    def test_appended_lines_are_imported(self, watcher, session_factory, data_dir):
+        path = data_dir / "feed.ndjson"
+        path.write_text(_line("Event A"), encoding="utf-8")
+        watcher.poll(now=0)
+        watcher.poll(now=5)
+
+        with path.open("a", encoding="utf-8") as f:
+            f.write(_line("Event B"))
+        watcher.poll(now=6)
+        job = watcher.poll(now=11)
+
+        assert job.status == "succeeded"
+        assert json.loads(job.result)["processed"] == 1
+        assert _titles(session_factory) == ["Event A", "Event B"]
+
+    def test_running_import_defers_the_batch(self, watcher, session_factory, data_dir):
+        (data_dir / "feed.ndjson").write_text(_line("Event A"), encoding="utf-8")
+        with session_factory() as db:
+            db.add(Job(kind="import", status="running", progress="{}"))
+            db.commit()
+
+        watcher.poll(now=0)
+        assert watcher.poll(now=5) is None
+        assert _titles(session_factory) == []
+
+        with session_factory() as db:
+            db.query(Job).update({"status": "succeeded"})
+            db.commit()
+        assert watcher.poll(now=6).status == "succeeded"
+        assert _titles(session_factory) == ["Event A"]
@@ -0,0 +1,130 @@
+"""Continuous ingestion: watch the data directory and import files as they change.
+
+    python -m backend.watcher [--interval 2] [--debounce 5]
+
+Set WATCH_DATA_DIR=1 to run the same watcher inside the API process instead
+(started from the FastAPI lifespan).
+
+The directory is polled with ``stat`` — no extra dependencies.  A new or
+modified file is imported once its size and mtime have stayed the same for
+the debounce period, so a burst of writes becomes one import.  Only settled
+files are passed to run_import, and the import manifest makes each version
+of a file import exactly once, across restarts too; lines appended to an
+NDJSON file are picked up without re-reading the lines before them.  Every
+import runs as an ``import`` job, so it never overlaps POST /admin/import.
+"""
+
+import argparse
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+from sqlalchemy.orm import sessionmaker
+
+from . import jobs
+from .importer import DATA_DIR, find_input_files, run_import
+
+logger = logging.getLogger(__name__)
+
+WATCH_INTERVAL = float(os.getenv("WATCH_INTERVAL", "2"))
+WATCH_DEBOUNCE = float(os.getenv("WATCH_DEBOUNCE", "5"))
+
+
+class DataDirWatcher:
+    def __init__(
+        self,
+        session_factory: sessionmaker,
+        data_dir: Path = DATA_DIR,
+        debounce: float = WATCH_DEBOUNCE,
+    ):
+        self.session_factory = session_factory
+        self.data_dir = data_dir
+        self.debounce = debounce
+        # path → (size, mtime_ns) as of the last successful import
+        self._imported: dict[Path, tuple[int, int]] = {}
+        # path → ((size, mtime_ns), when that signature was first seen)
+        self._pending: dict[Path, tuple[tuple[int, int], float]] = {}
+
+    def poll(self, now: float | None = None) -> jobs.Job | None:
+        """Scan the directory once and import any files that have settled.
+
+        Returns the finished import job, or None if nothing was ready.
+        """
+        now = time.monotonic() if now is None else now
+        ready: dict[Path, tuple[int, int]] = {}
+        for path in find_input_files(self.data_dir):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue  # deleted between listing and stat
+            signature = (stat.st_size, stat.st_mtime_ns)
+            if self._imported.get(path) == signature:
+                self._pending.pop(path, None)
+                continue
+            seen = self._pending.get(path)
+            if seen is None or seen[0] != signature:
+                self._pending[path] = (signature, now)
+            elif now - seen[1] >= self.debounce:
+                ready[path] = signature
+
+        if not ready:
+            return None
+        try:
+            job = jobs.run_job(
+                self.session_factory,
+                "import",
+                lambda db, report: run_import(
+                    db, self.data_dir, paths=list(ready), on_progress=report
+                ),
+            )
+        except jobs.JobAlreadyRunning as exc:
+            logger.info("Deferring %d file(s): %s", len(ready), exc)
+            return None
+        if job.status == "succeeded":
+            for path, signature in ready.items():
+                self._imported[path] = signature
+                self._pending.pop(path, None)
+        return job
+
+    def run(self, stop: threading.Event, interval: float = WATCH_INTERVAL) -> None:
+        logger.info("Watching %s (every %ss, debounce %ss)", self.data_dir, interval, self.debounce)
+        while not stop.is_set():
+            try:
+                self.poll()
+            except Exception:
+                logger.exception("Watch poll failed")
+            stop.wait(interval)
+
+
+def start_in_background(session_factory: sessionmaker) -> tuple[threading.Thread, threading.Event]:
+    """Run a DataDirWatcher on a daemon thread; set the returned event to stop it."""
+    stop = threading.Event()
+    watcher = DataDirWatcher(session_factory)
+    thread = threading.Thread(target=watcher.run, args=(stop,), name="data-dir-watcher")
+    thread.daemon = True
+    thread.start()
+    return thread, stop
+
+
+def main() -> None:
+    from .database import SessionLocal, create_tables
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    parser.add_argument("--interval", type=float, default=WATCH_INTERVAL)
+    parser.add_argument("--debounce", type=float, default=WATCH_DEBOUNCE)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    create_tables()
+    stop = threading.Event()
+    try:
+        DataDirWatcher(SessionLocal, args.data_dir, args.debounce).run(stop, args.interval)
+    except KeyboardInterrupt:
+        stop.set()
+
+
+if __name__ == "__main__":
+    main()
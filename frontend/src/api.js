@@ -9,15 +9,27 @@ const api = axios.create({
   headers: { 'Content-Type': 'application/json' },
 })
 
+// format=compact sends each location and game system once, referenced by id
+// from the events; put them back on each event for the components.
+const expandEvents = ({ locations, game_systems: gameSystems, events }) => {
+  const locationById = new Map(locations.map((l) => [l.id, l]))
+  const gameSystemById = new Map(gameSystems.map((g) => [g.id, g]))
+  return events.map(({ location_id: locationId, game_system_id: gameSystemId, ...event }) => ({
+    ...event,
+    location: locationById.get(locationId),
+    game_system: gameSystemById.get(gameSystemId),
+  }))
+}
+
 export const fetchEvents = (filters = {}) => {
-  const params = {}
+  const params = { format: 'compact' }
   if (filters.locationId != null) params.location_id = filters.locationId
   if (filters.gameSystemIds?.length) params.game_system_ids = filters.gameSystemIds
   if (filters.dateFrom) params.date_from = filters.dateFrom
   if (filters.dateTo) params.date_to = filters.dateTo
   if (filters.skip != null) params.skip = filters.skip
   if (filters.limit != null) params.limit = filters.limit
-  return api.get('/events', { params }).then((r) => r.data)
+  return api.get('/events', { params }).then((r) => expandEvents(r.data))
 }
 
 export const fetchLocations = () => api.get('/locations').then((r) => r.data)
@@ -9,6 +9,7 @@ Environment variables (all required on Render, optional for local testing):
   API_URL              Base URL of the EventBoard API, e.g. https://api.onrender.com
   ADMIN_SECRET         Shared secret for X-Admin-Secret header (optional)
   HEALTH_POLL_TIMEOUT  Max seconds to wait for the API to wake up (default 300)
+  JOB_POLL_TIMEOUT     Max seconds to wait for the newsletter job to finish (default 1800)
 """
 
 import calendar
@@ -17,7 +18,7 @@ import os
 import sys
 import time
 from datetime import date
-from urllib.error import URLError
+from urllib.error import HTTPError, URLError
 from urllib.request import Request, urlopen
 
 
@@ -70,16 +71,45 @@ def poll_health(api_url: str, max_wait_secs: int = 300) -> bool:
     return False
 
 
-def trigger_newsletter(api_url: str, admin_secret: str) -> dict:
-    """POST /admin/newsletter and return the parsed JSON response."""
-    url = api_url.rstrip("/") + "/admin/newsletter"
+def _admin_headers(admin_secret: str) -> dict:
     headers = {"Content-Type": "application/json"}
     if admin_secret:
         headers["X-Admin-Secret"] = admin_secret
+    return headers
 
-    req = Request(url, data=b"{}", headers=headers, method="POST")
-    with urlopen(req, timeout=120) as resp:
-        return json.loads(resp.read().decode())
+
+def trigger_newsletter(api_url: str, admin_secret: str) -> dict:
+    """POST /admin/newsletter and return the queued job.
+
+    If a newsletter job is already running, return that job instead so the
+    caller waits on it rather than starting a second send.
+    """
+    url = api_url.rstrip("/") + "/admin/newsletter"
+    req = Request(url, data=b"{}", headers=_admin_headers(admin_secret), method="POST")
+    try:
+        with urlopen(req, timeout=30) as resp:
+            return json.loads(resp.read().decode())
+    except HTTPError as exc:
+        if exc.code != 409:
+            raise
+        job_id = json.loads(exc.read().decode())["detail"]["job_id"]
+        print(f"  A newsletter job is already running (id {job_id}).", flush=True)
+        return {"id": job_id}
+
+
+def wait_for_job(api_url: str, admin_secret: str, job_id: int, max_wait_secs: int) -> dict:
+    """Poll GET /admin/jobs/{id} until the job finishes or *max_wait_secs* is exhausted."""
+    url = f"{api_url.rstrip('/')}/admin/jobs/{job_id}"
+    deadline = time.monotonic() + max_wait_secs
+    while True:
+        with urlopen(Request(url, headers=_admin_headers(admin_secret)), timeout=30) as resp:
+            job = json.loads(resp.read().decode())
+        if job["status"] not in ("queued", "running"):
+            return job
+        if time.monotonic() >= deadline:
+            raise TimeoutError(f"Job {job_id} still {job['status']} after {max_wait_secs}s")
+        print(f"  job {job_id} {job['status']}: {job['progress']}", flush=True)
+        time.sleep(10)
 
 
 # ---------------------------------------------------------------------------
@@ -109,6 +139,7 @@ def main() -> int:
 
     admin_secret = os.environ.get("ADMIN_SECRET", "")
     max_wait = int(os.environ.get("HEALTH_POLL_TIMEOUT", "300"))
+    max_job_wait = int(os.environ.get("JOB_POLL_TIMEOUT", "1800"))
 
     # ── 3. Wait for the API to wake up ─────────────────────────────────────
     if not poll_health(api_url, max_wait_secs=max_wait):
@@ -120,7 +151,13 @@ def main() -> int:
 
     # ── 4. Trigger newsletter ──────────────────────────────────────────────
     print("Triggering newsletter …", flush=True)
-    result = trigger_newsletter(api_url, admin_secret)
+    job = trigger_newsletter(api_url, admin_secret)
+    job = wait_for_job(api_url, admin_secret, job["id"], max_job_wait)
+    if job["status"] != "succeeded":
+        print(f"ERROR: newsletter job {job['id']} failed: {job['error']}", file=sys.stderr)
+        return 1
+
+    result = job["result"]
     print(f"Newsletter result: {result}", flush=True)
 
     if result.get("errors", 0) > 0: